@@ -31,6 +31,7 @@
 #
 
 from menu_utils import *
+from sampler_example import invalidate_applied_sampler_configuration
 
 def scan_bus_hardware(ctx: 'Context'):
     """
@@ -167,6 +168,8 @@ def close_all_bus_hardware(ctx: 'Context'):
     ctx.error_text = "\n".join(error_messages)
     ctx.open_bus_hardware_ids.clear()
     ctx.scanned_device_ids.clear()
+    for device_handle in ctx.connected_device_handles:
+        invalidate_applied_sampler_configuration(device_handle)
     ctx.connected_device_handles.clear()
     ctx.connectable_device_ids.clear()
     ctx.openable_bus_hardware_ids = Menu.get_openable_bus_hw_ids(ctx)
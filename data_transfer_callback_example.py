@@ -34,6 +34,15 @@ from nanotec_nanolib import Nanolib
 
 class DataTransferCallbackExample(Nanolib.NlcDataTransferCallback):
     """ Implementation class of Nanolib.NlcDataTransferCallback, handles data transfer callback"""
+    def __init__(self, progress = None, device_index: int = 0):
+        """
+        :param progress: Aggregated progress of several concurrent transfers (e.g. TransferProgress), console output if not given (optional)
+        :param device_index: Index of the device of this transfer in the aggregated progress (optional)
+        """
+        super().__init__()
+        self.progress = progress
+        self.device_index = device_index
+
     def callback(self, info, data):
         """
         Handle data transfer callback.
@@ -41,6 +50,11 @@ class DataTransferCallbackExample(Nanolib.NlcDataTransferCallback):
         :param info: The information about the data transfer (init, file open, finished, progress, reboot)
         :param data: Progress data
         """
+        if self.progress is not None:
+            # concurrent transfers must not write to console, only the aggregated progress is updated
+            self.progress.update(self.device_index, info, data)
+            return Nanolib.ResultVoid()
+
         if info == Nanolib.DataTransferInfo_Init:
             # Do nothing
             pass
@@ -0,0 +1,157 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   device_deployment_example.py
+#
+# @brief  Definition of the idempotent firmware and bootloader deployment planner
+#
+
+from concurrent.futures import ThreadPoolExecutor
+from menu_utils import Context
+from device_image_cache_example import FIRMWARE, BOOTLOADER, FirmwareImage
+from nanotec_nanolib import Nanolib
+
+class DeviceVersions:
+    """Name and build ids of one device, read in the batched pass of the planner."""
+    def __init__(self, device_handle: Nanolib.DeviceHandle):
+        self.device_handle = device_handle
+        self.device_name = None
+        self.firmware_build_id = None
+        self.bootloader_build_id = None
+        self.error = ""
+
+class PlanEntry:
+    """Planned action for one device."""
+    UPDATE = "update"
+    CURRENT = "current"
+    SKIPPED = "skipped"
+
+    def __init__(self, versions: DeviceVersions, action: str, current_build_id: str, target_build_id: str, reason: str = ""):
+        self.versions = versions
+        self.action = action
+        self.current_build_id = current_build_id
+        self.target_build_id = target_build_id
+        self.reason = reason
+
+def normalize_build_id(build_id: str) -> str:
+    return build_id.strip().lower() if build_id is not None else None
+
+class DeploymentPlanner:
+    """Plans a firmware or bootloader deployment with the minimum number of updates.
+
+    Name, firmware and bootloader build id of all devices are read in one parallel pass
+    and compared with the build id of the candidate image, devices already running it are
+    left out of the plan. The firmware build id of an image is taken from its file name
+    (<device name>-FIR-vXXXX-BXXXXXXX.fw), the bootloader build id has to be given.
+    """
+    def __init__(self, ctx: 'Context', device_handles: list = None):
+        if device_handles is None:
+            device_handles = list(ctx.connected_device_handles)
+
+        if len(device_handles) == 0:
+            raise Exception("DeploymentPlanner: no devices")
+
+        self.ctx = ctx
+        self.device_handles = device_handles
+        self.versions = []
+        self.entries = []
+
+    def read_versions(self, device_handle: Nanolib.DeviceHandle) -> DeviceVersions:
+        versions = DeviceVersions(device_handle)
+        for attribute, read_function in [
+            ("device_name", self.ctx.nanolib_accessor.getDeviceName),
+            ("firmware_build_id", self.ctx.nanolib_accessor.getDeviceFirmwareBuildId),
+            ("bootloader_build_id", self.ctx.nanolib_accessor.getDeviceBootloaderBuildId),
+        ]:
+            read_result: Nanolib.ResultString = read_function(device_handle)
+            if read_result.hasError():
+                versions.error = read_result.getError()
+                break
+            setattr(versions, attribute, read_result.getResult())
+        return versions
+
+    def read_all_versions(self) -> list:
+        """Read name and build ids of all devices (parallel, one pass).
+
+        :return: list of DeviceVersions
+        """
+        with ThreadPoolExecutor(max_workers=len(self.device_handles)) as executor:
+            self.versions = list(executor.map(self.read_versions, self.device_handles))
+        return self.versions
+
+    def plan(self, image: FirmwareImage, target_build_id: str = None) -> list:
+        """Plan the deployment of an image.
+
+        :param image: The firmware or bootloader image
+        :param target_build_id: The build id of the image, taken from the firmware file name if not given (optional)
+        :return: list of PlanEntry, one per device
+        """
+        if image.kind == BOOTLOADER and not target_build_id:
+            raise Exception("DeploymentPlanner: the build id of a bootloader image has to be given")
+
+        if not self.versions:
+            self.read_all_versions()
+
+        self.entries = []
+        for versions in self.versions:
+            current_build_id = versions.firmware_build_id if image.kind == FIRMWARE else versions.bootloader_build_id
+            if versions.error:
+                self.entries.append(PlanEntry(versions, PlanEntry.SKIPPED, None, None, versions.error))
+                continue
+
+            build_id = target_build_id
+            if image.kind == FIRMWARE:
+                image_build_id = image.get_build_id(versions.device_name)
+                if image_build_id is None:
+                    self.entries.append(PlanEntry(versions, PlanEntry.SKIPPED, current_build_id, None, f"image is not for '{versions.device_name}'"))
+                    continue
+                build_id = build_id or image_build_id
+
+            action = PlanEntry.CURRENT if normalize_build_id(current_build_id) == normalize_build_id(build_id) else PlanEntry.UPDATE
+            self.entries.append(PlanEntry(versions, action, current_build_id, build_id))
+
+        return self.entries
+
+    def get_device_handles_to_update(self) -> list:
+        return [entry.versions.device_handle for entry in self.entries if entry.action == PlanEntry.UPDATE]
+
+    def get_target_build_id(self) -> str:
+        """Get the build id the updated devices must report afterwards (None if no update is planned)."""
+        for entry in self.entries:
+            if entry.action == PlanEntry.UPDATE:
+                return entry.target_build_id
+        return None
+
+    def print_plan(self):
+        """Output the plan to console."""
+        number_of_updates = len(self.get_device_handles_to_update())
+        print(f"Deployment plan: {number_of_updates} of {len(self.entries)} devices need an update")
+        for entry in self.entries:
+            line = f"- {entry.versions.device_handle.toString()} ({entry.versions.device_name}): {entry.action}"
+            if entry.action == PlanEntry.UPDATE:
+                line += f" '{entry.current_build_id}' -> '{entry.target_build_id}'"
+            elif entry.action == PlanEntry.CURRENT:
+                line += f" '{entry.current_build_id}'"
+            if entry.reason:
+                line += f", {entry.reason}"
+            print(line)
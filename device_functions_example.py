@@ -30,8 +30,12 @@
 # @author Michael Milbradt
 #
 
-import time
 from menu_utils import *
+from device_rollout_example import FirmwareRollout
+from device_image_cache_example import FIRMWARE, BOOTLOADER, firmware_image_cache
+from device_deployment_example import DeploymentPlanner
+from device_nanoj_example import NanoJDeployment, wait_for_nanoj_status, NANOJ_STATUS_RUNNING, NANOJ_STATUS_STOPPED
+from sampler_example import invalidate_applied_sampler_configuration
 from nanotec_nanolib import *
 
 def scan_devices(ctx: Context):
@@ -132,6 +136,9 @@ def disconnect_device(ctx: Context):
         handle_error_message(ctx, "Error during disconnectDevice (removeDevice): ", result_void.getError())
         return
 
+    # the sampler configuration does not survive the disconnect
+    invalidate_applied_sampler_configuration(close_device_handle)
+
     # update ctx.connectedDeviceHandles
     ctx.connected_device_handles.remove(close_device_handle)
 
@@ -195,8 +202,16 @@ def update_firmware(ctx: Context):
     while input_path is None:
         input_path = get_string_with_prompt(''.join(prompt))
 
+    # Load and check the image before the transfer, a wrong file fails immediately
+    try:
+        firmware_image = firmware_image_cache.load(input_path, FIRMWARE)
+        firmware_image.validate_device_name(device_name)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during updateFirmware: ", str(exception))
+        return
+
     print("Do not interrupt the data connection or switch off the power until the update process has been finished!")
-    upload_result: Nanolib.ResultVoid = ctx.nanolib_accessor.uploadFirmwareFromFile(ctx.active_device, input_path, ctx.data_transfer_callback)
+    upload_result: Nanolib.ResultVoid = ctx.nanolib_accessor.uploadFirmware(ctx.active_device, firmware_image.get_byte_vector(), ctx.data_transfer_callback)
     
     if upload_result.hasError():
         handle_error_message(ctx, "Error during updateFirmware: ", upload_result.getError())
@@ -229,13 +244,94 @@ def update_bootloader(ctx: Context):
     while input_path is None:
         input_path = get_string_with_prompt(''.join(prompt))
 
+    # Load and check the image before the transfer, a wrong file fails immediately
+    try:
+        bootloader_image = firmware_image_cache.load(input_path, BOOTLOADER)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during updateBootloader: ", str(exception))
+        return
+
     print("Do not interrupt the data connection or switch off the power until the update process has been finished!")
-    upload_result: Nanolib.ResultVoid = ctx.nanolib_accessor.uploadBootloaderFromFile(ctx.active_device, input_path, ctx.data_transfer_callback)
+    upload_result: Nanolib.ResultVoid = ctx.nanolib_accessor.uploadBootloader(ctx.active_device, bootloader_image.get_byte_vector(), ctx.data_transfer_callback)
 
     if upload_result.hasError():
         handle_error_message(ctx, "Error during updateBootloader: ", upload_result.getError())
         return
 
+def update_all_devices(ctx: Context, kind: str):
+    """Update the firmware or the bootloader of all connected devices not up to date, concurrently.
+    
+    :param ctx: menu context
+    :param kind: FirmwareRollout.FIRMWARE or FirmwareRollout.BOOTLOADER
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if not ctx.connected_device_handles:
+        handle_error_message(ctx, "No connected devices. Connect a device first.")
+        return
+
+    input_path = None
+    prompt = []
+    if kind == FirmwareRollout.FIRMWARE:
+        device_name_result: Nanolib.ResultString = ctx.nanolib_accessor.getDeviceName(ctx.connected_device_handles[0])
+        prompt.append("Please enter the full path to the firmware file (e.g. {}-FIR-vXXXX-BXXXXXXX.fw): ".format(device_name_result.getResult()))
+    else:
+        prompt.append("Please enter the full path to the bootloader file: ")
+
+    while input_path is None:
+        input_path = get_string_with_prompt(''.join(prompt))
+
+    if kind == FirmwareRollout.FIRMWARE:
+        expected_build_id = get_string_with_prompt("Expected firmware build id after the update (empty: from the file name): ")
+    else:
+        expected_build_id = get_string_with_prompt("Expected bootloader build id after the update (empty: update all devices, no check): ")
+
+    # Only devices not running the build id of the image yet are updated
+    device_handles = list(ctx.connected_device_handles)
+    try:
+        image = firmware_image_cache.load(input_path, kind)
+        if kind == FirmwareRollout.FIRMWARE or expected_build_id:
+            deployment_planner = DeploymentPlanner(ctx, device_handles)
+            deployment_planner.plan(image, expected_build_id)
+            deployment_planner.print_plan()
+            device_handles = deployment_planner.get_device_handles_to_update()
+            expected_build_id = deployment_planner.get_target_build_id()
+
+        if not device_handles:
+            print(f"All devices are up to date, no {kind} update needed.")
+            return
+
+        firmware_rollout = FirmwareRollout(ctx, device_handles)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during update of all devices: ", str(exception))
+        return
+
+    print(f"Updating the {kind} of {len(firmware_rollout.device_handles)} devices, at most {firmware_rollout.max_per_bus} per bus at a time ...")
+    print("Do not interrupt the data connection or switch off the power until the update process has been finished!")
+    try:
+        all_updated = firmware_rollout.run(kind, input_path, expected_build_id)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during update of all devices: ", str(exception))
+        return
+    firmware_rollout.print_report()
+
+    if not all_updated:
+        handle_error_message(ctx, "Error during update of all devices: ", f"{kind} update failed on at least one device")
+
+def update_firmware_all_devices(ctx: Context):
+    """Update the firmware of all connected devices concurrently.
+    
+    :param ctx: menu context
+    """
+    update_all_devices(ctx, FirmwareRollout.FIRMWARE)
+
+def update_bootloader_all_devices(ctx: Context):
+    """Update the bootloader of all connected devices concurrently.
+    
+    :param ctx: menu context
+    """
+    update_all_devices(ctx, FirmwareRollout.BOOTLOADER)
+
 def upload_nanoj(ctx: Context):
     """Upload a compiled NanoJ binary to the current active device.
     
@@ -255,6 +351,7 @@ def upload_nanoj(ctx: Context):
         input_path = get_string_with_prompt(''.join(prompt))
 
     print("Do not interrupt the data connection or switch off the power until the update process has been finished!")
+    invalidate_applied_sampler_configuration(ctx.active_device)
     upload_result: Nanolib.ResultVoid = ctx.nanolib_accessor.uploadNanoJFromFile(ctx.active_device, input_path, ctx.data_transfer_callback)
 
     if upload_result.hasError():
@@ -263,6 +360,38 @@ def upload_nanoj(ctx: Context):
 
     print("Use runNanoJ menu option to re-start the uploaded NanoJ program.")
 
+def deploy_nanoj_all_devices(ctx: Context):
+    """Upload a compiled NanoJ binary to all connected devices in parallel, skipping devices holding it already.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if not ctx.connected_device_handles:
+        handle_error_message(ctx, "No connected devices. Connect a device first.")
+        return
+
+    input_path = None
+    prompt = []
+    prompt.append("Please enter the full path to the NanoJ file (e.g. vmmcode.usr): ")
+
+    while input_path is None:
+        input_path = get_string_with_prompt(''.join(prompt))
+
+    force = get_string_with_prompt("Upload to devices holding the same program too? [y/n]: ")
+
+    print("Do not interrupt the data connection or switch off the power until the update process has been finished!")
+    try:
+        nanoj_deployment = NanoJDeployment(ctx)
+        all_deployed = nanoj_deployment.deploy(input_path, force=(force is not None and force.lower() == "y"))
+    except Exception as exception:
+        handle_error_message(ctx, "Error during deployNanoJ: ", str(exception))
+        return
+
+    nanoj_deployment.print_report()
+    if not all_deployed:
+        handle_error_message(ctx, "Error during deployNanoJ: ", "deployment or start failed on at least one device")
+
 def run_nanoj(ctx: Context):
     """Executes the NanoJ program on the current active device if available.
     
@@ -290,8 +419,12 @@ def run_nanoj(ctx: Context):
         handle_error_message(ctx, "Error during runNanoJ: ", writeNumber_result.getError())
         return
 
-    # start might take some time (up to 200ms)
-    time.sleep(0.25)
+    # start might take some time (up to 200ms), the status is polled until running.
+    # A program may also finish (or fail) within that time, the status is evaluated below.
+    wait_result = wait_for_nanoj_status(ctx, ctx.active_device, NANOJ_STATUS_RUNNING, timeout=0.25)
+    if wait_result.hasError() and wait_result.getResult() is None:
+        handle_error_message(ctx, "Error during runNanoJ: ", wait_result.getError())
+        return
 
     # check if running and no error
     error_result = ctx.nanolib_accessor.readNumber(ctx.active_device, "odNanoJError")
@@ -333,8 +466,11 @@ def stop_nanoj(ctx: Context):
         handle_error_message(ctx, "Error during stopNanoJ: ", writeNumber_result.getError())
         return
 
-    # stop might take some time
-    time.sleep(0.05)
+    # stop might take some time, the status is polled until stopped
+    wait_result = wait_for_nanoj_status(ctx, ctx.active_device, NANOJ_STATUS_STOPPED, timeout=0.25)
+    if wait_result.hasError():
+        handle_error_message(ctx, "Error during stopNanoJ - program not stopped: ", wait_result.getError())
+        return
 
     read_number_result: Nanolib.ResultInt = ctx.nanolib_accessor.readNumber(ctx.active_device, "odNanoJStatus")
     if read_number_result.hasError():
@@ -650,10 +786,10 @@ def restore_defaults(ctx: Context):
         return
 
     # Wait until write has completed
-    while True:
-        store_result: Nanolib.ResultInt = ctx.nanolib_accessor.readNumber(ctx.active_device, OdIndex.odStoreAllParams)
-        if store_result.getResult() == 1:
-            break
+    wait_result = wait_until(ctx, ctx.active_device, OdIndex.odStoreAllParams, 0xFFFFFFFF, 1, timeout=10.0)
+    if wait_result.hasError():
+        handle_error_message(ctx, "Error during restoreDefaults: ", wait_result.getError())
+        return
 
     # Reboot current active device
     print("Rebooting ...")
@@ -0,0 +1,131 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   device_image_cache_example.py
+#
+# @brief  Definition of the shared firmware and bootloader image cache with pre-validation
+#
+
+import os
+import re
+import threading
+from nanotec_nanolib import Nanolib
+
+FIRMWARE = "firmware"
+BOOTLOADER = "bootloader"
+
+# Smallest plausible image size in bytes
+MINIMUM_IMAGE_SIZE = 1024
+
+# Signatures of files that are no firmware or bootloader image
+FOREIGN_SIGNATURES = {
+    b"PK\x03\x04": "zip archive, unpack it first",
+    b"\x7fELF": "ELF executable",
+    b"<?xml": "XML file",
+}
+
+# Firmware file name: <device name>-FIR-vXXXX-BXXXXXXX.fw, the part after the device name is the build id
+FIRMWARE_FILE_NAME_PATTERN = r"^{device_name}-(?P<build_id>FIR-v\d+-B\d+)\.fw$"
+
+class FirmwareImage:
+    """One firmware or bootloader file, read once into a byte vector shared by all uploads.
+
+    The file is closed after reading, so it can be replaced while the image is cached.
+    """
+    def __init__(self, path: str, kind: str):
+        self.path = path
+        self.kind = kind
+        self.file_name = os.path.basename(path)
+
+        with open(path, "rb") as file:
+            self.size = os.fstat(file.fileno()).st_size
+            if self.size < MINIMUM_IMAGE_SIZE:
+                raise Exception(f"FirmwareImage: '{self.file_name}' has only {self.size} bytes")
+            self.validate_header(file.read(16))
+            file.seek(0)
+            self.byte_vector = Nanolib.ByteVector(file.read())
+
+    def validate_header(self, header: bytes):
+        """Reject files that are obviously no image (archives, executables, XML files).
+
+        :param header: The first bytes of the file
+        """
+        for signature, description in FOREIGN_SIGNATURES.items():
+            if header.lstrip().startswith(signature):
+                raise Exception(f"FirmwareImage: '{self.file_name}' is no {self.kind} image ({description})")
+
+    def get_build_id(self, device_name: str) -> str:
+        """Get the build id encoded in the firmware file name.
+
+        :param device_name: The device name (see getDeviceName)
+        :return: the build id (e.g. FIR-v2213-B1026181) or None if the name does not match
+        """
+        match = re.match(FIRMWARE_FILE_NAME_PATTERN.format(device_name=re.escape(device_name)), self.file_name, re.IGNORECASE)
+        return match.group("build_id") if match else None
+
+    def validate_device_name(self, device_name: str):
+        """Check that the image is meant for a device (firmware file name pattern)."""
+        if self.kind == FIRMWARE and self.get_build_id(device_name) is None:
+            raise Exception(f"FirmwareImage: '{self.file_name}' does not match {device_name}-FIR-vXXXX-BXXXXXXX.fw")
+
+    def get_byte_vector(self) -> Nanolib.ByteVector:
+        """Get the image as byte vector for uploadFirmware/uploadBootloader."""
+        return self.byte_vector
+
+class FirmwareImageCache:
+    """Loads every firmware or bootloader file only once.
+
+    One image is kept per file and kind. If size or modification time of the file changed,
+    the file is loaded again and replaces the older image.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.images = {} # (real path, kind) -> ((size, modification time), image)
+
+    def load(self, path: str, kind: str = FIRMWARE) -> FirmwareImage:
+        """Get the image of a file, validated on first load.
+
+        :param path: The firmware or bootloader file
+        :param kind: FIRMWARE or BOOTLOADER (optional)
+        :return: the shared image
+        """
+        if not os.path.isfile(path):
+            raise Exception(f"FirmwareImageCache: file '{path}' not found")
+
+        status = os.stat(path)
+        key = (os.path.realpath(path), kind)
+        version = (status.st_size, status.st_mtime_ns)
+        with self.lock:
+            cached = self.images.get(key)
+            if cached is None or cached[0] != version:
+                # evict the older image of this file first, even if the new one fails to load
+                self.images.pop(key, None)
+                self.images[key] = (version, FirmwareImage(path, kind))
+            return self.images[key][1]
+
+    def clear(self):
+        with self.lock:
+            self.images = {}
+
+# Image cache shared by all firmware and bootloader uploads
+firmware_image_cache = FirmwareImageCache()
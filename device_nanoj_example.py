@@ -0,0 +1,239 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   device_nanoj_example.py
+#
+# @brief  Definition of the parallel NanoJ deployment with upload skipping and status polling
+#
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from menu_utils import Context, OdIndex, WaitResult, wait_until, get_device_key, get_bus_key
+from data_transfer_callback_example import DataTransferCallbackExample
+from device_rollout_example import TransferProgress
+from sampler_example import invalidate_applied_sampler_configuration
+from nanotec_nanolib import Nanolib
+
+# Values of the NanoJ status object (0x2301)
+NANOJ_STATUS_STOPPED = 0
+NANOJ_STATUS_RUNNING = 1
+
+DEFAULT_NANOJ_MANIFEST_PATH = "nanoj_manifest.json"
+
+def wait_for_nanoj_status(ctx: 'Context', device_handle: Nanolib.DeviceHandle, status: int, timeout: float = 1.0) -> WaitResult:
+    """Wait until the NanoJ status object has the expected value.
+
+    :param ctx: menu context
+    :param device_handle: The device handle
+    :param status: The expected status (NANOJ_STATUS_STOPPED or NANOJ_STATUS_RUNNING)
+    :param timeout: Timeout in seconds (optional)
+    :return: the wait result, its value is the last read status
+    """
+    return wait_until(ctx, device_handle, OdIndex.odNanoJStatus, 0xFFFFFFFF, status, timeout=timeout,
+                      min_interval=0.005, max_interval=0.02)
+
+class NanoJDeployment:
+    """Deploys a NanoJ program (vmmcode.usr) to many devices in parallel.
+
+    The program is hashed and read only once. A local manifest records per device (product
+    code and serial number) the hash of the last uploaded program, devices holding the same
+    program are not uploaded again. Devices on different bus hardware are uploaded in
+    parallel, at most max_per_bus at a time on a shared bus. Stop and start of the program
+    are detected by polling the NanoJ status with a deadline.
+
+    The manifest only knows uploads done through it, use force after a program was changed
+    by other tools.
+    """
+    UPLOADED = "uploaded"
+    UNCHANGED = "unchanged"
+    FAILED = "failed"
+
+    def __init__(self, ctx: 'Context', device_handles: list = None, manifest_path: str = DEFAULT_NANOJ_MANIFEST_PATH,
+                 max_per_bus: int = 1, status_timeout: float = 1.0):
+        if device_handles is None:
+            device_handles = list(ctx.connected_device_handles)
+
+        if len(device_handles) == 0:
+            raise Exception("NanoJDeployment: no devices")
+        if max_per_bus < 1:
+            raise Exception("NanoJDeployment: max_per_bus must be positive")
+
+        self.ctx = ctx
+        self.device_handles = device_handles
+        self.bus_keys = [get_bus_key(ctx, device_handle) for device_handle in device_handles]
+        self.manifest_path = manifest_path
+        self.max_per_bus = max_per_bus
+        self.status_timeout = status_timeout
+
+        self.manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as file:
+                self.manifest = json.load(file)
+        self.manifest_lock = threading.Lock()
+
+        number_of_devices = len(device_handles)
+        self.progress = TransferProgress(number_of_devices)
+        self.callbacks = [DataTransferCallbackExample(self.progress, index) for index in range(number_of_devices)]
+        self.results = [None] * number_of_devices
+        self.started = [False] * number_of_devices # start succeeded, the program is running or finished without error
+        self.running = [False] * number_of_devices
+        self.errors = [""] * number_of_devices
+
+    def save_manifest(self):
+        temporary_path = self.manifest_path + ".tmp"
+        with self.manifest_lock:
+            with open(temporary_path, "w") as file:
+                json.dump(self.manifest, file, indent=2)
+        os.replace(temporary_path, self.manifest_path)
+
+    def write_nanoj_control(self, index: int, value: int):
+        write_result: Nanolib.ResultVoid = self.ctx.nanolib_accessor.writeNumber(self.device_handles[index], value, OdIndex.odNanoJControl, 32)
+        if write_result.hasError():
+            raise Exception(write_result.getError())
+
+    def stop(self, index: int):
+        """Stop the program of a device and wait until it is stopped."""
+        self.write_nanoj_control(index, 0x00)
+        wait_result = wait_for_nanoj_status(self.ctx, self.device_handles[index], NANOJ_STATUS_STOPPED, self.status_timeout)
+        if wait_result.hasError():
+            raise Exception("stop: " + wait_result.getError())
+
+    def start(self, index: int):
+        """Start the program of a device and wait until it is running.
+
+        A program that already finished without error (stopped, NanoJ error 0) is started successfully as well.
+        """
+        device_handle = self.device_handles[index]
+        self.write_nanoj_control(index, 0x01)
+        wait_result = wait_for_nanoj_status(self.ctx, device_handle, NANOJ_STATUS_RUNNING, self.status_timeout)
+        if not wait_result.hasError():
+            self.running[index] = True
+            self.started[index] = True
+            return
+
+        if wait_result.getResult() is None:
+            raise Exception("start: " + wait_result.getError())
+
+        error_result: Nanolib.ResultInt = self.ctx.nanolib_accessor.readNumber(device_handle, OdIndex.odNanoJError)
+        if error_result.hasError():
+            raise Exception("start: " + error_result.getError())
+        if error_result.getResult() != 0:
+            raise Exception(f"start: program exited with error {error_result.getResult()}")
+        if wait_result.getResult() != NANOJ_STATUS_STOPPED:
+            raise Exception("start: " + wait_result.getError())
+        # finished normally within the status timeout
+        self.started[index] = True
+
+    def deploy_device(self, index: int, key: str, file_hash: str, byte_vector, force: bool, bus_semaphore: threading.Semaphore):
+        with self.manifest_lock:
+            entry = self.manifest.get(key)
+        if not force and entry is not None and entry.get("sha256") == file_hash:
+            self.results[index] = NanoJDeployment.UNCHANGED
+            self.progress.set_state(index, TransferProgress.DONE)
+            return
+
+        with bus_semaphore:
+            try:
+                self.stop(index)
+                invalidate_applied_sampler_configuration(self.device_handles[index])
+                upload_result: Nanolib.ResultVoid = self.ctx.nanolib_accessor.uploadNanoJ(self.device_handles[index], byte_vector, self.callbacks[index])
+                if upload_result.hasError():
+                    raise Exception(upload_result.getError())
+            except Exception as exception:
+                self.results[index] = NanoJDeployment.FAILED
+                self.errors[index] = str(exception)
+                self.progress.set_state(index, TransferProgress.FAILED)
+                # the program on the device is unknown now
+                with self.manifest_lock:
+                    self.manifest.pop(key, None)
+                return
+
+        with self.manifest_lock:
+            self.manifest[key] = {"sha256": file_hash, "uploaded": time.strftime("%Y-%m-%d %H:%M:%S")}
+        self.results[index] = NanoJDeployment.UPLOADED
+        self.progress.set_state(index, TransferProgress.DONE)
+
+    def deploy(self, path: str, force: bool = False, start: bool = True) -> bool:
+        """Deploy a NanoJ program to all devices.
+
+        :param path: The NanoJ file (e.g. vmmcode.usr)
+        :param force: upload even if the manifest holds the same program (optional)
+        :param start: start the program on all devices afterwards (optional)
+        :return: True if deployed (and started) on all devices
+        """
+        if not os.path.isfile(path):
+            raise Exception(f"NanoJDeployment: file '{path}' not found")
+
+        with open(path, "rb") as file:
+            data = file.read()
+        file_hash = hashlib.sha256(data).hexdigest()
+        byte_vector = Nanolib.ByteVector(data)
+
+        number_of_devices = len(self.device_handles)
+        bus_semaphores = {bus_key: threading.Semaphore(self.max_per_bus) for bus_key in set(self.bus_keys)}
+
+        def deploy_device_with_key(index):
+            # a device whose key cannot be read fails alone, the others are still deployed
+            try:
+                key = get_device_key(self.ctx, self.device_handles[index])
+            except Exception as exception:
+                self.results[index] = NanoJDeployment.FAILED
+                self.errors[index] = str(exception)
+                self.progress.set_state(index, TransferProgress.FAILED)
+                return
+            self.deploy_device(index, key, file_hash, byte_vector, force, bus_semaphores[self.bus_keys[index]])
+
+        with ThreadPoolExecutor(max_workers=number_of_devices) as executor:
+            list(executor.map(deploy_device_with_key, range(number_of_devices)))
+        self.save_manifest()
+
+        if start:
+            def start_device(index):
+                try:
+                    self.start(index)
+                except Exception as exception:
+                    self.errors[index] = str(exception)
+
+            indices = [index for index, result in enumerate(self.results) if result != NanoJDeployment.FAILED]
+            if indices:
+                with ThreadPoolExecutor(max_workers=len(indices)) as executor:
+                    list(executor.map(start_device, indices))
+
+        return all(result != NanoJDeployment.FAILED and (self.started[index] or not start) for index, result in enumerate(self.results))
+
+    def print_report(self):
+        """Output the result per device to console."""
+        print("NanoJ deployment results:")
+        for index, device_handle in enumerate(self.device_handles):
+            line = f"- {device_handle.toString()} on {self.bus_keys[index]}: {self.results[index]}"
+            if self.running[index]:
+                line += ", running"
+            elif self.started[index]:
+                line += ", finished"
+            if self.errors[index]:
+                line += f", error: {self.errors[index]}"
+            print(line)
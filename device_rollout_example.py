@@ -0,0 +1,223 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   device_rollout_example.py
+#
+# @brief  Definition of the concurrent firmware and bootloader rollout for all connected devices
+#
+
+import collections
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from menu_utils import Context, get_bus_key
+from data_transfer_callback_example import DataTransferCallbackExample
+from device_image_cache_example import FIRMWARE, BOOTLOADER, FirmwareImage, FirmwareImageCache, firmware_image_cache
+from device_deployment_example import normalize_build_id
+from nanotec_nanolib import Nanolib
+
+class TransferProgress:
+    """Aggregated progress of concurrent data transfers, updated by DataTransferCallbackExample."""
+    WAITING = "waiting"
+    TRANSFER = "transfer"
+    REBOOT = "reboot"
+    VERIFY = "verify"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, number_of_devices: int):
+        self.lock = threading.Lock()
+        self.states = [TransferProgress.WAITING] * number_of_devices
+        self.percents = [0] * number_of_devices
+
+    def update(self, device_index: int, info, data):
+        """Update the progress of one device from a data transfer callback."""
+        with self.lock:
+            if info == Nanolib.DataTransferInfo_FileOpen:
+                self.states[device_index] = TransferProgress.TRANSFER
+                self.percents[device_index] = 0
+            elif info == Nanolib.DataTransferInfo_Progress:
+                # data holds the transfer progress in percent
+                self.percents[device_index] = min(max(int(data), 0), 100)
+            elif info == Nanolib.DataTransferInfo_Finished:
+                self.percents[device_index] = 100
+            elif info == Nanolib.DataTransferInfo_Reboot:
+                self.states[device_index] = TransferProgress.REBOOT
+
+    def set_state(self, device_index: int, state: str):
+        with self.lock:
+            self.states[device_index] = state
+
+    def get_line(self) -> str:
+        """Get the aggregated progress as one line."""
+        with self.lock:
+            counts = collections.Counter(self.states)
+            transfer_percents = [self.percents[index] for index, state in enumerate(self.states) if state == TransferProgress.TRANSFER]
+
+        line = ", ".join(f"{counts[state]} {state}" for state in
+                         [TransferProgress.WAITING, TransferProgress.TRANSFER, TransferProgress.REBOOT,
+                          TransferProgress.VERIFY, TransferProgress.DONE, TransferProgress.FAILED] if counts[state] > 0)
+        if transfer_percents:
+            line += f" (transfer {sum(transfer_percents) / len(transfer_percents):.0f}% on average)"
+        return line
+
+class FirmwareRollout:
+    """Updates the firmware or the bootloader of many devices concurrently.
+
+    Devices on different bus hardware are updated in parallel, devices sharing a bus (e.g.
+    a CAN line) at most max_per_bus at a time. A failed upload or verification is retried.
+    After the upload the build id is read back until the device answers again and compared
+    with the expected build id if given.
+    """
+    FIRMWARE = FIRMWARE
+    BOOTLOADER = BOOTLOADER
+
+    def __init__(self, ctx: 'Context', device_handles: list = None, max_per_bus: int = 1, retries: int = 2,
+                 verify_timeout: float = 60.0, image_cache: FirmwareImageCache = None):
+        if device_handles is None:
+            device_handles = list(ctx.connected_device_handles)
+
+        if len(device_handles) == 0:
+            raise Exception("FirmwareRollout: no devices")
+        if max_per_bus < 1:
+            raise Exception("FirmwareRollout: max_per_bus must be positive")
+
+        self.ctx = ctx
+        self.device_handles = device_handles
+        self.bus_keys = [get_bus_key(ctx, device_handle) for device_handle in device_handles]
+        self.max_per_bus = max_per_bus
+        self.retries = retries
+        self.verify_timeout = verify_timeout
+        self.image_cache = image_cache if image_cache is not None else firmware_image_cache
+
+        number_of_devices = len(device_handles)
+        self.progress = TransferProgress(number_of_devices)
+        self.callbacks = [DataTransferCallbackExample(self.progress, index) for index in range(number_of_devices)]
+        self.build_ids_before = [None] * number_of_devices
+        self.build_ids_after = [None] * number_of_devices
+        self.attempts = [0] * number_of_devices
+        self.errors = [""] * number_of_devices
+
+    def read_build_id(self, index: int, kind: str) -> Nanolib.ResultString:
+        device_handle = self.device_handles[index]
+        if kind == FirmwareRollout.BOOTLOADER:
+            return self.ctx.nanolib_accessor.getDeviceBootloaderBuildId(device_handle)
+        return self.ctx.nanolib_accessor.getDeviceFirmwareBuildId(device_handle)
+
+    def upload(self, index: int, image: FirmwareImage) -> Nanolib.ResultVoid:
+        device_handle = self.device_handles[index]
+        if image.kind == FirmwareRollout.BOOTLOADER:
+            return self.ctx.nanolib_accessor.uploadBootloader(device_handle, image.get_byte_vector(), self.callbacks[index])
+        return self.ctx.nanolib_accessor.uploadFirmware(device_handle, image.get_byte_vector(), self.callbacks[index])
+
+    def validate(self, image: FirmwareImage):
+        """Check the image against the name of every device before any transfer starts."""
+        for device_handle in self.device_handles:
+            device_name_result: Nanolib.ResultString = self.ctx.nanolib_accessor.getDeviceName(device_handle)
+            if device_name_result.hasError():
+                raise Exception(f"FirmwareRollout ({device_handle.toString()}): {device_name_result.getError()}")
+            image.validate_device_name(device_name_result.getResult())
+
+    def wait_for_build_id(self, index: int, kind: str) -> str:
+        """Read the build id until the device answers after its reboot."""
+        deadline = time.perf_counter() + self.verify_timeout
+        while True:
+            build_id_result = self.read_build_id(index, kind)
+            if not build_id_result.hasError():
+                return build_id_result.getResult()
+            if time.perf_counter() >= deadline:
+                raise Exception(f"build id not readable after {self.verify_timeout:g} s: {build_id_result.getError()}")
+            time.sleep(0.5)
+
+    def update_device(self, index: int, image: FirmwareImage, expected_build_id: str, bus_semaphore: threading.Semaphore):
+        kind = image.kind
+        build_id_result = self.read_build_id(index, kind)
+        if not build_id_result.hasError():
+            self.build_ids_before[index] = build_id_result.getResult()
+
+        with bus_semaphore:
+            for attempt in range(1, self.retries + 2):
+                self.attempts[index] = attempt
+                upload_result = self.upload(index, image)
+                try:
+                    if upload_result.hasError():
+                        raise Exception(upload_result.getError())
+
+                    self.progress.set_state(index, TransferProgress.VERIFY)
+                    self.build_ids_after[index] = self.wait_for_build_id(index, kind)
+                    if expected_build_id and normalize_build_id(self.build_ids_after[index]) != normalize_build_id(expected_build_id):
+                        raise Exception(f"build id '{self.build_ids_after[index]}' instead of '{expected_build_id}'")
+
+                    self.errors[index] = ""
+                    self.progress.set_state(index, TransferProgress.DONE)
+                    return
+                except Exception as exception:
+                    self.errors[index] = str(exception)
+
+            self.progress.set_state(index, TransferProgress.FAILED)
+
+    def run(self, kind: str, path: str, expected_build_id: str = None, progress_interval: float = 2.0) -> bool:
+        """Update all devices, output the aggregated progress to console.
+
+        The image is loaded from the shared image cache and validated against all devices
+        first, a wrong file fails before any transfer.
+
+        :param kind: FirmwareRollout.FIRMWARE or FirmwareRollout.BOOTLOADER
+        :param path: The firmware or bootloader file
+        :param expected_build_id: The build id the devices must report afterwards (optional)
+        :param progress_interval: Time between progress outputs in s (optional)
+        :return: True if all devices were updated
+        """
+        if kind not in (FirmwareRollout.FIRMWARE, FirmwareRollout.BOOTLOADER):
+            raise Exception(f"FirmwareRollout: unknown kind '{kind}'")
+
+        image = self.image_cache.load(path, kind)
+        self.validate(image)
+
+        bus_semaphores = {bus_key: threading.Semaphore(self.max_per_bus) for bus_key in set(self.bus_keys)}
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=len(self.device_handles)) as executor:
+            futures = [executor.submit(self.update_device, index, image, expected_build_id, bus_semaphores[self.bus_keys[index]])
+                       for index in range(len(self.device_handles))]
+            last_line = None
+            while True:
+                not_done = wait(futures, timeout=progress_interval).not_done
+                line = self.progress.get_line()
+                if line != last_line:
+                    print(f"Update of {len(self.device_handles)} devices after {time.perf_counter() - start_time:.0f} s: {line}")
+                    last_line = line
+                if not not_done:
+                    break
+
+        return all(state == TransferProgress.DONE for state in self.progress.states)
+
+    def print_report(self):
+        """Output the result per device to console."""
+        print("Update results:")
+        for index, device_handle in enumerate(self.device_handles):
+            line = (f"- {device_handle.toString()} on {self.bus_keys[index]}: {self.progress.states[index]}"
+                    f" after {self.attempts[index]} attempt(s), build id '{self.build_ids_before[index]}' -> '{self.build_ids_after[index]}'")
+            if self.errors[index]:
+                line += f", error: {self.errors[index]}"
+            print(line)
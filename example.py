@@ -135,8 +135,12 @@ def main():
     # Build the motor menu
     motor_menu = Menu(MOTOR_EXAMPLE_MENU, [
         Menu.MenuItem(MOTOR_AUTO_SETUP_MI, motor_auto_setup, False),
+        Menu.MenuItem(MOTOR_FLEET_AUTO_SETUP_MI, execute_fleet_auto_setup, False),
         Menu.MenuItem(MOTOR_VELOCITY_MI, execute_profile_velocity_mode, False),
-        Menu.MenuItem(MOTOR_POSITIONING_MI, execute_positioning_mode, False)
+        Menu.MenuItem(MOTOR_POSITIONING_MI, execute_positioning_mode, False),
+        Menu.MenuItem(MOTOR_SET_POINT_QUEUE_MI, execute_positioning_set_point_queue, False),
+        Menu.MenuItem(MOTOR_GROUP_POSITIONING_MI, execute_group_positioning_mode, False),
+        Menu.MenuItem(MOTOR_CYCLIC_POSITION_MI, execute_cyclic_synchronous_position_mode, False)
     ])
 
     # Build the sampler menu
@@ -146,7 +150,15 @@ def main():
         Menu.MenuItem(SAMPLER_CONTINUOUS_WO_NOTIFY_MI, execute_sampler_without_notification_continuous_mode, False),
         Menu.MenuItem(SAMPLER_NORMAL_WITH_NOTIFY_MI, execute_sampler_with_notification_normal_mode, False),
         Menu.MenuItem(SAMPLER_REPETETIVE_WITH_NOTIFY_MI, execute_sampler_with_notification_repetitive_mode, False),
-        Menu.MenuItem(SAMPLER_CONTINUOUS_WITH_NOTIFY_MI, execute_sampler_with_notification_continuous_mode, False)
+        Menu.MenuItem(SAMPLER_CONTINUOUS_WITH_NOTIFY_MI, execute_sampler_with_notification_continuous_mode, False),
+        Menu.MenuItem(SAMPLER_STREAM_CONTINUOUS_MI, execute_sampler_stream_continuous_mode, False),
+        Menu.MenuItem(SAMPLER_CAPTURE_CONTINUOUS_MI, execute_sampler_capture_continuous_mode, False),
+        Menu.MenuItem(SAMPLER_MULTI_DEVICE_NORMAL_MI, execute_sampler_multi_device_normal_mode, False),
+        Menu.MenuItem(SAMPLER_STATISTICS_CONTINUOUS_MI, execute_sampler_statistics_continuous_mode, False),
+        Menu.MenuItem(SAMPLER_RATE_PLANNER_NORMAL_MI, execute_sampler_rate_planner_normal_mode, False),
+        Menu.MenuItem(SAMPLER_SOFTWARE_ENGINE_NORMAL_MI, execute_sampler_software_engine_normal_mode, False),
+        Menu.MenuItem(SAMPLER_TRIGGER_CONTINUOUS_MI, execute_sampler_trigger_continuous_mode, False),
+        Menu.MenuItem(SAMPLER_PRE_TRIGGER_CONTINUOUS_MI, execute_sampler_pre_trigger_continuous_mode, False)
     ])
 
     # Build the log callback menu
@@ -213,7 +225,10 @@ def main():
         Menu.MenuItem(DEVICE_INFORMATION_MENU, device_info_menu, False),
         Menu.MenuItem(DEVICE_UPDATE_FW_MI, update_firmware, False),
         Menu.MenuItem(DEVICE_UPDATE_BL_MI, update_bootloader, False),
+        Menu.MenuItem(DEVICE_UPDATE_FW_ALL_MI, update_firmware_all_devices, False),
+        Menu.MenuItem(DEVICE_UPDATE_BL_ALL_MI, update_bootloader_all_devices, False),
         Menu.MenuItem(DEVICE_UPLOAD_NANOJ_MI, upload_nanoj, False),
+        Menu.MenuItem(DEVICE_DEPLOY_NANOJ_ALL_MI, deploy_nanoj_all_devices, False),
         Menu.MenuItem(DEVICE_RUN_NANOJ_MI, run_nanoj, False),
         Menu.MenuItem(DEVICE_STOP_NANOJ_MI, stop_nanoj, False),
         Menu.MenuItem(DEVICE_GET_ERROR_FIELD_MI, get_error_fields, False),
@@ -30,7 +30,7 @@
 # @author Michael Milbradt
 #
 
-import os, sys
+import os, sys, threading, time
 from typing import Callable, List, Optional, TypeVar, Any, Union
 from menu_color import MenuColor, ColorModifier
 from nanotec_nanolib import Nanolib 
@@ -52,6 +52,9 @@ class OdIndex:
     odModeOfOperation = Nanolib.OdIndex(0x6060, 0x00)
     odTargetVelocity = Nanolib.OdIndex(0x60FF, 0x00)
     odProfileVelocity = Nanolib.OdIndex(0x6081, 0x00)
+    odProfileAcceleration = Nanolib.OdIndex(0x6083, 0x00)
+    odProfileDeceleration = Nanolib.OdIndex(0x6084, 0x00)
+    odProfileJerk = Nanolib.OdIndex(0x60A4, 0x01)
     odTargetPosition = Nanolib.OdIndex(0x607A, 0x00)
     odErrorStackIndex = 0x1003
     odErrorCount = Nanolib.OdIndex(0x1003, 0x00)
@@ -63,6 +66,10 @@ class OdIndex:
     odRestoreAllDefParams = Nanolib.OdIndex(0x1011, 0x01)
     odRestoreTuningDefParams = Nanolib.OdIndex(0x1011, 0x06)
     odModeOfOperationDisplay = Nanolib.OdIndex(0x6061, 0x00)
+    odPositionActualValue = Nanolib.OdIndex(0x6064, 0x00)
+    odInterpolationTimePeriodValue = Nanolib.OdIndex(0x60C2, 0x01)
+    odInterpolationTimeIndex = Nanolib.OdIndex(0x60C2, 0x02)
+    odUptimeSeconds = Nanolib.OdIndex(0x230F, 0x00)
 
 # Menu texts
 BUS_HARDWARE_MENU = "Bus Hardware Menu"
@@ -79,7 +86,10 @@ DEVICE_SELECT_ACTIVE_MENU = "Select active device"
 DEVICE_REBOOT_MI = "Reboot device"
 DEVICE_UPDATE_FW_MI = "Update firmware"
 DEVICE_UPDATE_BL_MI = "Update bootloader"
+DEVICE_UPDATE_FW_ALL_MI = "Update firmware of all connected devices (skip up-to-date devices)"
+DEVICE_UPDATE_BL_ALL_MI = "Update bootloader of all connected devices (skip up-to-date devices)"
 DEVICE_UPLOAD_NANOJ_MI = "Upload NanoJ program"
+DEVICE_DEPLOY_NANOJ_ALL_MI = "Deploy NanoJ program to all connected devices (skip unchanged)"
 DEVICE_RUN_NANOJ_MI = "Run NanoJ program"
 DEVICE_STOP_NANOJ_MI = "Stop NanoJ program"
 
@@ -136,11 +146,23 @@ SAMPLER_CONTINUOUS_WO_NOTIFY_MI = "Sampler w/o Notification - Continuous Mode"
 SAMPLER_NORMAL_WITH_NOTIFY_MI = "Sampler with Notification - Normal Mode"
 SAMPLER_REPETETIVE_WITH_NOTIFY_MI = "Sampler with Notification - Repetetive Mode"
 SAMPLER_CONTINUOUS_WITH_NOTIFY_MI = "Sampler with Notification - Continuous Mode"
+SAMPLER_STREAM_CONTINUOUS_MI = "Sampler Streaming - Continuous Mode"
+SAMPLER_CAPTURE_CONTINUOUS_MI = "Sampler Capture to File - Continuous Mode"
+SAMPLER_MULTI_DEVICE_NORMAL_MI = "Sampler on all connected devices - Normal Mode"
+SAMPLER_STATISTICS_CONTINUOUS_MI = "Sampler Statistics and Downsampling - Continuous Mode"
+SAMPLER_RATE_PLANNER_NORMAL_MI = "Sampler Rate Planner - Normal Mode"
+SAMPLER_SOFTWARE_ENGINE_NORMAL_MI = "Host-side Software Sampler - Normal Mode"
+SAMPLER_TRIGGER_CONTINUOUS_MI = "Sampler with Composite Triggers - Continuous Mode"
+SAMPLER_PRE_TRIGGER_CONTINUOUS_MI = "Sampler with Pre-Trigger Capture - Continuous Mode"
 
 MOTOR_EXAMPLE_MENU = "Motor Example Menu"
 MOTOR_AUTO_SETUP_MI = "Initial commissioning - motor auto setup"
+MOTOR_FLEET_AUTO_SETUP_MI = "Initial commissioning - motor auto setup on all connected devices"
 MOTOR_VELOCITY_MI = "Run a motor in profile velocity mode"
 MOTOR_POSITIONING_MI = "Run a motor in positioning mode"
+MOTOR_SET_POINT_QUEUE_MI = "Run a motor through a set-point queue in positioning mode"
+MOTOR_GROUP_POSITIONING_MI = "Run the motors of all connected devices as a group in positioning mode"
+MOTOR_CYCLIC_POSITION_MI = "Run a motor in cyclic synchronous position mode"
 
 PROFINET_EXAMPLE_MI = "ProfinetDCP example"
 MAIN_MENU = "Nanolib Example Main"
@@ -396,6 +418,129 @@ def handle_error_message(ctx: 'Context', error_string: str, error_reason_string:
         print(error_message)
     return error_message
 
+class WaitResult:
+    """Result of wait_until, similar to the Nanolib result classes."""
+    def __init__(self, value: Optional[int], latency: float, number_of_reads: int, error: str = ""):
+        self.value = value # last value read (None if no read succeeded)
+        self.latency = latency # time until the condition was met (or the wait ended) in seconds
+        self.number_of_reads = number_of_reads
+        self.error = error
+
+    def hasError(self) -> bool:
+        return self.error != ""
+
+    def getError(self) -> str:
+        return self.error
+
+    def getResult(self) -> Optional[int]:
+        return self.value
+
+def wait_until(ctx: 'Context', device_handle: Nanolib.DeviceHandle, od_index: Nanolib.OdIndex, mask: int, value: int,
+               timeout: float = 10.0, min_interval: float = 0.001, max_interval: float = 0.05,
+               yield_between_reads: bool = True) -> WaitResult:
+    """Wait until (object value & mask) == value, polling with adaptive intervals.
+
+    The object is read immediately, then with an interval starting at min_interval and
+    growing by 50% per read up to max_interval, so short waits are detected fast and long
+    waits do not flood the bus. A read error or the timeout ends the wait with an error.
+
+    :param ctx: menu context
+    :param device_handle: The device handle
+    :param od_index: The object to read (e.g. OdIndex.odStatusWord)
+    :param mask: The bits to compare
+    :param value: The expected value of the masked bits
+    :param timeout: Timeout in seconds (optional)
+    :param min_interval: First poll interval in seconds (optional)
+    :param max_interval: Maximum poll interval in seconds (optional)
+    :param yield_between_reads: give other threads (and their bus traffic) a chance between reads, even with a zero interval (optional)
+    :return: the wait result, its latency is the time until the condition was met
+    """
+    start_time = time.perf_counter()
+    deadline = start_time + timeout
+    interval = min_interval
+    number_of_reads = 0
+    last_value = None
+
+    while True:
+        read_result: Nanolib.ResultInt = ctx.nanolib_accessor.readNumber(device_handle, od_index)
+        number_of_reads += 1
+        now = time.perf_counter()
+
+        if read_result.hasError():
+            return WaitResult(last_value, now - start_time, number_of_reads, read_result.getError())
+
+        last_value = read_result.getResult()
+        if (last_value & mask) == value:
+            return WaitResult(last_value, now - start_time, number_of_reads)
+
+        if now >= deadline:
+            return WaitResult(last_value, now - start_time, number_of_reads,
+                              f"timeout after {timeout:g} s waiting for {od_index.toString()} & {mask:#x} == {value:#x} (last value {last_value:#x})")
+
+        sleep_time = min(interval, deadline - now)
+        if sleep_time > 0 or yield_between_reads:
+            time.sleep(max(sleep_time, 0))
+        interval = min(interval * 1.5, max_interval)
+
+# Remaining time before a deadline below which sleep_until spins instead of sleeping (s)
+SPIN_THRESHOLD_SECONDS = 0.002
+
+def sleep_until(deadline: float, stop_event: threading.Event = None) -> bool:
+    """Wait until a time.perf_counter deadline: sleep coarse, spin the rest.
+
+    The operating system sleep overshoots by up to a few ms, so the last SPIN_THRESHOLD_SECONDS
+    before the deadline are busy waited.
+
+    :param deadline: The deadline (time.perf_counter)
+    :param stop_event: Event ending the sleep early (optional)
+    :return: False if the stop event was set during the sleep
+    """
+    remaining = deadline - time.perf_counter()
+    if remaining > SPIN_THRESHOLD_SECONDS:
+        if stop_event is None:
+            time.sleep(remaining - SPIN_THRESHOLD_SECONDS)
+        elif stop_event.wait(remaining - SPIN_THRESHOLD_SECONDS):
+            return False
+
+    while time.perf_counter() < deadline:
+        pass
+    return True
+
+def get_device_key(ctx: 'Context', device_handle: Nanolib.DeviceHandle) -> str:
+    """Get a key identifying a device across connections (product code and serial number).
+
+    :param ctx: menu context
+    :param device_handle: The device handle
+    :return: the key
+    """
+    product_code_result: Nanolib.ResultInt = ctx.nanolib_accessor.getDeviceProductCode(device_handle)
+    if product_code_result.hasError():
+        raise Exception("get_device_key: " + product_code_result.getError())
+
+    serial_number_result: Nanolib.ResultString = ctx.nanolib_accessor.getDeviceSerialNumber(device_handle)
+    if serial_number_result.hasError():
+        raise Exception("get_device_key: " + serial_number_result.getError())
+
+    return f"{product_code_result.getResult()}_{serial_number_result.getResult().strip()}"
+
+def get_bus_key(ctx: 'Context', device_handle: Nanolib.DeviceHandle) -> str:
+    """Get a key identifying the bus hardware a device is connected to.
+
+    The key holds all fields of the bus hardware id (see Menu.busHardwareIdEquals), so two
+    adapters or USB drives of the same type get different keys.
+
+    :param ctx: menu context
+    :param device_handle: The device handle
+    :return: the bus key (protocol, bus hardware, name and hardware specifiers)
+    """
+    device_id_result: Nanolib.ResultDeviceId = ctx.nanolib_accessor.getDeviceId(device_handle)
+    if device_id_result.hasError():
+        raise Exception("get_bus_key: " + device_id_result.getError())
+
+    bus_hardware_id: Nanolib.BusHardwareId = device_id_result.getResult().getBusHardwareId()
+    return (f"{bus_hardware_id.getProtocol()} ({bus_hardware_id.getBusHardware()}/{bus_hardware_id.getName()}/"
+            f"{bus_hardware_id.getHardwareSpecifier()}/{bus_hardware_id.getExtraHardwareSpecifier()})")
+
 # Define a type for the function pointer (void function taking a Context)
 f_type = Callable[['Context'], None]
 
@@ -0,0 +1,182 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   motor_cyclic_example.py
+#
+# @brief  Definition of the cyclic synchronous position/velocity set-point streamer
+#
+
+import threading
+import time
+import numpy as np
+from menu_utils import Context, OdIndex, sleep_until
+from nanotec_nanolib import Nanolib
+
+# Modes of operation
+MODE_CYCLIC_SYNCHRONOUS_POSITION = 8
+MODE_CYCLIC_SYNCHRONOUS_VELOCITY = 9
+
+class CyclicSetPointStreamer:
+    """Writes a precomputed array of set-points at a fixed cycle in CSP or CSV mode.
+
+    The set-points are converted to a list of ints before the run, the timing thread only
+    waits for the next absolute deadline (sleep, then spin) and writes the next value.
+    Per cycle the start and end of the write are stored in preallocated arrays, all
+    statistics are computed after the run. If the thread is late by one cycle or more,
+    the set-points of the missed cycles are skipped so the trajectory stays on time.
+    """
+    def __init__(self, ctx: 'Context', set_points: np.ndarray, cycle_milliseconds: int,
+                 mode: int = MODE_CYCLIC_SYNCHRONOUS_POSITION, device_handle: Nanolib.DeviceHandle = None):
+        if mode not in (MODE_CYCLIC_SYNCHRONOUS_POSITION, MODE_CYCLIC_SYNCHRONOUS_VELOCITY):
+            raise Exception("CyclicSetPointStreamer: mode must be 8 (CSP) or 9 (CSV)")
+        if not 1 <= cycle_milliseconds <= 255:
+            # 0x60C2:01 (interpolation time period value) is an 8-bit unsigned value in ms (see prepare)
+            raise Exception("CyclicSetPointStreamer: cycle must be between 1 ms and 255 ms")
+
+        self.ctx = ctx
+        self.device_handle = device_handle if device_handle is not None else ctx.active_device
+        self.set_points = np.asarray(set_points, dtype=np.int64)
+        self.cycle_milliseconds = cycle_milliseconds
+        self.mode = mode
+        self.target_od_index = OdIndex.odTargetPosition if mode == MODE_CYCLIC_SYNCHRONOUS_POSITION else OdIndex.odTargetVelocity
+
+        number_of_cycles = len(self.set_points)
+        self.deadlines = np.zeros(number_of_cycles) # s, relative to the start
+        self.write_starts = np.full(number_of_cycles, np.nan) # s, relative to the start, NaN: not written
+        self.write_ends = np.full(number_of_cycles, np.nan)
+        self.missed = np.zeros(number_of_cycles, dtype=bool) # set-point skipped because its cycle was missed
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.last_error = ""
+
+    def prepare(self):
+        """Set the interpolation time period and the mode of operation."""
+        for value, od_index, bit_length in [
+            (self.cycle_milliseconds, OdIndex.odInterpolationTimePeriodValue, 8),
+            (-3, OdIndex.odInterpolationTimeIndex, 8), # unit 10^-3 s
+            (self.mode, OdIndex.odModeOfOperation, 8),
+        ]:
+            write_result: Nanolib.ResultVoid = self.ctx.nanolib_accessor.writeNumber(self.device_handle, value, od_index, bit_length)
+            if write_result.hasError():
+                raise Exception("CyclicSetPointStreamer: " + write_result.getError())
+
+    def start(self):
+        """Start the timing thread."""
+        self.stop_event.clear()
+        self.last_error = ""
+        self.write_starts.fill(np.nan)
+        self.write_ends.fill(np.nan)
+        self.missed.fill(False)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop streaming before the end of the set-points."""
+        self.stop_event.set()
+
+    def get_duration(self) -> float:
+        """Get the planned streaming duration in seconds."""
+        return len(self.set_points) * self.cycle_milliseconds / 1000.0
+
+    def wait_until_finished(self, timeout: float = None) -> bool:
+        """Wait for the timing thread to end.
+
+        :param timeout: Timeout in seconds (optional)
+        :return: True if finished
+        """
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+    def run(self):
+        """Timing thread."""
+        write_number = self.ctx.nanolib_accessor.writeNumber
+        device_handle = self.device_handle
+        od_index = self.target_od_index
+        set_points = self.set_points.tolist() # plain ints, no numpy conversion per cycle
+        number_of_cycles = len(set_points)
+        cycle = self.cycle_milliseconds / 1000.0
+        deadlines = self.deadlines
+        write_starts = self.write_starts
+        write_ends = self.write_ends
+        missed = self.missed
+        perf_counter = time.perf_counter
+
+        start_time = perf_counter()
+        index = 0
+        try:
+            while index < number_of_cycles and not self.stop_event.is_set():
+                deadline = start_time + index * cycle
+                if not sleep_until(deadline, self.stop_event):
+                    break
+
+                write_start = perf_counter()
+                write_result = write_number(device_handle, set_points[index], od_index, 32)
+                write_end = perf_counter()
+                if write_result.hasError():
+                    raise Exception("CyclicSetPointStreamer: " + write_result.getError())
+
+                deadlines[index] = deadline - start_time
+                write_starts[index] = write_start - start_time
+                write_ends[index] = write_end - start_time
+
+                # skip the set-points of cycles already missed
+                next_index = int((write_end - start_time) / cycle)
+                if next_index > index + 1:
+                    missed[index + 1:next_index] = True
+                index = max(index + 1, next_index)
+        except Exception as exception:
+            self.last_error = str(exception)
+
+    def get_statistics(self) -> dict:
+        """Get cycle statistics of the run (vectorized).
+
+        :return: dictionary of statistic name and value
+        """
+        written = ~np.isnan(self.write_starts)
+        jitter = (self.write_starts[written] - self.deadlines[written]) * 1000.0
+        write_durations = (self.write_ends[written] - self.write_starts[written]) * 1000.0
+
+        statistics = {
+            "cycles": len(self.set_points),
+            "written": int(np.count_nonzero(written)),
+            "missed_cycles": int(np.count_nonzero(self.missed)),
+            "overruns": int(np.count_nonzero(write_durations > self.cycle_milliseconds)),
+        }
+        if len(jitter) > 0:
+            statistics.update({
+                "jitter_mean_ms": float(jitter.mean()),
+                "jitter_p99_ms": float(np.percentile(jitter, 99)),
+                "jitter_max_ms": float(jitter.max()),
+                "write_mean_ms": float(write_durations.mean()),
+                "write_max_ms": float(write_durations.max()),
+            })
+        return statistics
+
+    def print_statistics(self):
+        """Output the cycle statistics to console."""
+        mode_name = "CSP" if self.mode == MODE_CYCLIC_SYNCHRONOUS_POSITION else "CSV"
+        print(f"Cyclic streaming statistics ({mode_name}, cycle {self.cycle_milliseconds} ms):")
+        for name, value in self.get_statistics().items():
+            print(f"- {name:<16}{value:g}")
+        if self.last_error:
+            print(f"Cyclic streaming failed with error: {self.last_error}")
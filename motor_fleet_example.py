@@ -0,0 +1,206 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   motor_fleet_example.py
+#
+# @brief  Definition of the parallel motor auto-setup runner for a fleet of drives
+#
+
+import collections
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from menu_utils import Context, OdIndex, get_bus_key
+from nanotec_nanolib import Nanolib
+
+# Auto-setup is finished if bits 12, 9, 5, 4, 2, 1, 0 of the statusword are set
+STATUSWORD_AUTO_SETUP_FINISHED = 0x1237
+
+# Controlword sequence to start auto-setup: "ready to switch on", mode of operation auto-setup,
+# "switched on", "operation enabled", start (bit 4)
+AUTO_SETUP_START_SEQUENCE = [
+    (0x00, OdIndex.odNanoJControl, 32),
+    (0x06, OdIndex.odControlWord, 16),
+    (0xFE, OdIndex.odModeOfOperation, 8),
+    (0x07, OdIndex.odControlWord, 16),
+    (0x0F, OdIndex.odControlWord, 16),
+    (0x1F, OdIndex.odControlWord, 16),
+]
+
+def start_auto_setup(ctx: 'Context', device_handle: Nanolib.DeviceHandle):
+    """Start the auto-setup of a drive (see AUTO_SETUP_START_SEQUENCE).
+
+    :param ctx: menu context
+    :param device_handle: The device handle
+    """
+    for value, od_index, bit_length in AUTO_SETUP_START_SEQUENCE:
+        write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(device_handle, value, od_index, bit_length)
+        if write_result.hasError():
+            raise Exception(write_result.getError())
+
+class FleetAutoSetup:
+    """Runs motor auto-setup on many drives concurrently.
+
+    One thread per bus starts auto-setup on up to max_per_bus drives of its bus at once and
+    starts the next waiting drive as soon as one is finished. The running drives of a bus are
+    polled round robin with at most reads_per_second statusword reads on that bus. After all
+    drives are done, the successful ones are rebooted in parallel.
+    """
+    WAITING = "waiting"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    REBOOTED = "rebooted"
+
+    def __init__(self, ctx: 'Context', device_handles: list = None, max_per_bus: int = 4,
+                 reads_per_second: float = 20.0, timeout: float = 300.0):
+        if device_handles is None:
+            device_handles = list(ctx.connected_device_handles)
+
+        if len(device_handles) == 0:
+            raise Exception("FleetAutoSetup: no devices")
+        if max_per_bus < 1 or reads_per_second <= 0:
+            raise Exception("FleetAutoSetup: max_per_bus and reads_per_second must be positive")
+
+        self.ctx = ctx
+        self.device_handles = device_handles
+        self.bus_keys = [get_bus_key(ctx, device_handle) for device_handle in device_handles]
+        self.max_per_bus = max_per_bus
+        self.read_interval = 1.0 / reads_per_second
+        self.timeout = timeout
+
+        self.lock = threading.Lock()
+        self.states = [FleetAutoSetup.WAITING] * len(device_handles)
+        self.durations = [None] * len(device_handles) # auto-setup time in s
+        self.errors = [""] * len(device_handles)
+
+    def set_state(self, index: int, state: str, error: str = ""):
+        with self.lock:
+            self.states[index] = state
+            self.errors[index] = error
+
+    def get_progress(self) -> dict:
+        """Get the number of drives per state."""
+        with self.lock:
+            return dict(collections.Counter(self.states))
+
+    def start_auto_setup(self, index: int):
+        start_auto_setup(self.ctx, self.device_handles[index])
+
+    def run_bus(self, indices: list):
+        """Bus thread: start auto-setup with the concurrency limit and poll the running drives."""
+        waiting = collections.deque(indices)
+        running = {} # index -> start time
+        next_read_time = time.perf_counter()
+
+        while waiting or running:
+            while waiting and len(running) < self.max_per_bus:
+                index = waiting.popleft()
+                try:
+                    self.start_auto_setup(index)
+                    running[index] = time.perf_counter()
+                    self.set_state(index, FleetAutoSetup.RUNNING)
+                except Exception as exception:
+                    self.set_state(index, FleetAutoSetup.FAILED, str(exception))
+
+            for index in list(running):
+                # rate limit of the status polling on this bus
+                delay = next_read_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                now = time.perf_counter()
+                next_read_time = now + self.read_interval
+
+                read_result: Nanolib.ResultInt = self.ctx.nanolib_accessor.readNumber(self.device_handles[index], OdIndex.odStatusWord)
+                if read_result.hasError():
+                    del running[index]
+                    self.set_state(index, FleetAutoSetup.FAILED, read_result.getError())
+                elif (read_result.getResult() & STATUSWORD_AUTO_SETUP_FINISHED) == STATUSWORD_AUTO_SETUP_FINISHED:
+                    self.durations[index] = now - running.pop(index)
+                    self.set_state(index, FleetAutoSetup.FINISHED)
+                elif now - running[index] > self.timeout:
+                    del running[index]
+                    # try to stop the motor
+                    self.ctx.nanolib_accessor.writeNumber(self.device_handles[index], 0x06, OdIndex.odControlWord, 16)
+                    self.set_state(index, FleetAutoSetup.FAILED, f"timeout after {self.timeout:g} s")
+
+    def reboot(self):
+        """Reboot all drives with finished auto-setup (parallel)."""
+        indices = [index for index, state in enumerate(self.states) if state == FleetAutoSetup.FINISHED]
+        if not indices:
+            return
+
+        def reboot_device(index):
+            reboot_result: Nanolib.ResultVoid = self.ctx.nanolib_accessor.rebootDevice(self.device_handles[index])
+            if reboot_result.hasError():
+                self.set_state(index, FleetAutoSetup.FAILED, "reboot: " + reboot_result.getError())
+            else:
+                self.set_state(index, FleetAutoSetup.REBOOTED)
+
+        with ThreadPoolExecutor(max_workers=len(indices)) as executor:
+            list(executor.map(reboot_device, indices))
+
+    def run(self, progress_interval: float = 1.0, reboot: bool = True):
+        """Run auto-setup on all drives, output the aggregated progress to console.
+
+        :param progress_interval: Time between progress outputs in s (optional)
+        :param reboot: reboot the drives afterwards (optional)
+        """
+        indices_per_bus = {}
+        for index, bus_key in enumerate(self.bus_keys):
+            indices_per_bus.setdefault(bus_key, []).append(index)
+
+        threads = [threading.Thread(target=self.run_bus, args=(indices,), daemon=True) for indices in indices_per_bus.values()]
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        last_progress = None
+        alive_threads = threads
+        while alive_threads:
+            alive_threads[0].join(progress_interval)
+            alive_threads = [thread for thread in threads if thread.is_alive()]
+            progress = self.get_progress()
+            if progress != last_progress:
+                self.print_progress(progress, time.perf_counter() - start_time)
+                last_progress = progress
+
+        if reboot:
+            print("Rebooting ...")
+            self.reboot()
+
+    def print_progress(self, progress: dict, elapsed: float):
+        states = [FleetAutoSetup.WAITING, FleetAutoSetup.RUNNING, FleetAutoSetup.FINISHED, FleetAutoSetup.FAILED]
+        counts = ", ".join(f"{progress.get(state, 0)} {state}" for state in states)
+        print(f"Auto setup of {len(self.device_handles)} drives after {elapsed:.0f} s: {counts}")
+
+    def print_report(self):
+        """Output the result per drive to console."""
+        print("Auto setup results:")
+        for index, device_handle in enumerate(self.device_handles):
+            line = f"- {device_handle.toString()} on {self.bus_keys[index]}: {self.states[index]}"
+            if self.durations[index] is not None:
+                line += f" ({self.durations[index]:.1f} s)"
+            if self.errors[index]:
+                line += f", error: {self.errors[index]}"
+            print(line)
@@ -31,79 +31,108 @@
 #
 
 import time
+import numpy as np
 from nanotec_nanolib import *
 from menu_utils import *
+from motor_setpoint_example import SetPointQueue
+from motor_state_machine_example import DriveStateMachine, DriveState
+from motor_group_example import AxisGroup
+from motor_cyclic_example import CyclicSetPointStreamer
+from motor_profile_example import read_motion_profile_planner, print_prediction
+from motor_fleet_example import FleetAutoSetup, STATUSWORD_AUTO_SETUP_FINISHED, start_auto_setup
+from motor_tuning_store_example import TuningStore
+
+def confirm_auto_setup_requirements(ctx: 'Context', number_of_motors: int = 1) -> bool:
+    """Show the safety requirements of the auto-setup and ask the user to continue.
 
-def motor_auto_setup(ctx: 'Context'):
-    """Determine motor parameters and store them on the device.
-    
     :param ctx: menu context
+    :param number_of_motors: The number of motors the auto-setup runs on (optional)
+    :return: True if the user confirmed
     """
-    ctx.wait_for_user_confirmation = True
-
-    if ctx.active_device == None:
-        handle_error_message(ctx, "", "No active device set. Select an active device first.")
-        return
-
     print("\n" + ctx.light_yellow)
     print("Please note the following requirements for performing the auto-setup:")
+    if number_of_motors > 1:
+        print(f"- They apply to all {number_of_motors} motors, the auto-setup runs on them at the same time.")
     print("- The motor must be unloaded.")
     print("- The motor must not be touched.")
     print("- The motor must be able to rotate freely in any direction.")
     print("- No NanoJ program may be running." + ctx.def_color)
 
     result = input("Do you want to continue? [y/n]: ")
-    if result.lower() != "y":
-        return
+    return result.lower() == "y"
 
-    # Stop a possibly running NanoJ program
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x00, OdIndex.odNanoJControl, 32)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during motor_auto_setup: ", write_result.getError())
-        return
+def motor_auto_setup(ctx: 'Context'):
+    """Determine motor parameters and store them on the device.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
 
-    # Switch the state machine to "voltage enabled"
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x06, OdIndex.odControlWord, 16)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during motor_auto_setup: ", write_result.getError())
+    if ctx.active_device == None:
+        handle_error_message(ctx, "", "No active device set. Select an active device first.")
         return
 
-    # Set mode of operation to auto-setup
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0xFE, OdIndex.odModeOfOperation, 8)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during motor_auto_setup: ", write_result.getError())
+    # Offer to skip the auto setup if the tuning of this device (product code and serial number) is stored already
+    tuning_store = TuningStore()
+    try:
+        tuning_key = get_device_key(ctx, ctx.active_device)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during motor_auto_setup: ", str(exception))
         return
 
-    # Switch on
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x07, OdIndex.odControlWord, 16)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during motor_auto_setup: ", write_result.getError())
+    apply_stored_tuning = False
+    if tuning_store.contains(tuning_key):
+        tuning_store.print_entry(tuning_key)
+        print(ctx.light_yellow + "The stored tuning belongs to the motor connected at the time of capture." + ctx.def_color)
+        print(ctx.light_yellow + "If the motor of this drive was replaced since, run the auto setup." + ctx.def_color)
+        result = input("Apply the stored tuning [a], run the auto setup anyway [r] or cancel [c]: ").lower()
+        if result not in ("a", "r"):
+            return
+        apply_stored_tuning = (result == "a")
+
+    if apply_stored_tuning:
+        print("Writing the stored tuning back ...")
+        try:
+            tuning_store.apply(ctx, ctx.active_device, tuning_key)
+        except Exception as exception:
+            handle_error_message(ctx, "Error during motor_auto_setup: ", str(exception))
+            return
+
+        print("Rebooting ...")
+        reboot_result: Nanolib.ResultVoid = ctx.nanolib_accessor.rebootDevice(ctx.active_device)
+        if reboot_result.hasError():
+            handle_error_message(ctx, "Error during motor_auto_setup: ", reboot_result.getError())
+            return
+        print("Stored tuning applied, motor auto setup skipped.")
         return
 
-    # Switch the state machine to "enable operation"
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x0F, OdIndex.odControlWord, 16)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during motor_auto_setup: ", write_result.getError())
+    if not confirm_auto_setup_requirements(ctx):
         return
 
-    # Run auto setup
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x1F, OdIndex.odControlWord, 16)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during motor_auto_setup: ", write_result.getError())
+    # Stop a possibly running NanoJ program, switch to mode auto-setup, enable operation and run the auto-setup
+    try:
+        start_auto_setup(ctx, ctx.active_device)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during motor_auto_setup: ", str(exception))
         return
 
     print("Motor auto setup is running, please wait ...")
 
     # Wait until auto setup is finished, check status word
-    while True:
-        read_number_result: Nanolib.ResultInt = ctx.nanolib_accessor.readNumber(ctx.active_device, OdIndex.odStatusWord)
-        if read_number_result.hasError():
-            handle_error_message(ctx, "Error during motor_auto_setup: ", read_number_result.getError())
-            return
+    # Finish if bits 12, 9, 5, 4, 2, 1, 0 are set
+    wait_result = wait_until(ctx, ctx.active_device, OdIndex.odStatusWord, STATUSWORD_AUTO_SETUP_FINISHED, STATUSWORD_AUTO_SETUP_FINISHED,
+                             timeout=300.0, max_interval=0.1)
+    if wait_result.hasError():
+        handle_error_message(ctx, "Error during motor_auto_setup: ", wait_result.getError())
+        return
+    print(f"Motor auto setup took {wait_result.latency:.1f} s.")
 
-        # Finish if bits 12, 9, 5, 4, 2, 1, 0 are set
-        if (read_number_result.getResult() & 0x1237) == 0x1237:
-            break
+    # Keep the tuning, a later commissioning of this device writes it back instead of running the auto setup
+    try:
+        tuning_store.capture(ctx, ctx.active_device)
+        print(f"Tuning of '{tuning_key}' stored in '{tuning_store.path}'.")
+    except Exception as exception:
+        handle_error_message(ctx, "Error during motor_auto_setup: ", str(exception))
 
     # Reboot current active device
     print("Rebooting ...")
@@ -144,22 +173,24 @@ def execute_profile_velocity_mode(ctx: 'Context'):
         handle_error_message(ctx, "Error during execute_profile_velocity_mode: ", write_result.getError())
         return
 
-    # Switch the state machine to "operation enabled"
-    for command in [0x06, 0x07, 0x0F]:
-        write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, command, OdIndex.odControlWord, 16)
-        if write_result.hasError():
-            handle_error_message(ctx, "Error during execute_profile_velocity_mode: ", write_result.getError())
-            return
+    # Switch the state machine to "operation enabled", only the needed transitions are written
+    drive_state_machine = DriveStateMachine(ctx)
+    try:
+        drive_state_machine.goto(DriveState.OPERATION_ENABLED)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_profile_velocity_mode: ", str(exception))
+        return
 
     print("Motor is running clockwise ...")
 
     # Let the motor run for 3 seconds
     time.sleep(3)
 
-    # Stop the motor
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x06, OdIndex.odControlWord, 16)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during execute_profile_velocity_mode: ", write_result.getError())
+    # Stop the motor ("ready to switch on")
+    try:
+        drive_state_machine.goto(DriveState.READY_TO_SWITCH_ON, refresh=False)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_profile_velocity_mode: ", str(exception))
         return
 
     # Set the desired speed in rpm (60), now counterclockwise
@@ -169,9 +200,10 @@ def execute_profile_velocity_mode(ctx: 'Context'):
         return
 
     # Start the motor
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x0F, OdIndex.odControlWord, 16)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during execute_profile_velocity_mode: ", write_result.getError())
+    try:
+        drive_state_machine.goto(DriveState.OPERATION_ENABLED, refresh=False)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_profile_velocity_mode: ", str(exception))
         return
 
     print("Motor is running counterclockwise ...")
@@ -179,12 +211,15 @@ def execute_profile_velocity_mode(ctx: 'Context'):
     # Let the motor run for 3 seconds
     time.sleep(3)
 
-    # Stop the motor
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x06, OdIndex.odControlWord, 16)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during execute_profile_velocity_mode: ", write_result.getError())
+    # Stop the motor ("ready to switch on")
+    try:
+        drive_state_machine.goto(DriveState.READY_TO_SWITCH_ON, refresh=False)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_profile_velocity_mode: ", str(exception))
         return
 
+    drive_state_machine.print_transitions()
+
 def execute_positioning_mode(ctx: 'Context'):
     """Demonstrate how to move a motor in positioning mode.
     
@@ -222,12 +257,20 @@ def execute_positioning_mode(ctx: 'Context'):
         handle_error_message(ctx, "Error during execute_positioning_mode: ", write_result.getError())
         return
 
-    # Switch the state machine to "operation enabled"
-    for command in [0x06, 0x07, 0x0F]:
-        write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, command, OdIndex.odControlWord, 16)
-        if write_result.hasError():
-            handle_error_message(ctx, "Error during execute_positioning_mode: ", write_result.getError())
-            return
+    # Predict the time of both moves from the profile of the drive (optional, the moves run without)
+    try:
+        predicted_durations = read_motion_profile_planner(ctx).predict_durations([0x8CA0, -0x8CA0])
+    except Exception as exception:
+        predicted_durations = None
+        print(f"{ctx.light_yellow}No move time prediction: {exception}{ctx.def_color}")
+
+    # Switch the state machine to "operation enabled", only the needed transitions are written
+    drive_state_machine = DriveStateMachine(ctx)
+    try:
+        drive_state_machine.goto(DriveState.OPERATION_ENABLED)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_positioning_mode: ", str(exception))
+        return
 
     # Move the motor to the desired target position relatively
     write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x5F, OdIndex.odControlWord, 16)
@@ -237,21 +280,18 @@ def execute_positioning_mode(ctx: 'Context'):
 
     print("Motor is running clockwise until position is reached ...")
     
-    while True:
-        read_result: Nanolib.ResultInt = ctx.nanolib_accessor.readNumber(ctx.active_device, OdIndex.odStatusWord)
-        if read_result.hasError():
-            handle_error_message(ctx, "Error during execute_positioning_mode: ", read_result.getError())
-            # Try to stop the motor
-            ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x06, OdIndex.odControlWord, 16)
-            break
-
-        if (read_result.getResult() & 0x1400) == 0x1400:
-            break
-
-    # Stop the motor
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x06, OdIndex.odControlWord, 16)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during execute_positioning_mode: ", write_result.getError())
+    # Wait until bits 12 (set-point acknowledge) and 10 (target reached) are set
+    wait_result = wait_until(ctx, ctx.active_device, OdIndex.odStatusWord, 0x1400, 0x1400, timeout=30.0)
+    if wait_result.hasError():
+        handle_error_message(ctx, "Error during execute_positioning_mode: ", wait_result.getError())
+    elif predicted_durations is not None:
+        print_prediction(predicted_durations[0], wait_result.latency)
+
+    # Stop the motor ("ready to switch on")
+    try:
+        drive_state_machine.goto(DriveState.READY_TO_SWITCH_ON, refresh=False)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_positioning_mode: ", str(exception))
         return
 
     # Set the desired target position (-36000)
@@ -261,9 +301,10 @@ def execute_positioning_mode(ctx: 'Context'):
         return
 
     # State machine operation enabled
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x0F, OdIndex.odControlWord, 16)
-    if write_result.hasError():
-        handle_error_message(ctx, "Error during execute_positioning_mode: ", write_result.getError())
+    try:
+        drive_state_machine.goto(DriveState.OPERATION_ENABLED, refresh=False)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_positioning_mode: ", str(exception))
         return
 
     # Move the motor to the desired target position relatively
@@ -274,19 +315,213 @@ def execute_positioning_mode(ctx: 'Context'):
 
     print("Motor is running counterclockwise until position is reached ...")
     
-    while True:
-        read_result = ctx.nanolib_accessor.readNumber(ctx.active_device, OdIndex.odStatusWord)
-        if read_result.hasError():
-            handle_error_message(ctx, "Error during execute_positioning_mode: ", read_result.getError())
-            # Try to stop the motor
-            ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x06, OdIndex.odControlWord, 16)
-            break
+    # Wait until bits 12 (set-point acknowledge) and 10 (target reached) are set
+    wait_result = wait_until(ctx, ctx.active_device, OdIndex.odStatusWord, 0x1400, 0x1400, timeout=30.0)
+    if wait_result.hasError():
+        handle_error_message(ctx, "Error during execute_positioning_mode: ", wait_result.getError())
+    elif predicted_durations is not None:
+        print_prediction(predicted_durations[1], wait_result.latency)
+
+    # Stop the motor ("ready to switch on")
+    try:
+        drive_state_machine.goto(DriveState.READY_TO_SWITCH_ON, refresh=False)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_positioning_mode: ", str(exception))
+        return
 
-        if (read_result.getResult() & 0x1400) == 0x1400:
-            break
+    drive_state_machine.print_transitions()
 
-    # Stop the motor
-    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x06, OdIndex.odControlWord, 16)
+def execute_positioning_set_point_queue(ctx: 'Context'):
+    """Demonstrate how to stream several targets in positioning mode with buffered set-points.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if ctx.active_device == None:
+        handle_error_message(ctx, "", "No active device set. Select an active device first.")
+        return
+
+    print("This example streams 8 relative moves in Profile Position mode ...")
+    print("The next set-point is handed over while the motor is still moving (set-point handshake).")
+
+    # Stop a possibly running NanoJ program
+    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x00, OdIndex.odNanoJControl, 32)
     if write_result.hasError():
-        handle_error_message(ctx, "Error during execute_positioning_mode: ", write_result.getError())
-        return
\ No newline at end of file
+        handle_error_message(ctx, "Error during execute_positioning_set_point_queue: ", write_result.getError())
+        return
+
+    # Choose Profile Position mode
+    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x01, OdIndex.odModeOfOperation, 8)
+    if write_result.hasError():
+        handle_error_message(ctx, "Error during execute_positioning_set_point_queue: ", write_result.getError())
+        return
+
+    # Set the desired speed in rpm (60)
+    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x3C, OdIndex.odProfileVelocity, 32)
+    if write_result.hasError():
+        handle_error_message(ctx, "Error during execute_positioning_set_point_queue: ", write_result.getError())
+        return
+
+    # Switch the state machine to "operation enabled", only the needed transitions are written
+    drive_state_machine = DriveStateMachine(ctx)
+    try:
+        drive_state_machine.goto(DriveState.OPERATION_ENABLED)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_positioning_set_point_queue: ", str(exception))
+        return
+
+    # 4 moves clockwise, 4 moves counterclockwise (relative, 9000 each)
+    targets = [9000] * 4 + [-9000] * 4
+    set_point_queue = SetPointQueue(ctx, relative=True)
+
+    try:
+        set_point_queue.run(targets)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_positioning_set_point_queue: ", str(exception))
+
+    set_point_queue.print_report()
+
+    # Stop the motor ("ready to switch on"), the queue may have stopped it already on error
+    try:
+        drive_state_machine.goto(DriveState.READY_TO_SWITCH_ON)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_positioning_set_point_queue: ", str(exception))
+        return
+
+    drive_state_machine.print_transitions()
+
+def execute_group_positioning_mode(ctx: 'Context'):
+    """Demonstrate how to start the motors of all connected devices together in positioning mode.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if not ctx.connected_device_handles:
+        handle_error_message(ctx, "", "No connected devices. Connect a device first.")
+        return
+
+    print(f"This example moves the motors of {len(ctx.connected_device_handles)} device(s) together in Profile Position mode ...")
+    print("Targets are loaded first, then the start writes are issued back to back per bus.")
+
+    # Stop possibly running NanoJ programs
+    for device_handle in ctx.connected_device_handles:
+        write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(device_handle, 0x00, OdIndex.odNanoJControl, 32)
+        if write_result.hasError():
+            handle_error_message(ctx, "Error during execute_group_positioning_mode: ", write_result.getError())
+            return
+
+    try:
+        axis_group = AxisGroup(ctx)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_group_positioning_mode: ", str(exception))
+        return
+
+    try:
+        # move clockwise, then counterclockwise (relative, 36000 each) with 60 rpm
+        for target in [0x8CA0, -0x8CA0]:
+            axis_group.prepare_move([target] * len(axis_group.device_handles), 0x3C)
+            group_move_report = axis_group.start()
+            group_move_report.print_report()
+            axis_group.wait_until_reached()
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_group_positioning_mode: ", str(exception))
+
+    # Stop the motors
+    try:
+        axis_group.stop()
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_group_positioning_mode: ", str(exception))
+
+def execute_cyclic_synchronous_position_mode(ctx: 'Context'):
+    """Demonstrate how to stream a precomputed trajectory in cyclic synchronous position mode.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if ctx.active_device == None:
+        handle_error_message(ctx, "", "No active device set. Select an active device first.")
+        return
+
+    print("This example streams a position trajectory (forth and back, 2 s) in Cyclic Synchronous Position mode ...")
+    print("A set-point is written every 10 ms by a dedicated timing thread.")
+
+    # Stop a possibly running NanoJ program
+    write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(ctx.active_device, 0x00, OdIndex.odNanoJControl, 32)
+    if write_result.hasError():
+        handle_error_message(ctx, "Error during execute_cyclic_synchronous_position_mode: ", write_result.getError())
+        return
+
+    # The trajectory starts at the current position, the target is set to it before enabling
+    read_result: Nanolib.ResultInt = ctx.nanolib_accessor.readNumber(ctx.active_device, OdIndex.odPositionActualValue)
+    if read_result.hasError():
+        handle_error_message(ctx, "Error during execute_cyclic_synchronous_position_mode: ", read_result.getError())
+        return
+
+    start_position = read_result.getResult()
+    write_result = ctx.nanolib_accessor.writeNumber(ctx.active_device, start_position, OdIndex.odTargetPosition, 32)
+    if write_result.hasError():
+        handle_error_message(ctx, "Error during execute_cyclic_synchronous_position_mode: ", write_result.getError())
+        return
+
+    # 200 set-points, cosine shaped move of 36000 forth and back
+    cycle_milliseconds = 10
+    phase = np.linspace(0.0, 2.0 * np.pi, 200)
+    set_points = start_position + np.round(0x4650 * (1.0 - np.cos(phase))).astype(np.int64)
+    streamer = CyclicSetPointStreamer(ctx, set_points, cycle_milliseconds)
+
+    # Choose Cyclic Synchronous Position mode and switch the state machine to "operation enabled"
+    drive_state_machine = DriveStateMachine(ctx)
+    try:
+        streamer.prepare()
+        drive_state_machine.goto(DriveState.OPERATION_ENABLED)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_cyclic_synchronous_position_mode: ", str(exception))
+        return
+
+    streamer.start()
+    if not streamer.wait_until_finished(streamer.get_duration() + 5.0):
+        streamer.stop()
+        streamer.wait_until_finished(1.0)
+        print("Cyclic streaming did not finish in time and was stopped.")
+    streamer.print_statistics()
+
+    # Stop the motor
+    try:
+        drive_state_machine.goto(DriveState.READY_TO_SWITCH_ON)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_cyclic_synchronous_position_mode: ", str(exception))
+        return
+
+    drive_state_machine.print_transitions()
+
+def execute_fleet_auto_setup(ctx: 'Context'):
+    """Determine the motor parameters of all connected devices concurrently and store them on the devices.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if not ctx.connected_device_handles:
+        handle_error_message(ctx, "", "No connected devices. Connect a device first.")
+        return
+
+    if not confirm_auto_setup_requirements(ctx, len(ctx.connected_device_handles)):
+        return
+
+    try:
+        fleet_auto_setup = FleetAutoSetup(ctx)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_fleet_auto_setup: ", str(exception))
+        return
+
+    print("Motor auto setup is running on all connected devices, please wait ...")
+    fleet_auto_setup.run()
+    fleet_auto_setup.print_report()
+
+    if fleet_auto_setup.get_progress().get(FleetAutoSetup.FAILED, 0) > 0:
+        handle_error_message(ctx, "Error during execute_fleet_auto_setup: ", "auto setup failed on at least one device")
+        return
+    print("Motor auto setup finished.")
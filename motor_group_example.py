@@ -0,0 +1,212 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   motor_group_example.py
+#
+# @brief  Definition of the multi-axis group motion start with skew measurement
+#
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from menu_utils import Context, OdIndex, wait_until, get_bus_key
+from motor_state_machine_example import DriveStateMachine, DriveState
+from motor_setpoint_example import CONTROLWORD_OPERATION_ENABLED, CONTROLWORD_NEW_SET_POINT, CONTROLWORD_RELATIVE, \
+    STATUSWORD_SET_POINT_ACKNOWLEDGE, STATUSWORD_TARGET_REACHED
+from nanotec_nanolib import Nanolib
+
+class GroupMoveReport:
+    """Start skew of one group move, per axis relative to the first axis."""
+    def __init__(self, device_handles: list, bus_keys: list, write_times: list, acknowledge_times: list):
+        self.device_handles = device_handles
+        self.bus_keys = bus_keys
+        self.write_times = write_times # perf_counter after the start write
+        self.acknowledge_times = acknowledge_times # perf_counter the set-point acknowledge edge was seen
+
+    def get_write_skew(self) -> float:
+        """Spread of the start writes in ms."""
+        return (max(self.write_times) - min(self.write_times)) * 1000.0
+
+    def get_acknowledge_skew(self) -> float:
+        """Spread of the observed set-point acknowledge edges in ms."""
+        return (max(self.acknowledge_times) - min(self.acknowledge_times)) * 1000.0
+
+    def print_report(self):
+        """Output the start skew per axis to console."""
+        first_write_time = min(self.write_times)
+        print("Group start skew per axis (start write / set-point acknowledge edge, relative to the first start write):")
+        for index, device_handle in enumerate(self.device_handles):
+            line = f"- {device_handle.toString()} on {self.bus_keys[index]}: {(self.write_times[index] - first_write_time) * 1000.0:.3f} ms"
+            line += f" / {(self.acknowledge_times[index] - first_write_time) * 1000.0:.3f} ms"
+            print(line)
+
+        print(f"Write skew: {self.get_write_skew():.3f} ms, acknowledge skew: {self.get_acknowledge_skew():.3f} ms")
+
+class AxisGroup:
+    """Several drives moving together in profile position mode.
+
+    prepare_move loads mode, velocity and targets and enables all axes in parallel, so
+    start only has to write one controlword per axis. The start writes are issued by one
+    thread per bus, released together, each writing the axes of its bus back to back.
+    The same threads then poll the statuswords for the set-point acknowledge edge, so
+    the skew of the starts is measured from the drives, not only from the host writes.
+    The polling rounds are paced like wait_until (min_interval growing to max_interval).
+    """
+    def __init__(self, ctx: 'Context', device_handles: list = None, timeout: float = 30.0, acknowledge_timeout: float = 1.0,
+                 min_interval: float = 0.001, max_interval: float = 0.05):
+        if device_handles is None:
+            device_handles = list(ctx.connected_device_handles)
+
+        if len(device_handles) == 0:
+            raise Exception("AxisGroup: no devices")
+
+        self.ctx = ctx
+        self.device_handles = device_handles
+        self.bus_keys = [get_bus_key(ctx, device_handle) for device_handle in device_handles]
+        self.drive_state_machines = [DriveStateMachine(ctx, device_handle) for device_handle in device_handles]
+        self.timeout = timeout
+        self.acknowledge_timeout = acknowledge_timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.relative = False
+        self.reports = [] # GroupMoveReport per group move
+
+    def _for_all_axes(self, function):
+        """Call function(axis_index) for all axes in parallel and raise the first error."""
+        with ThreadPoolExecutor(max_workers=len(self.device_handles)) as executor:
+            for future in [executor.submit(function, index) for index in range(len(self.device_handles))]:
+                future.result()
+
+    def write_number(self, index: int, value: int, od_index: Nanolib.OdIndex, bit_length: int):
+        write_result: Nanolib.ResultVoid = self.ctx.nanolib_accessor.writeNumber(self.device_handles[index], value, od_index, bit_length)
+        if write_result.hasError():
+            raise Exception(f"AxisGroup ({self.device_handles[index].toString()}): {write_result.getError()}")
+
+    def prepare_move(self, targets: list, profile_velocity: int, relative: bool = True):
+        """Load mode, profile velocity and target of every axis and enable operation (parallel).
+
+        :param targets: Target position per axis
+        :param profile_velocity: The profile velocity for all axes
+        :param relative: relative targets (optional)
+        """
+        if len(targets) != len(self.device_handles):
+            raise Exception("AxisGroup: number of targets and axes differ")
+
+        self.relative = relative
+
+        def prepare_axis(index):
+            self.write_number(index, 0x01, OdIndex.odModeOfOperation, 8)
+            self.write_number(index, profile_velocity, OdIndex.odProfileVelocity, 32)
+            self.write_number(index, targets[index], OdIndex.odTargetPosition, 32)
+            self.drive_state_machines[index].goto(DriveState.OPERATION_ENABLED)
+            # bit 4 must be 0 before the start edge
+            self.write_number(index, self.get_controlword(), OdIndex.odControlWord, 16)
+
+        self._for_all_axes(prepare_axis)
+
+    def get_controlword(self) -> int:
+        controlword = CONTROLWORD_OPERATION_ENABLED
+        if self.relative:
+            controlword |= CONTROLWORD_RELATIVE
+        return controlword
+
+    def start(self) -> GroupMoveReport:
+        """Start the prepared move of all axes with minimal skew.
+
+        Raises if an axis does not acknowledge the set-point within acknowledge_timeout.
+
+        :return: the start skew report of this move
+        """
+        number_of_axes = len(self.device_handles)
+        axis_indices_per_bus = {}
+        for index, bus_key in enumerate(self.bus_keys):
+            axis_indices_per_bus.setdefault(bus_key, []).append(index)
+
+        write_times = [0.0] * number_of_axes
+        acknowledge_times = [None] * number_of_axes
+        errors = []
+        start_controlword = self.get_controlword() | CONTROLWORD_NEW_SET_POINT
+        barrier = threading.Barrier(len(axis_indices_per_bus))
+
+        def start_bus(axis_indices):
+            try:
+                barrier.wait()
+                for index in axis_indices:
+                    self.write_number(index, start_controlword, OdIndex.odControlWord, 16)
+                    write_times[index] = time.perf_counter()
+
+                # round robin over the axes of this bus until every set-point acknowledge edge was seen,
+                # one round per poll interval (growing like in wait_until)
+                pending = list(axis_indices)
+                deadline = time.perf_counter() + self.acknowledge_timeout
+                interval = self.min_interval
+                try:
+                    while pending:
+                        for index in list(pending):
+                            read_result: Nanolib.ResultInt = self.ctx.nanolib_accessor.readNumber(self.device_handles[index], OdIndex.odStatusWord)
+                            if read_result.hasError():
+                                raise Exception(f"AxisGroup ({self.device_handles[index].toString()}): {read_result.getError()}")
+                            if read_result.getResult() & STATUSWORD_SET_POINT_ACKNOWLEDGE:
+                                acknowledge_times[index] = time.perf_counter()
+                                pending.remove(index)
+
+                        now = time.perf_counter()
+                        if pending and now >= deadline:
+                            raise Exception(f"AxisGroup ({self.device_handles[pending[0]].toString()}): "
+                                            f"set-point not acknowledged within {self.acknowledge_timeout:g} s")
+                        if pending:
+                            time.sleep(min(interval, deadline - now))
+                            interval = min(interval * 1.5, self.max_interval)
+                finally:
+                    # end of the handshake, reset the new set-point bit
+                    for index in axis_indices:
+                        self.write_number(index, self.get_controlword(), OdIndex.odControlWord, 16)
+            except Exception as exception:
+                errors.append(str(exception))
+
+        threads = [threading.Thread(target=start_bus, args=(axis_indices,)) for axis_indices in axis_indices_per_bus.values()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise Exception(errors[0])
+
+        report = GroupMoveReport(self.device_handles, self.bus_keys, write_times, acknowledge_times)
+        self.reports.append(report)
+        return report
+
+    def wait_until_reached(self):
+        """Wait until all axes reached their target (parallel)."""
+        def wait_axis(index):
+            wait_result = wait_until(self.ctx, self.device_handles[index], OdIndex.odStatusWord,
+                                     STATUSWORD_TARGET_REACHED, STATUSWORD_TARGET_REACHED, timeout=self.timeout)
+            if wait_result.hasError():
+                raise Exception(f"AxisGroup ({self.device_handles[index].toString()}): {wait_result.getError()}")
+
+        self._for_all_axes(wait_axis)
+
+    def stop(self):
+        """Stop all axes ("ready to switch on", parallel)."""
+        self._for_all_axes(lambda index: self.drive_state_machines[index].goto(DriveState.READY_TO_SWITCH_ON))
@@ -0,0 +1,175 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   motor_profile_example.py
+#
+# @brief  Definition of the vectorized trapezoidal and S-curve motion profile planner
+#
+
+import numpy as np
+from menu_utils import Context, OdIndex
+from nanotec_nanolib import Nanolib
+
+# Planned profile per move
+PROFILE_DTYPE = np.dtype([
+    ('distance', np.float64), # position units (absolute value)
+    ('peak_velocity', np.float64), # position units/s
+    ('acceleration_time', np.float64), # s
+    ('constant_time', np.float64), # s
+    ('deceleration_time', np.float64), # s
+    ('duration', np.float64), # s
+])
+
+# Bisection steps for the reduced peak velocity of short S-curve moves
+S_CURVE_BISECTION_STEPS = 48
+
+def get_ramp_time(velocity: np.ndarray, acceleration: np.ndarray, jerk: np.ndarray = None) -> np.ndarray:
+    """Get the time to ramp from standstill to the velocity (vectorized).
+
+    :param velocity: The velocity to reach
+    :param acceleration: The maximum acceleration
+    :param jerk: The maximum jerk, None for a trapezoidal (jerk free) ramp (optional)
+    :return: ramp time in s
+    """
+    if jerk is None:
+        return velocity / acceleration
+
+    # the acceleration limit is only reached if the velocity is high enough
+    return np.where(velocity >= acceleration * acceleration / jerk,
+                    velocity / acceleration + acceleration / jerk,
+                    2.0 * np.sqrt(velocity / jerk))
+
+class MotionProfilePlanner:
+    """Predicts the duration of profile position moves for whole arrays of moves at once.
+
+    All values are in position units and seconds. Without jerk the profiles are trapezoidal
+    (triangular if the profile velocity is not reached), with jerk they are S-curves with
+    symmetric jerk phases. Ramps are symmetric, so a ramp covers velocity * ramp time / 2.
+    """
+    def __init__(self, velocity: float, acceleration: float, deceleration: float, jerk: float = None):
+        if velocity <= 0 or acceleration <= 0 or deceleration <= 0 or (jerk is not None and jerk <= 0):
+            raise Exception("MotionProfilePlanner: velocity, acceleration, deceleration and jerk must be positive")
+
+        self.velocity = float(velocity)
+        self.acceleration = float(acceleration)
+        self.deceleration = float(deceleration)
+        self.jerk = float(jerk) if jerk is not None else None
+
+    def get_ramp_distance(self, velocity: np.ndarray) -> np.ndarray:
+        """Distance needed to accelerate to and decelerate from the velocity."""
+        acceleration_time = get_ramp_time(velocity, self.acceleration, self.jerk)
+        deceleration_time = get_ramp_time(velocity, self.deceleration, self.jerk)
+        return velocity * (acceleration_time + deceleration_time) / 2.0
+
+    def get_peak_velocity(self, distances: np.ndarray) -> np.ndarray:
+        """Peak velocity per move, below the profile velocity for short moves."""
+        full_velocity = np.full(distances.shape, self.velocity)
+        short = self.get_ramp_distance(full_velocity) > distances
+        if not np.any(short):
+            return full_velocity
+
+        if self.jerk is None:
+            # triangular profile
+            full_velocity[short] = np.sqrt(2.0 * distances[short] * self.acceleration * self.deceleration
+                                           / (self.acceleration + self.deceleration))
+            return full_velocity
+
+        # the ramp distance grows monotonically with the velocity, bisect all short moves at once
+        low = np.zeros(np.count_nonzero(short))
+        high = np.full(low.shape, self.velocity)
+        for _ in range(S_CURVE_BISECTION_STEPS):
+            middle = (low + high) / 2.0
+            too_far = self.get_ramp_distance(middle) > distances[short]
+            high = np.where(too_far, middle, high)
+            low = np.where(too_far, low, middle)
+        full_velocity[short] = low
+        return full_velocity
+
+    def plan(self, distances) -> np.ndarray:
+        """Plan the profile of every move.
+
+        :param distances: The move distances (relative, sign is ignored)
+        :return: structured array (PROFILE_DTYPE), one entry per move
+        """
+        distances = np.abs(np.atleast_1d(np.asarray(distances, dtype=np.float64)))
+        peak_velocity = self.get_peak_velocity(distances)
+
+        profiles = np.zeros(distances.shape, dtype=PROFILE_DTYPE)
+        profiles['distance'] = distances
+        profiles['peak_velocity'] = peak_velocity
+        profiles['acceleration_time'] = get_ramp_time(peak_velocity, self.acceleration, self.jerk)
+        profiles['deceleration_time'] = get_ramp_time(peak_velocity, self.deceleration, self.jerk)
+        remaining = np.maximum(distances - self.get_ramp_distance(peak_velocity), 0.0)
+        profiles['constant_time'] = np.divide(remaining, peak_velocity, out=np.zeros_like(remaining), where=peak_velocity > 0)
+        profiles['duration'] = profiles['acceleration_time'] + profiles['constant_time'] + profiles['deceleration_time']
+        return profiles
+
+    def predict_durations(self, distances) -> np.ndarray:
+        """Predict the duration of every move in s."""
+        return self.plan(distances)['duration']
+
+    def predict_total_duration(self, distances, settle_time: float = 0.0) -> float:
+        """Predict the duration of a batch of moves executed one after the other.
+
+        :param distances: The move distances
+        :param settle_time: Time between two moves in s, e.g. the set-point handshake (optional)
+        :return: total duration in s
+        """
+        durations = self.predict_durations(distances)
+        return float(durations.sum() + settle_time * len(durations))
+
+def read_motion_profile_planner(ctx: 'Context', device_handle: Nanolib.DeviceHandle = None,
+                                position_units_per_revolution: int = 3600, s_curve: bool = False) -> MotionProfilePlanner:
+    """Create a planner from the profile velocity, acceleration, deceleration (and jerk) of the drive.
+
+    The drive's default units are expected: position in tenths of a degree (3600 per
+    revolution), velocity in rpm, acceleration and deceleration in rpm/s and jerk in rpm/s².
+
+    :param ctx: menu context
+    :param device_handle: The device handle, the active device if not given (optional)
+    :param position_units_per_revolution: Position units per motor revolution (optional)
+    :param s_curve: read the profile jerk and plan S-curves (optional)
+    :return: the planner
+    """
+    if device_handle is None:
+        device_handle = ctx.active_device
+
+    od_indices = [OdIndex.odProfileVelocity, OdIndex.odProfileAcceleration, OdIndex.odProfileDeceleration]
+    if s_curve:
+        od_indices.append(OdIndex.odProfileJerk)
+
+    values = []
+    for od_index in od_indices:
+        read_result: Nanolib.ResultInt = ctx.nanolib_accessor.readNumber(device_handle, od_index)
+        if read_result.hasError():
+            raise Exception("read_motion_profile_planner: " + read_result.getError())
+        # revolutions per minute (and per s, s²) to position units per s (s², s³)
+        values.append(read_result.getResult() * position_units_per_revolution / 60.0)
+
+    return MotionProfilePlanner(*values)
+
+def print_prediction(predicted_duration: float, measured_duration: float):
+    """Output the predicted and the measured duration of a move to console."""
+    deviation = measured_duration - predicted_duration
+    print(f"Predicted move time {predicted_duration:.3f} s, measured {measured_duration:.3f} s "
+          f"(deviation {deviation * 1000.0:+.1f} ms)")
@@ -0,0 +1,132 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   motor_setpoint_example.py
+#
+# @brief  Definition of the pipelined set-point queue for profile position mode
+#
+
+import time
+from menu_utils import Context, OdIndex, wait_until
+from nanotec_nanolib import Nanolib
+
+# Controlword bits in profile position mode
+CONTROLWORD_OPERATION_ENABLED = 0x000F
+CONTROLWORD_NEW_SET_POINT = 0x0010 # bit 4
+CONTROLWORD_CHANGE_SET_IMMEDIATELY = 0x0020 # bit 5
+CONTROLWORD_RELATIVE = 0x0040 # bit 6
+CONTROLWORD_CHANGE_ON_SET_POINT = 0x0200 # bit 9
+
+# Statusword bits in profile position mode
+STATUSWORD_TARGET_REACHED = 0x0400 # bit 10
+STATUSWORD_SET_POINT_ACKNOWLEDGE = 0x1000 # bit 12
+
+class SetPointQueue:
+    """Streams a list of targets in profile position mode with the set-point handshake.
+
+    Every target is handed over with the new-set-point / set-point-acknowledge handshake
+    (controlword bit 4, statusword bit 12). The next target is sent as soon as the drive
+    can accept a set-point again, not after the previous move stopped:
+    - buffered (change_set_immediately False): the drive buffers the next set-point while
+      moving and starts it when the current move is finished (with blend, the drive passes
+      the set-point without stopping, controlword bit 9)
+    - change set immediately: the drive switches to the new set-point at once
+
+    The drive has to be in "operation enabled" with mode of operation 1 (profile position).
+    """
+    def __init__(self, ctx: 'Context', device_handle: Nanolib.DeviceHandle = None, change_set_immediately: bool = False,
+                 relative: bool = False, blend: bool = False, timeout: float = 30.0):
+        self.ctx = ctx
+        self.device_handle = device_handle if device_handle is not None else ctx.active_device
+        self.timeout = timeout
+
+        self.controlword = CONTROLWORD_OPERATION_ENABLED
+        if change_set_immediately:
+            self.controlword |= CONTROLWORD_CHANGE_SET_IMMEDIATELY
+        if relative:
+            self.controlword |= CONTROLWORD_RELATIVE
+        if blend:
+            self.controlword |= CONTROLWORD_CHANGE_ON_SET_POINT
+
+        self.handshake_latencies = [] # time from new set-point to acknowledge per target (s)
+        self.elapsed = 0.0 # time from the first set-point until the last target was reached (s)
+        self.number_of_moves = 0
+
+    def write_controlword(self, controlword: int):
+        write_result: Nanolib.ResultVoid = self.ctx.nanolib_accessor.writeNumber(self.device_handle, controlword, OdIndex.odControlWord, 16)
+        if write_result.hasError():
+            raise Exception("SetPointQueue: " + write_result.getError())
+
+    def wait_for_statusword(self, mask: int, value: int) -> float:
+        wait_result = wait_until(self.ctx, self.device_handle, OdIndex.odStatusWord, mask, value, timeout=self.timeout)
+        if wait_result.hasError():
+            # try to stop the motor
+            self.ctx.nanolib_accessor.writeNumber(self.device_handle, 0x06, OdIndex.odControlWord, 16)
+            raise Exception("SetPointQueue: " + wait_result.getError())
+        return wait_result.latency
+
+    def run(self, targets: list, wait_until_reached: bool = True):
+        """Stream all targets to the drive.
+
+        :param targets: The target positions
+        :param wait_until_reached: wait until the last target is reached (optional)
+        """
+        self.handshake_latencies = []
+        self.number_of_moves = 0
+        start_time = time.perf_counter()
+
+        # bit 4 must be 0 before the first rising edge
+        self.write_controlword(self.controlword)
+
+        for target in targets:
+            # the drive accepts a new set-point when set-point acknowledge is 0
+            self.wait_for_statusword(STATUSWORD_SET_POINT_ACKNOWLEDGE, 0)
+
+            write_result: Nanolib.ResultVoid = self.ctx.nanolib_accessor.writeNumber(self.device_handle, target, OdIndex.odTargetPosition, 32)
+            if write_result.hasError():
+                raise Exception("SetPointQueue: " + write_result.getError())
+
+            # new set-point (rising edge of bit 4), wait for acknowledge, then reset bit 4
+            self.write_controlword(self.controlword | CONTROLWORD_NEW_SET_POINT)
+            self.handshake_latencies.append(self.wait_for_statusword(STATUSWORD_SET_POINT_ACKNOWLEDGE, STATUSWORD_SET_POINT_ACKNOWLEDGE))
+            self.write_controlword(self.controlword)
+            self.number_of_moves += 1
+
+        if wait_until_reached and self.number_of_moves > 0:
+            self.wait_for_statusword(STATUSWORD_SET_POINT_ACKNOWLEDGE | STATUSWORD_TARGET_REACHED, STATUSWORD_TARGET_REACHED)
+
+        self.elapsed = time.perf_counter() - start_time
+
+    @property
+    def moves_per_second(self) -> float:
+        """Achieved moves per second of the last run."""
+        if self.elapsed == 0:
+            return 0.0
+        return self.number_of_moves / self.elapsed
+
+    def print_report(self):
+        """Output moves per second and handshake latencies to console."""
+        print(f"{self.number_of_moves} moves in {self.elapsed:.3f} s ({self.moves_per_second:.2f} moves/s)")
+        if self.handshake_latencies:
+            mean_latency = sum(self.handshake_latencies) / len(self.handshake_latencies)
+            print(f"Set-point handshake latency: mean {mean_latency * 1000.0:.2f} ms, max {max(self.handshake_latencies) * 1000.0:.2f} ms")
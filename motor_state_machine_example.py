@@ -0,0 +1,249 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   motor_state_machine_example.py
+#
+# @brief  Definition of the CiA 402 drive state machine driver
+#
+
+import collections
+import time
+from menu_utils import Context, OdIndex, wait_until
+from nanotec_nanolib import Nanolib
+
+class DriveState:
+    """CiA 402 drive states."""
+    NOT_READY_TO_SWITCH_ON = 0
+    SWITCH_ON_DISABLED = 1
+    READY_TO_SWITCH_ON = 2
+    SWITCHED_ON = 3
+    OPERATION_ENABLED = 4
+    QUICK_STOP_ACTIVE = 5
+    FAULT_REACTION_ACTIVE = 6
+    FAULT = 7
+
+    NAMES = {
+        NOT_READY_TO_SWITCH_ON: "Not ready to switch on",
+        SWITCH_ON_DISABLED: "Switch on disabled",
+        READY_TO_SWITCH_ON: "Ready to switch on",
+        SWITCHED_ON: "Switched on",
+        OPERATION_ENABLED: "Operation enabled",
+        QUICK_STOP_ACTIVE: "Quick stop active",
+        FAULT_REACTION_ACTIVE: "Fault reaction active",
+        FAULT: "Fault",
+    }
+
+# Statusword mask and value per state
+STATUSWORD_PATTERNS = {
+    DriveState.NOT_READY_TO_SWITCH_ON: (0x4F, 0x00),
+    DriveState.SWITCH_ON_DISABLED: (0x4F, 0x40),
+    DriveState.READY_TO_SWITCH_ON: (0x6F, 0x21),
+    DriveState.SWITCHED_ON: (0x6F, 0x23),
+    DriveState.OPERATION_ENABLED: (0x6F, 0x27),
+    DriveState.QUICK_STOP_ACTIVE: (0x6F, 0x07),
+    DriveState.FAULT_REACTION_ACTIVE: (0x4F, 0x0F),
+    DriveState.FAULT: (0x4F, 0x08),
+}
+
+# Controlword commands
+CONTROLWORD_SHUTDOWN = 0x06
+CONTROLWORD_SWITCH_ON = 0x07
+CONTROLWORD_DISABLE_VOLTAGE = 0x00
+CONTROLWORD_QUICK_STOP = 0x02
+CONTROLWORD_DISABLE_OPERATION = 0x07
+CONTROLWORD_ENABLE_OPERATION = 0x0F
+CONTROLWORD_FAULT_RESET = 0x80
+
+# Transitions triggered by a controlword command: state -> list of (command, next state)
+# Ready to switch on -> operation enabled with 0x0F is the direct transition 3 + 4.
+TRANSITIONS = {
+    DriveState.SWITCH_ON_DISABLED: [
+        (CONTROLWORD_SHUTDOWN, DriveState.READY_TO_SWITCH_ON),
+    ],
+    DriveState.READY_TO_SWITCH_ON: [
+        (CONTROLWORD_SWITCH_ON, DriveState.SWITCHED_ON),
+        (CONTROLWORD_ENABLE_OPERATION, DriveState.OPERATION_ENABLED),
+        (CONTROLWORD_DISABLE_VOLTAGE, DriveState.SWITCH_ON_DISABLED),
+    ],
+    DriveState.SWITCHED_ON: [
+        (CONTROLWORD_ENABLE_OPERATION, DriveState.OPERATION_ENABLED),
+        (CONTROLWORD_SHUTDOWN, DriveState.READY_TO_SWITCH_ON),
+        (CONTROLWORD_DISABLE_VOLTAGE, DriveState.SWITCH_ON_DISABLED),
+    ],
+    DriveState.OPERATION_ENABLED: [
+        (CONTROLWORD_DISABLE_OPERATION, DriveState.SWITCHED_ON),
+        (CONTROLWORD_SHUTDOWN, DriveState.READY_TO_SWITCH_ON),
+        (CONTROLWORD_QUICK_STOP, DriveState.QUICK_STOP_ACTIVE),
+        (CONTROLWORD_DISABLE_VOLTAGE, DriveState.SWITCH_ON_DISABLED),
+    ],
+    DriveState.QUICK_STOP_ACTIVE: [
+        (CONTROLWORD_ENABLE_OPERATION, DriveState.OPERATION_ENABLED),
+        (CONTROLWORD_DISABLE_VOLTAGE, DriveState.SWITCH_ON_DISABLED),
+    ],
+    DriveState.FAULT: [
+        (CONTROLWORD_FAULT_RESET, DriveState.SWITCH_ON_DISABLED),
+    ],
+}
+
+# States the drive leaves on its own: state -> next state
+AUTOMATIC_TRANSITIONS = {
+    DriveState.NOT_READY_TO_SWITCH_ON: DriveState.SWITCH_ON_DISABLED,
+    DriveState.FAULT_REACTION_ACTIVE: DriveState.FAULT,
+}
+
+def decode_statusword(statusword: int) -> int:
+    """Decode the CiA 402 state from the statusword.
+
+    :param statusword: The statusword
+    :return: the drive state (DriveState) or None if the statusword matches no state
+    """
+    for state, (mask, value) in STATUSWORD_PATTERNS.items():
+        if (statusword & mask) == value:
+            return state
+    return None
+
+def get_transition_path(from_state: int, to_state: int) -> list:
+    """Get the shortest list of commands from one state to another (breadth-first search).
+
+    :param from_state: The current state
+    :param to_state: The target state
+    :return: list of (command, next state), None for automatic transitions
+    """
+    previous = {from_state: None}
+    queue = collections.deque([from_state])
+    while queue:
+        state = queue.popleft()
+        if state == to_state:
+            break
+
+        steps = list(TRANSITIONS.get(state, []))
+        if state in AUTOMATIC_TRANSITIONS:
+            steps.append((None, AUTOMATIC_TRANSITIONS[state]))
+        for command, next_state in steps:
+            if next_state not in previous:
+                previous[next_state] = (state, command)
+                queue.append(next_state)
+
+    if to_state not in previous:
+        raise Exception(f"get_transition_path: no transition from '{DriveState.NAMES[from_state]}' to '{DriveState.NAMES[to_state]}'")
+
+    path = []
+    state = to_state
+    while previous[state] is not None:
+        previous_state, command = previous[state]
+        path.append((command, state))
+        state = previous_state
+    path.reverse()
+    return path
+
+class DriveStateMachine:
+    """Stateful CiA 402 state machine driver of one device.
+
+    Keeps the last known drive state and reaches a target state with the minimum number of
+    controlword writes (including fault reset). After every write the statusword is polled
+    until the expected state is reached, the latency of every transition is recorded.
+    The fault reset is triggered by a 0->1 edge of controlword bit 7, so the controlword
+    is cleared before CONTROLWORD_FAULT_RESET is written.
+    """
+    def __init__(self, ctx: 'Context', device_handle: Nanolib.DeviceHandle = None, timeout: float = 5.0):
+        self.ctx = ctx
+        self.device_handle = device_handle if device_handle is not None else ctx.active_device
+        self.timeout = timeout
+        self.state = None # last known state
+        self.statusword = None # last read statusword
+        self.transitions = [] # list of (from state, to state, controlword, latency in s)
+        self.number_of_writes = 0
+
+    def refresh(self) -> int:
+        """Read the statusword and update the last known state.
+
+        :return: the drive state
+        """
+        read_result: Nanolib.ResultInt = self.ctx.nanolib_accessor.readNumber(self.device_handle, OdIndex.odStatusWord)
+        if read_result.hasError():
+            raise Exception("DriveStateMachine: " + read_result.getError())
+
+        self.statusword = read_result.getResult()
+        self.state = decode_statusword(self.statusword)
+        return self.state
+
+    def write_controlword(self, controlword: int):
+        """Write the controlword.
+
+        :param controlword: The controlword value
+        """
+        write_result: Nanolib.ResultVoid = self.ctx.nanolib_accessor.writeNumber(self.device_handle, controlword, OdIndex.odControlWord, 16)
+        if write_result.hasError():
+            raise Exception("DriveStateMachine: " + write_result.getError())
+
+    def goto(self, target_state: int, refresh: bool = True) -> int:
+        """Bring the drive into the target state.
+
+        :param target_state: The target state (DriveState)
+        :param refresh: read the current state first, otherwise the last known state is used (optional)
+        :return: number of controlword writes
+        """
+        if refresh or self.state is None:
+            self.refresh()
+
+        if self.state is None:
+            raise Exception(f"DriveStateMachine: unknown state (statusword {self.statusword:#06x})")
+
+        number_of_writes = 0
+        for command, next_state in get_transition_path(self.state, target_state):
+            start_time = time.perf_counter()
+
+            if command == CONTROLWORD_FAULT_RESET:
+                # bit 7 may still be set from an earlier reset, clear it for the rising edge
+                self.write_controlword(0x00)
+                number_of_writes += 1
+
+            if command is not None:
+                self.write_controlword(command)
+                number_of_writes += 1
+
+            mask, value = STATUSWORD_PATTERNS[next_state]
+            wait_result = wait_until(self.ctx, self.device_handle, OdIndex.odStatusWord, mask, value, timeout=self.timeout)
+            if wait_result.hasError():
+                if wait_result.getResult() is not None:
+                    self.statusword = wait_result.getResult()
+                    self.state = decode_statusword(self.statusword)
+                raise Exception(f"DriveStateMachine: '{DriveState.NAMES[next_state]}' not reached: {wait_result.getError()}")
+
+            self.transitions.append((self.state, next_state, command, time.perf_counter() - start_time))
+            self.statusword = wait_result.getResult()
+            self.state = next_state
+
+        self.number_of_writes += number_of_writes
+        return number_of_writes
+
+    def get_state_name(self) -> str:
+        """Get the name of the last known state."""
+        return DriveState.NAMES.get(self.state, "Unknown")
+
+    def print_transitions(self):
+        """Output all transitions with their latency to console."""
+        print(f"State transitions ({self.number_of_writes} controlword writes):")
+        for from_state, to_state, command, latency in self.transitions:
+            command_text = f"{command:#04x}" if command is not None else "auto"
+            print(f"- {DriveState.NAMES[from_state]} -> {DriveState.NAMES[to_state]} ({command_text}): {latency * 1000.0:.2f} ms")
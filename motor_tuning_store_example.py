@@ -0,0 +1,157 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   motor_tuning_store_example.py
+#
+# @brief  Definition of the motor tuning store keyed by device serial number and product code
+#
+
+import json
+import os
+import time
+from menu_utils import Context, OdIndex, wait_until, get_device_key
+from nanotec_nanolib import Nanolib
+
+# Object entries determined by the motor auto-setup: (index, subindex, bit length)
+TUNING_OD_ENTRIES = [
+    (0x2030, 0x00, 32), # pole pair count
+    (0x3202, 0x00, 32), # motor drive submode select
+] + [(0x3210, subindex, 32) for subindex in range(0x01, 0x09)] # motor drive parameter set (controller gains)
+
+# Value to write to 0x1010:01 to store all parameters ("save")
+STORE_ALL_PARAMS_SIGNATURE = 1702257011
+
+DEFAULT_TUNING_STORE_PATH = "tuning_store.json"
+
+class TuningStore:
+    """Persists the tuning parameters of motors after the auto-setup in a JSON file.
+
+    The entries are keyed by product code and serial number of the device, so a drive that
+    was reset (restore defaults) or a drive put back into a machine gets its tuning written
+    back and saved with a single store command instead of running the auto-setup again.
+    The motor has no identity the key could include: if the motor of a drive was replaced,
+    the stored tuning belongs to the old motor and the auto-setup must run again.
+
+    Entries of an array object (e.g. the 0x3210 parameter set) are read with one
+    readNumberArray call per object.
+    """
+    def __init__(self, path: str = DEFAULT_TUNING_STORE_PATH, od_entries: list = None):
+        self.path = path
+        self.od_entries = od_entries if od_entries is not None else TUNING_OD_ENTRIES
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                self.entries = json.load(file)
+
+    def save(self):
+        """Write the store to its file (replaced atomically)."""
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(self.entries, file, indent=2)
+        os.replace(temporary_path, self.path)
+
+    def contains(self, key: str) -> bool:
+        return key in self.entries
+
+    def print_entry(self, key: str):
+        """Output the capture date and the values of a stored tuning to console.
+
+        :param key: The key of the device
+        """
+        entry = self.entries[key]
+        print(f"Stored tuning of '{key}', captured {entry['captured']}:")
+        for index, subindex, bit_length, value in entry["values"]:
+            print(f"- {index:04X}:{subindex:02X} = {value}")
+
+    def read_values(self, ctx: 'Context', device_handle: Nanolib.DeviceHandle) -> list:
+        """Read the tuning entries of a device, one read per object.
+
+        :param ctx: menu context
+        :param device_handle: The device handle
+        :return: list of [index, subindex, bit length, value]
+        """
+        subindices_per_index = {}
+        for index, subindex, bit_length in self.od_entries:
+            subindices_per_index.setdefault(index, []).append(subindex)
+
+        object_values = {} # (index, subindex) -> value
+        for index, subindices in subindices_per_index.items():
+            if len(subindices) == 1:
+                read_result: Nanolib.ResultInt = ctx.nanolib_accessor.readNumber(device_handle, Nanolib.OdIndex(index, subindices[0]))
+                if read_result.hasError():
+                    raise Exception(f"TuningStore ({index:04X}:{subindices[0]:02X}): {read_result.getError()}")
+                object_values[(index, subindices[0])] = read_result.getResult()
+                continue
+
+            # array object, all subindices with one read (element n is subindex n)
+            read_result: Nanolib.ResultArrayInt = ctx.nanolib_accessor.readNumberArray(device_handle, index)
+            if read_result.hasError():
+                raise Exception(f"TuningStore ({index:04X}): {read_result.getError()}")
+            array = read_result.getResult()
+            for subindex in subindices:
+                if subindex >= len(array):
+                    raise Exception(f"TuningStore ({index:04X}:{subindex:02X}): not in array of {len(array)} elements")
+                object_values[(index, subindex)] = array[subindex]
+
+        return [[index, subindex, bit_length, object_values[(index, subindex)]] for index, subindex, bit_length in self.od_entries]
+
+    def capture(self, ctx: 'Context', device_handle: Nanolib.DeviceHandle) -> str:
+        """Read the tuning entries of a device and persist them.
+
+        :param ctx: menu context
+        :param device_handle: The device handle
+        :return: the key of the device
+        """
+        key = get_device_key(ctx, device_handle)
+        values = self.read_values(ctx, device_handle)
+
+        self.entries[key] = {"captured": time.strftime("%Y-%m-%d %H:%M:%S"), "values": values}
+        self.save()
+        return key
+
+    def apply(self, ctx: 'Context', device_handle: Nanolib.DeviceHandle, key: str = None):
+        """Write the stored tuning entries to a device and store them with one save command.
+
+        :param ctx: menu context
+        :param device_handle: The device handle
+        :param key: The key of the device, read from the device if not given (optional)
+        """
+        if key is None:
+            key = get_device_key(ctx, device_handle)
+
+        if key not in self.entries:
+            raise Exception(f"TuningStore: no tuning stored for '{key}'")
+
+        for index, subindex, bit_length, value in self.entries[key]["values"]:
+            write_result: Nanolib.ResultVoid = ctx.nanolib_accessor.writeNumber(device_handle, value, Nanolib.OdIndex(index, subindex), bit_length)
+            if write_result.hasError():
+                raise Exception(f"TuningStore ({index:04X}:{subindex:02X}): {write_result.getError()}")
+
+        # Save all parameters to non-volatile memory and wait until write has completed
+        write_result = ctx.nanolib_accessor.writeNumber(device_handle, STORE_ALL_PARAMS_SIGNATURE, OdIndex.odStoreAllParams, 32)
+        if write_result.hasError():
+            raise Exception("TuningStore: " + write_result.getError())
+
+        wait_result = wait_until(ctx, device_handle, OdIndex.odStoreAllParams, 0xFFFFFFFF, 1, timeout=10.0)
+        if wait_result.hasError():
+            raise Exception("TuningStore: " + wait_result.getError())
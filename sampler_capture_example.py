@@ -0,0 +1,304 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   sampler_capture_example.py
+#
+# @brief  Definition of memory-mapped columnar capture files for sampled data
+#
+# Capture file layout (one file per segment):
+#
+#   [0 .. HEADER_SIZE)  header
+#       0   8s  magic "NLCAP001"
+#       8   I   header size
+#       12  I   descriptor length (JSON, starting at offset 64)
+#       16  Q   capacity (rows)
+#       24  Q   committed rows
+#       32  Q   creation time (ns since epoch)
+#       40  Q   last commit time (ns since epoch)
+#       48  I   CRC32 of the descriptor
+#   [HEADER_SIZE .. )   columns, each column is preallocated for 'capacity' rows
+#
+# The committed row count is written after the column data of a block, so a reader
+# never sees partially written rows, even if the writer crashed.
+#
+
+import glob
+import json
+import mmap
+import os
+import re
+import struct
+import time
+import zlib
+import numpy as np
+
+CAPTURE_MAGIC = b"NLCAP001"
+CAPTURE_HEADER_SIZE = 4096
+CAPTURE_HEADER_FORMAT = "<8sIIQQQQI"
+CAPTURE_DESCRIPTOR_OFFSET = 64
+CAPTURE_COMMITTED_ROWS_OFFSET = 24
+CAPTURE_FILE_EXTENSION = ".ncap"
+
+def get_capture_columns(sampled_data_dtype: np.dtype) -> list:
+    """Get the column names and data types of a capture for a sampled data array type.
+
+    :param sampled_data_dtype: dtype of the sampled data array (see SampleDataConverter)
+    :return: list of (column name, numpy dtype)
+    """
+    columns = [("iteration", np.dtype(np.uint64)), ("sample", np.dtype(np.uint64))]
+    for name in sampled_data_dtype['value'].names:
+        columns.append((f"value.{name}", sampled_data_dtype['value'][name]))
+    for name in sampled_data_dtype['time'].names:
+        columns.append((f"time.{name}", sampled_data_dtype['time'][name]))
+    return columns
+
+class CaptureSegment:
+    """One memory-mapped capture file with preallocated columns."""
+    def __init__(self, path: str, columns: list, capacity: int, metadata: dict = None):
+        self.path = path
+        self.capacity = capacity
+        self.rows = 0
+        self.created_ns = time.time_ns()
+
+        # column offsets, aligned to 64 bytes
+        descriptor_columns = []
+        offset = CAPTURE_HEADER_SIZE
+        for name, dtype in columns:
+            descriptor_columns.append({"name": name, "dtype": dtype.str, "offset": offset})
+            offset += (dtype.itemsize * capacity + 63) & ~63
+        self.file_size = offset
+
+        descriptor = json.dumps({"columns": descriptor_columns, "metadata": metadata or {}}).encode("utf-8")
+        if CAPTURE_DESCRIPTOR_OFFSET + len(descriptor) > CAPTURE_HEADER_SIZE:
+            raise Exception("CaptureSegment: too many columns for capture header")
+
+        # preallocate (sparse) and map the file
+        self.file = open(path, "x+b") # never overwrite an existing segment
+        self.file.truncate(self.file_size)
+        self.mmap = mmap.mmap(self.file.fileno(), self.file_size)
+
+        header = struct.pack(CAPTURE_HEADER_FORMAT, CAPTURE_MAGIC, CAPTURE_HEADER_SIZE, len(descriptor),
+                             capacity, 0, self.created_ns, self.created_ns, zlib.crc32(descriptor))
+        self.mmap[0:len(header)] = header
+        self.mmap[CAPTURE_DESCRIPTOR_OFFSET:CAPTURE_DESCRIPTOR_OFFSET + len(descriptor)] = descriptor
+
+        # numpy views of the columns
+        self.columns = {}
+        for column in descriptor_columns:
+            self.columns[column["name"]] = np.frombuffer(self.mmap, dtype=np.dtype(column["dtype"]), count=capacity, offset=column["offset"])
+
+    @property
+    def free_rows(self) -> int:
+        """Number of rows left in this segment."""
+        return self.capacity - self.rows
+
+    def write(self, sampled_data_array: np.ndarray, first_row: int, count: int):
+        """Write rows of a sampled data array and commit them.
+
+        :param sampled_data_array: The converted sampled data
+        :param first_row: First row of sampled_data_array to write
+        :param count: Number of rows to write
+        """
+        source = sampled_data_array[first_row:first_row + count]
+        target = slice(self.rows, self.rows + count)
+
+        self.columns["iteration"][target] = source['iteration']
+        self.columns["sample"][target] = source['sample']
+        for name in source.dtype['value'].names:
+            self.columns[f"value.{name}"][target] = source['value'][name]
+            self.columns[f"time.{name}"][target] = source['time'][name]
+
+        self.rows += count
+        # commit: row count and commit time are written after the data
+        struct.pack_into("<QQ", self.mmap, CAPTURE_COMMITTED_ROWS_OFFSET, self.rows, time.time_ns())
+
+    def flush(self):
+        """Flush the mapped data to disk."""
+        self.mmap.flush()
+
+    def close(self):
+        """Flush, unmap and close the segment file."""
+        if self.mmap is None:
+            return
+
+        self.columns = {}
+        self.mmap.flush()
+        self.mmap.close()
+        self.file.close()
+        self.mmap = None
+
+class CaptureWriter:
+    """Append-only writer for memory-mapped columnar capture files.
+
+    Sampled data is written per block (see SamplerExample.get_sampled_data_array).
+    A new segment file is started if the current one is full (size-based rotation)
+    or older than rotate_seconds (time-based rotation).
+    """
+    def __init__(self, directory: str, prefix: str = "capture", rows_per_segment: int = 1000000, rotate_seconds: float = 0, flush_seconds: float = 1.0, metadata: dict = None):
+        if rows_per_segment < 1:
+            raise Exception("CaptureWriter: rows_per_segment must be at least 1")
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.rows_per_segment = rows_per_segment
+        self.rotate_seconds = rotate_seconds # 0: no time-based rotation
+        self.flush_seconds = flush_seconds # 0: flush after every block
+        self.metadata = metadata or {}
+        self.columns = None # set by the first block
+        self.segment: CaptureSegment = None
+        self.segment_start = 0.0
+        self.segment_index = get_next_capture_segment_index(directory, prefix)
+        self.last_flush = time.monotonic()
+        self.total_rows = 0
+        self.segment_paths = []
+
+    def _open_segment(self):
+        """Close the current segment and start a new one."""
+        self._close_segment()
+
+        path = os.path.join(self.directory, f"{self.prefix}_{self.segment_index:06d}{CAPTURE_FILE_EXTENSION}")
+        self.segment_index += 1
+        self.segment = CaptureSegment(path, self.columns, self.rows_per_segment, self.metadata)
+        self.segment_start = time.monotonic()
+        self.segment_paths.append(path)
+
+    def _close_segment(self):
+        """Close the current segment (if any)."""
+        if self.segment is not None:
+            self.segment.close()
+            self.segment = None
+
+    def write(self, sampled_data_array: np.ndarray):
+        """Append a block of sampled data.
+
+        :param sampled_data_array: The converted sampled data
+        """
+        if len(sampled_data_array) == 0:
+            return
+
+        columns = get_capture_columns(sampled_data_array.dtype)
+        if self.columns is None:
+            self.columns = columns
+        elif columns != self.columns:
+            raise Exception("CaptureWriter: sampled data does not match the capture columns")
+
+        if (self.segment is not None) and (self.rotate_seconds > 0) and (time.monotonic() - self.segment_start >= self.rotate_seconds):
+            self._open_segment()
+
+        first_row = 0
+        while first_row < len(sampled_data_array):
+            if (self.segment is None) or (self.segment.free_rows == 0):
+                self._open_segment()
+
+            count = min(self.segment.free_rows, len(sampled_data_array) - first_row)
+            self.segment.write(sampled_data_array, first_row, count)
+            first_row += count
+
+        self.total_rows += len(sampled_data_array)
+
+        now = time.monotonic()
+        if now - self.last_flush >= self.flush_seconds:
+            self.segment.flush()
+            self.last_flush = now
+
+    def close(self):
+        """Close the capture, the last segment is flushed."""
+        self._close_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+class CaptureReader:
+    """Zero-copy read access to a capture file, columns are numpy views of the mapped file."""
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, header_size, descriptor_length, capacity, committed_rows, created_ns, last_commit_ns, descriptor_crc = \
+            struct.unpack_from(CAPTURE_HEADER_FORMAT, self.mmap, 0)
+        if magic != CAPTURE_MAGIC or header_size != CAPTURE_HEADER_SIZE:
+            raise Exception(f"CaptureReader: '{path}' is not a capture file")
+
+        descriptor = bytes(self.mmap[CAPTURE_DESCRIPTOR_OFFSET:CAPTURE_DESCRIPTOR_OFFSET + descriptor_length])
+        if zlib.crc32(descriptor) != descriptor_crc:
+            raise Exception(f"CaptureReader: corrupt header in '{path}'")
+        descriptor = json.loads(descriptor.decode("utf-8"))
+
+        self.capacity = capacity
+        # only committed rows are valid
+        self.rows = min(committed_rows, capacity)
+        self.created_ns = created_ns
+        self.last_commit_ns = last_commit_ns
+        self.metadata = descriptor["metadata"]
+        self.columns = {}
+        for column in descriptor["columns"]:
+            self.columns[column["name"]] = np.frombuffer(self.mmap, dtype=np.dtype(column["dtype"]), count=self.rows, offset=column["offset"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def close(self):
+        """Release the column views and unmap the file."""
+        self.columns = {}
+        try:
+            self.mmap.close()
+        except BufferError:
+            # column arrays are still in use by the caller, the mapping is released with them
+            pass
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+def get_capture_files(directory: str, prefix: str = "capture") -> list:
+    """Get all capture segment files of a capture in order.
+
+    :param directory: The capture directory
+    :param prefix: The capture file prefix
+    :return: list of file paths
+    """
+    return sorted(glob.glob(os.path.join(directory, f"{prefix}_*{CAPTURE_FILE_EXTENSION}")))
+
+def get_next_capture_segment_index(directory: str, prefix: str = "capture") -> int:
+    """Get the index of the next capture segment file.
+
+    The index follows the highest index of the existing segment files, so gaps left by
+    deleted segments never lead to an existing file.
+
+    :param directory: The capture directory
+    :param prefix: The capture file prefix
+    :return: the next segment index
+    """
+    pattern = re.compile(rf"^{re.escape(prefix)}_(\d+){re.escape(CAPTURE_FILE_EXTENSION)}$")
+    indices = [int(match.group(1)) for match in map(pattern.match, os.listdir(directory)) if match]
+    return max(indices) + 1 if indices else 0
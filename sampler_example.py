@@ -30,20 +30,273 @@
 # @author Michael Milbradt
 #
 
+import asyncio
+import threading
 import time
-from menu_utils import Context, handle_error_message
+import numpy as np
+from menu_utils import Context, OdIndex, handle_error_message
+from sampler_sink_example import SampledDataSink, ConsoleTableSink
 from nanotec_nanolib import Nanolib
 
-class SamplerNotifyCallback(Nanolib.SamplerNotify):
-    """Implementation class of Nanolib.SamplerNotify, handling the notify callback"""
-    def __init__(self, samplerExample):
+# Mapping of OD data types to numpy data types, used to decode raw sampled values
+OD_DATA_TYPE_TO_NUMPY = {
+    Nanolib.ObjectEntryDataType_Boolean: np.uint8,
+    Nanolib.ObjectEntryDataType_Integer8: np.int8,
+    Nanolib.ObjectEntryDataType_Integer16: np.int16,
+    Nanolib.ObjectEntryDataType_Integer32: np.int32,
+    Nanolib.ObjectEntryDataType_Integer64: np.int64,
+    Nanolib.ObjectEntryDataType_Unsigned8: np.uint8,
+    Nanolib.ObjectEntryDataType_Unsigned16: np.uint16,
+    Nanolib.ObjectEntryDataType_Unsigned32: np.uint32,
+    Nanolib.ObjectEntryDataType_Unsigned64: np.uint64,
+}
+
+# Raw sampled values are decoded from their 64-bit two's complement representation
+RAW_VALUE_MASK = 0xFFFFFFFFFFFFFFFF
+
+# Time allowed on top of the sample duration until a sampler finished and all data was processed (s)
+SAMPLER_FINISH_MARGIN_SECONDS = 5.0
+
+def get_numpy_data_type(ctx: 'Context', device_handle: Nanolib.DeviceHandle, od_index: Nanolib.OdIndex):
+    """Get the numpy data type of an OD entry from the assigned object dictionary.
+
+    Falls back to the raw 64-bit value if no type information is available.
+
+    :param ctx: menu context
+    :param device_handle: The device handle to use
+    :param od_index: The OD index to look up
+    :return: the numpy data type
+    """
+    result_object_dictionary = ctx.nanolib_accessor.getAssignedObjectDictionary(device_handle)
+    if result_object_dictionary.hasError():
+        return np.int64
+
+    result_object = result_object_dictionary.getResult().getObject(od_index)
+    if result_object.hasError():
+        return np.int64
+
+    return OD_DATA_TYPE_TO_NUMPY.get(result_object.getResult().getDataType(), np.int64)
+
+class SampleDataConverter:
+    """Converts Nanolib.SampleDataVector blocks into structured numpy arrays.
+
+    Each row of the resulting array holds one sample: the fields 'iteration' and 'sample',
+    followed by the sub-structures 'value' and 'time' with one field per tracked address.
+    """
+    def __init__(self, address_names: list, data_types: list):
+        if len(address_names) != len(data_types):
+            raise Exception("SampleDataConverter: number of address names and data types differ")
+
+        self.number_of_tracked_addresses = len(address_names)
+        self.data_types = [np.dtype(data_type) for data_type in data_types]
+        self.dtype = np.dtype([
+            ('iteration', np.uint64),
+            ('sample', np.uint64),
+            ('value', [(name, data_type) for name, data_type in zip(address_names, self.data_types)]),
+            ('time', [(name, np.uint64) for name in address_names])
+        ])
+        self.last_iteration = 0 # last iteration counter
+        self.sample_number = 0 # current sample number
+
+    def reset(self):
+        """Reset iteration and sample counters (e.g. on sampler start)."""
+        self.last_iteration = 0
+        self.sample_number = 0
+
+    def convert(self, sample_datas: Nanolib.SampleDataVector) -> np.ndarray:
+        """Convert sampled data into a structured numpy array.
+
+        The SWIG objects do not expose a buffer, so every sampled value is read once in
+        Python into a 64-bit raw array. The raw values are cast to the data type of their
+        tracked address afterwards (column wise).
+
+        :param sample_datas: The sampled data
+        :return: structured array with one row per sample
+        """
+        number_of_tracked_addresses = self.number_of_tracked_addresses
+        iterations = []
+        counts = []
+        total = 0
+
+        for sample_data in sample_datas:
+            number_of_sampled_values = len(sample_data.sampledValues)
+            if number_of_sampled_values % number_of_tracked_addresses != 0:
+                raise Exception(f"SampleDataConverter: {number_of_sampled_values} sampled values do not match {number_of_tracked_addresses} tracked addresses")
+            iterations.append(sample_data.iterationNumber)
+            counts.append(number_of_sampled_values // number_of_tracked_addresses)
+            total += number_of_sampled_values
+
+        # one pass over all sampled values and collect times; raw values are kept as unsigned
+        # 64-bit two's complement, so neither negative values nor Unsigned64 values >= 2**63 overflow
+        sampled_values = [sampled_value for sample_data in sample_datas for sampled_value in sample_data.sampledValues]
+        raw_values = np.fromiter((sampled_value.value & RAW_VALUE_MASK for sampled_value in sampled_values), dtype=np.uint64, count=total)
+        raw_times = np.fromiter((sampled_value.collectTimeMsec for sampled_value in sampled_values), dtype=np.uint64, count=total)
+        raw_values = raw_values.reshape(-1, number_of_tracked_addresses)
+        raw_times = raw_times.reshape(-1, number_of_tracked_addresses)
+
+        result = np.empty(len(raw_values), dtype=self.dtype)
+
+        # iteration and sample numbers, continued across blocks of the same iteration
+        row = 0
+        for iteration, count in zip(iterations, counts):
+            if self.last_iteration != iteration:
+                self.sample_number = 0
+                self.last_iteration = iteration
+            result['iteration'][row:row + count] = iteration
+            result['sample'][row:row + count] = np.arange(self.sample_number, self.sample_number + count, dtype=np.uint64)
+            self.sample_number += count
+            row += count
+
+        # cast raw values to the OD data type (wraps, so signed/unsigned values decode correctly)
+        for column, name in enumerate(self.dtype['value'].names):
+            result['value'][name] = raw_values[:, column].astype(self.data_types[column], casting='unsafe')
+            result['time'][name] = raw_times[:, column]
+
+        return result
+
+# Maximum difference of the boot time derived from the device uptime for the same boot (s, uptime has 1 s resolution)
+BOOT_TIME_TOLERANCE_SECONDS = 2.0
+
+# Sampler configurations applied per device: list of (device handle, configuration key, boot time)
+applied_sampler_configurations = []
+applied_sampler_configurations_lock = threading.Lock()
+
+def get_device_boot_time(ctx: 'Context', device_handle: Nanolib.DeviceHandle):
+    """Get the host monotonic time the device booted at, derived from its uptime (0x230F:00).
+
+    :param ctx: menu context
+    :param device_handle: The device handle
+    :return: the boot time in seconds (time.monotonic) or None if the uptime could not be read
+    """
+    uptime_result: Nanolib.ResultInt = ctx.nanolib_accessor.readNumber(device_handle, OdIndex.odUptimeSeconds)
+    if uptime_result.hasError():
+        return None
+    return time.monotonic() - uptime_result.getResult()
+
+def is_sampler_configuration_applied(device_handle: Nanolib.DeviceHandle, configuration_key: tuple, boot_time: float) -> bool:
+    """Check if a sampler configuration was applied to a device since its last boot.
+
+    A reboot (e.g. restore defaults, firmware update or power loss) shows up as a new boot time.
+
+    :param device_handle: The device handle
+    :param configuration_key: The configuration key (see SamplerExample.get_configuration_key)
+    :param boot_time: The current boot time of the device (see get_device_boot_time), None: unknown
+    :return: True if the configuration is still applied
+    """
+    if boot_time is None:
+        return False
+
+    with applied_sampler_configurations_lock:
+        for applied_device_handle, applied_configuration_key, applied_boot_time in applied_sampler_configurations:
+            if applied_device_handle.equals(device_handle):
+                return (applied_configuration_key == configuration_key) and \
+                    (abs(applied_boot_time - boot_time) <= BOOT_TIME_TOLERANCE_SECONDS)
+    return False
+
+def invalidate_applied_sampler_configuration(device_handle: Nanolib.DeviceHandle):
+    """Forget the sampler configuration applied to a device (e.g. on disconnect or NanoJ upload).
+
+    :param device_handle: The device handle
+    """
+    with applied_sampler_configurations_lock:
+        applied_sampler_configurations[:] = [
+            entry for entry in applied_sampler_configurations if not entry[0].equals(device_handle)
+        ]
+
+def set_applied_sampler_configuration(device_handle: Nanolib.DeviceHandle, configuration_key: tuple, boot_time: float):
+    """Remember the sampler configuration applied to a device.
+
+    :param device_handle: The device handle
+    :param configuration_key: The configuration key (see SamplerExample.get_configuration_key)
+    :param boot_time: The boot time of the device (see get_device_boot_time), None: unknown, not remembered
+    """
+    invalidate_applied_sampler_configuration(device_handle)
+    if boot_time is None:
+        return
+
+    with applied_sampler_configurations_lock:
+        applied_sampler_configurations.append((device_handle, configuration_key, boot_time))
+
+class SpscRingBuffer:
+    """Bounded single-producer/single-consumer ring buffer, used for all sampled data blocks.
+
+    Lock free: only the producer writes the head index and only the consumer writes the tail
+    index, so push never blocks.
+
+    Overflow policy: if the buffer is full, the new item is dropped and counted in 'dropped'.
+    Blocks already buffered are delivered complete and in order, an overflow shows up as one
+    gap after the last buffered block. Dropping the oldest item instead would require the
+    producer to move the tail index, which belongs to the consumer.
+    """
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise Exception("SpscRingBuffer: capacity must be at least 1")
+
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0 # next write position, written by producer only
+        self.tail = 0 # next read position, written by consumer only
+        self.high_water_mark = 0 # maximum fill level seen
+        self.dropped = 0 # number of items dropped because the buffer was full
+
+    def push(self, item) -> bool:
+        """Add an item (producer side).
+
+        :param item: The item to add
+        :return: False if the buffer was full and the item was dropped
+        """
+        head = self.head
+        fill_level = head - self.tail
+        if fill_level >= self.capacity:
+            self.dropped += 1
+            return False
+
+        self.slots[head % self.capacity] = item
+        # publish the item
+        self.head = head + 1
+
+        if fill_level + 1 > self.high_water_mark:
+            self.high_water_mark = fill_level + 1
+        return True
+
+    def pop(self):
+        """Remove the oldest item (consumer side).
+
+        :return: the oldest item or None if the buffer is empty
+        """
+        tail = self.tail
+        if tail == self.head:
+            return None
+
+        index = tail % self.capacity
+        item = self.slots[index]
+        self.slots[index] = None
+        # release the slot
+        self.tail = tail + 1
+        return item
+
+    def __len__(self):
+        return self.head - self.tail
+
+class SamplerBufferNotify(Nanolib.SamplerNotify):
+    """Base class of the sampler notifications, buffering the notified data in a ring buffer.
+
+    notify only copies the sampled data into the ring buffer and tracks the sampler state,
+    the data is processed by a consumer outside of the NanoLib thread. Subclasses wake up
+    their consumer in on_notify. Buffer items are (perf_counter at notify, Nanolib.SampleDataVector).
+    """
+    def __init__(self, buffer_capacity: int = 64):
         super().__init__()
-        self.is_sampler_active = True
-        if(isinstance(samplerExample, SamplerExample)):
-            self.samplerExample = samplerExample
-        else:
-            raise Exception("Invalid SamplerExample Object")
-    
+        self.samplerState = Nanolib.SamplerState_Ready
+        self.last_error = ""
+        self.is_notify_finished = False # set by notify on the final sampler state
+        self.ring_buffer = SpscRingBuffer(buffer_capacity) # new block is dropped if full, see SpscRingBuffer
+
+    @property
+    def dropped_blocks(self) -> int:
+        """Number of blocks dropped because the buffer was full."""
+        return self.ring_buffer.dropped
+
     def notify(self, lastError: Nanolib.ResultVoid, samplerState, sampleDatas, applicationData):
         # Be aware that notifications are executed in the context of separate threads 
         # other than thread that started the sampler.
@@ -52,28 +305,227 @@ class SamplerNotifyCallback(Nanolib.SamplerNotify):
         # to be called recursively, potentially causing your application to deadlock.
         # 
         # For the same reason, this method should not throw exceptions.
+        try:
+            if len(sampleDatas) > 0:
+                # copy, sampleDatas is only valid during the notification
+                self.ring_buffer.push((time.perf_counter(), Nanolib.SampleDataVector(sampleDatas)))
+
+            state_changed = (samplerState != self.samplerState)
+            self.samplerState = samplerState
+            if(
+                (samplerState != Nanolib.SamplerState_Ready) and 
+                (samplerState != Nanolib.SamplerState_Running)
+            ):
+                if (samplerState == Nanolib.SamplerState_Failed):
+                    self.last_error = lastError.getError()
+                self.is_notify_finished = True
+
+            self.on_notify(state_changed)
+        except Exception:
+            pass
+
+    def on_notify(self, state_changed: bool):
+        """Wake up the consumer, called at the end of every notification (must not throw).
+
+        :param state_changed: True if the sampler state changed with this notification
+        """
+        pass
+
+class SamplerNotifyCallback(SamplerBufferNotify):
+    """Implementation class of Nanolib.SamplerNotify, handling the notify callback.
+
+    The notification only enqueues the sampled data into a ring buffer, a separate consumer
+    thread processes the data, so slow processing never stalls the sampler. The consumer thread
+    is started by start_consumer once the sampler started (see SamplerExample.start).
+    """
+    def __init__(self, samplerExample, buffer_capacity: int = 64):
+        super().__init__(buffer_capacity)
         self.is_sampler_active = True
-        self.samplerExample.process_sampled_data(sampleDatas)
-        self.samplerState = samplerState
-        if(
-            (samplerState != Nanolib.SamplerState_Ready) and 
-            (samplerState != Nanolib.SamplerState_Running)
-        ):
-            if (samplerState == Nanolib.SamplerState_Failed):
-                print("")
-                print("Sampler execution failed with error: " + lastError.getError())
-            # It's now safe to destroy (this) notification object
-            self.is_sampler_active = False
+        if(isinstance(samplerExample, SamplerExample)):
+            self.samplerExample = samplerExample
+        else:
+            raise Exception("Invalid SamplerExample Object")
+
+        self.data_event = threading.Event()
+        # queue latency (time between notify and processing) in seconds
+        self.processed_blocks = 0
+        self.queue_latency_max = 0.0
+        self.queue_latency_total = 0.0
+        # wakeups for waiting threads/coroutines on state transitions and processed data
+        self.state_changed = threading.Condition()
+        self.data_generation = 0 # incremented for every processed block
+        self.async_waiters = [] # (event loop, asyncio.Event)
+        self.consumer_thread = None
+
+    def start_consumer(self):
+        """Start the consumer thread, data enqueued before is processed right away."""
+        if self.consumer_thread is None:
+            self.consumer_thread = threading.Thread(target=self.consume, name="SamplerNotifyConsumer", daemon=True)
+            self.consumer_thread.start()
+
+    def on_notify(self, state_changed: bool):
+        # only state transitions signal waiters here, data arrival is signalled by the consumer
+        if state_changed:
+            self.signal()
+
+        # wake up the consumer
+        if not self.data_event.is_set():
+            self.data_event.set()
+
+    def consume(self):
+        """Consumer thread - process the sampled data enqueued by notify."""
+        while True:
+            self.data_event.wait()
+            self.data_event.clear()
+
+            item = self.ring_buffer.pop()
+            while item is not None:
+                enqueue_time, sample_datas = item
+                queue_latency = time.perf_counter() - enqueue_time
+                self.queue_latency_total += queue_latency
+                if queue_latency > self.queue_latency_max:
+                    self.queue_latency_max = queue_latency
+
+                try:
+                    self.samplerExample.process_sampled_data(sample_datas)
+                except Exception as e:
+                    print(f"\nProcessing of sampled data failed: {e}")
+
+                self.processed_blocks += 1
+                self.data_generation += 1
+                self.signal()
+                item = self.ring_buffer.pop()
+
+            if self.is_notify_finished and len(self.ring_buffer) == 0:
+                break
+
+        if self.samplerState == Nanolib.SamplerState_Failed:
+            print("")
+            print("Sampler execution failed with error: " + self.last_error)
+
+        # All data processed and it's now safe to destroy (this) notification object
+        self.is_sampler_active = False
+        self.signal()
+
+    def signal(self):
+        """Wake up all threads and coroutines waiting for a state transition or data."""
+        with self.state_changed:
+            self.state_changed.notify_all()
+            async_waiters = list(self.async_waiters)
+
+        for loop, event in async_waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def wait(self, predicate, timeout: float = None) -> bool:
+        """Wait until predicate() is true.
+        
+        :param predicate: Condition to wait for, evaluated on every wakeup
+        :param timeout: Maximum wait time in seconds (optional, wait forever if not set)
+        :return: the last result of predicate() (False on timeout)
+        """
+        with self.state_changed:
+            return self.state_changed.wait_for(predicate, timeout)
+
+    def wait_for_state(self, sampler_states: list, timeout: float = None) -> bool:
+        """Wait until the sampler reached one of the given states (or finished).
+        
+        :param sampler_states: The sampler states to wait for
+        :param timeout: Maximum wait time in seconds (optional)
+        :return: True if one of the states was reached
+        """
+        self.wait(lambda: self.samplerState in sampler_states or self.is_notify_finished, timeout)
+        return self.samplerState in sampler_states
+
+    def wait_for_data(self, timeout: float = None) -> bool:
+        """Wait until the next block of sampled data was processed (or the sampler finished).
+        
+        :param timeout: Maximum wait time in seconds (optional)
+        :return: True if new data was processed
+        """
+        data_generation = self.data_generation
+        return self.wait(lambda: self.data_generation != data_generation or not self.is_sampler_active, timeout) and \
+            self.data_generation != data_generation
+
+    def wait_until_finished(self, timeout: float = None) -> bool:
+        """Wait until the sampler finished and all data was processed.
+        
+        :param timeout: Maximum wait time in seconds (optional)
+        :return: True if finished
+        """
+        return self.wait(lambda: not self.is_sampler_active, timeout)
+
+    async def async_wait(self, predicate, timeout: float = None) -> bool:
+        """Wait until predicate() is true without blocking the event loop.
+        
+        :param predicate: Condition to wait for, evaluated on every wakeup
+        :param timeout: Maximum wait time in seconds (optional, wait forever if not set)
+        :return: the last result of predicate() (False on timeout)
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = (loop, event)
+        with self.state_changed:
+            self.async_waiters.append(waiter)
+
+        try:
+            deadline = None if timeout is None else loop.time() + timeout
+            while not predicate():
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    return predicate()
+                try:
+                    await asyncio.wait_for(event.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return predicate()
+                event.clear()
+            return True
+        finally:
+            with self.state_changed:
+                self.async_waiters.remove(waiter)
+
+    async def async_wait_for_state(self, sampler_states: list, timeout: float = None) -> bool:
+        """Async version of wait_for_state."""
+        await self.async_wait(lambda: self.samplerState in sampler_states or self.is_notify_finished, timeout)
+        return self.samplerState in sampler_states
+
+    async def async_wait_until_finished(self, timeout: float = None) -> bool:
+        """Async version of wait_until_finished."""
+        return await self.async_wait(lambda: not self.is_sampler_active, timeout)
+
+    def get_statistics(self) -> dict:
+        """Get the handoff counters.
+
+        :return: dictionary with processed blocks, high-water mark, dropped blocks and queue latency (ms)
+        """
+        processed_blocks = self.processed_blocks
+        return {
+            "processed_blocks": processed_blocks,
+            "high_water_mark": self.ring_buffer.high_water_mark,
+            "dropped_blocks": self.ring_buffer.dropped,
+            "queue_latency_max_ms": self.queue_latency_max * 1000.0,
+            "queue_latency_mean_ms": (self.queue_latency_total / processed_blocks * 1000.0) if processed_blocks else 0.0,
+        }
+
+    def print_statistics(self):
+        """Output the handoff counters to console."""
+        statistics = self.get_statistics()
+        print(f"Processed blocks: {statistics['processed_blocks']}, "
+              f"high-water mark: {statistics['high_water_mark']}/{self.ring_buffer.capacity}, "
+              f"dropped blocks: {statistics['dropped_blocks']}, "
+              f"queue latency: max {statistics['queue_latency_max_ms']:.3f} ms / mean {statistics['queue_latency_mean_ms']:.3f} ms")
 
 class SamplerExample:
     """Demonstration sampler class."""
 
-    def __init__(self, ctx: 'Context'):
+    def __init__(self, ctx: 'Context', device_handle: Nanolib.DeviceHandle = None):
         self.sampler_interface: Nanolib.SamplerInterface = ctx.nanolib_accessor.getSamplerInterface()
         self.sampler_configuration = Nanolib.SamplerConfiguration()
 
-        if(isinstance(ctx.active_device, Nanolib.DeviceHandle)):
-            self.device_handle = ctx.active_device
+        if device_handle is None:
+            device_handle = ctx.active_device
+
+        if(isinstance(device_handle, Nanolib.DeviceHandle)):
+            self.device_handle = device_handle
         else:
             raise Exception("Invalid DeviceHandle")
         
@@ -97,6 +549,13 @@ class SamplerExample:
         self.start_trigger.address = self.trigger_address # store start trigger trigger address
         self.start_trigger.value = self.trigger_value # store start trigger trigger value
         self.period_milliseconds = 1000  # sample period in milliseconds
+        self.duration_milliseconds = 4000 # sample duration in milliseconds (not used in continuous mode)
+        self.using_software_implementation = None # None: software implementation in continuous mode only
+        # converter for sampled data, values are decoded with the OD data type of each tracked address
+        data_types = [get_numpy_data_type(ctx, self.device_handle, tracked_address) for tracked_address in self.tracked_addresses]
+        self.converter = SampleDataConverter(self.address_names, data_types)
+        # output of sampled data, see sampler_sink_example (console, csv, tsv, jsonl, quiet)
+        self.sink: SampledDataSink = ConsoleTableSink(self.address_names)
         
     def process(self):
         """Execute all defined example functions."""
@@ -115,7 +574,7 @@ class SamplerExample:
 
         print("\nSampler without notification in normal mode: ")
 
-        self.configure(Nanolib.SamplerMode_Normal)
+        self.configure(Nanolib.SamplerMode_Normal, force=False)
         self.start()
 
         sampler_state = self.get_sampler_state()
@@ -138,7 +597,7 @@ class SamplerExample:
 
         print("\nSampler without notification in repetitive mode: ")
 
-        self.configure(Nanolib.SamplerMode_Repetitive)
+        self.configure(Nanolib.SamplerMode_Repetitive, force=False)
         self.start()
 
         sampler_state = self.get_sampler_state()
@@ -171,7 +630,7 @@ class SamplerExample:
 
         print("\nSampler without notification in continuous mode: ")
 
-        self.configure(Nanolib.SamplerMode_Continuous)
+        self.configure(Nanolib.SamplerMode_Continuous, force=False)
         self.start()
 
         sampler_state = Nanolib.SamplerState_Ready
@@ -203,51 +662,54 @@ class SamplerExample:
 
     def process_sampler_with_notification_normal(self):
         """Execute example function for normal mode with notification callback."""
-        sleep_time_sec = self.period_milliseconds / 1000.0
-
         print("\nSampler with notification in normal mode: ")
         
-        self.configure(Nanolib.SamplerMode_Normal)
+        self.configure(Nanolib.SamplerMode_Normal, force=False)
 
         sampler_notify = SamplerNotifyCallback(self)
         self.start(sampler_notify)
 
-        while sampler_notify.is_sampler_active:
-            time.sleep(sleep_time_sec)
+        # Woken up as soon as the sampler finished and all data is processed
+        self.wait_until_finished(sampler_notify)
+
+        sampler_notify.print_statistics()
 
     def process_sampler_with_notification_repetitive(self):
         """Execute example function for repetitive mode with notification callback."""
-        sleep_time_sec = self.period_milliseconds / 1000.0
-        wait_time_msec = 0.05
-
         print("\nSampler with notification in repetitive mode: ")
 
-        self.configure(Nanolib.SamplerMode_Repetitive)
+        self.configure(Nanolib.SamplerMode_Repetitive, force=False)
 
         sampler_notify = SamplerNotifyCallback(self)
         self.start(sampler_notify)
 
-        # Wait for the sampler to run
-        sampler_state = self.get_sampler_state()
-        while sampler_state not in [Nanolib.SamplerState_Running, Nanolib.SamplerState_Failed]:
-            time.sleep(wait_time_msec)
-            sampler_state = self.get_sampler_state()
+        # Wait for the sampler to run (signalled by the notify callback, no getState polling)
+        sampler_notify.wait_for_state([Nanolib.SamplerState_Running, Nanolib.SamplerState_Failed], self.get_finish_timeout())
 
-        # Start processing sampled data
+        # Start processing sampled data, each iteration delivers data within the sample duration
         while sampler_notify.is_sampler_active:
-            time.sleep(sleep_time_sec)
+            if not sampler_notify.wait_for_data(self.get_finish_timeout()):
+                if sampler_notify.is_sampler_active:
+                    print("No sampled data received, stopping the sampler")
+                self.sampler_interface.stop(self.device_handle)
+                break
 
             if self.last_iteration >= 4:
                 # In repetitive mode, the sampler will continue to run until it is stopped or an error occurs
                 self.sampler_interface.stop(self.device_handle)
                 break
 
+        # Wait until the remaining data is processed
+        self.wait_until_finished(sampler_notify)
+
+        sampler_notify.print_statistics()
+
     def process_sampler_with_notification_continuous(self):
         """Execute example function for continuous mode with notification callback."""
         print("\nSampler with notification in continuous mode: ")
         sleep_time_sec = (self.period_milliseconds / 1000.0) * 10 
 
-        self.configure(Nanolib.SamplerMode_Continuous)
+        self.configure(Nanolib.SamplerMode_Continuous, force=False)
 
         sampler_notify = SamplerNotifyCallback(self)
         self.start(sampler_notify)
@@ -255,37 +717,99 @@ class SamplerExample:
         time.sleep(sleep_time_sec)
         # In continuous mode, the sampler will continue to run until it is stopped or an error occurs
         self.sampler_interface.stop(self.device_handle)
+        self.wait_until_finished(sampler_notify)
+
+        sampler_notify.print_statistics()
+
+    def get_finish_timeout(self) -> float:
+        """Get the time a started sampler may take to finish and deliver all data.
+        
+        :return: the timeout in seconds
+        """
+        return self.sampler_configuration.durationMilliseconds / 1000.0 + SAMPLER_FINISH_MARGIN_SECONDS
+
+    def wait_until_finished(self, sampler_notify: SamplerNotifyCallback) -> bool:
+        """Wait (bounded, see get_finish_timeout) until the sampler finished and all data was processed.
+        
+        :param sampler_notify: The notify callback the sampler was started with
+        :return: True if finished, False on timeout (a message is output to console)
+        """
+        timeout = self.get_finish_timeout()
+        if sampler_notify.wait_until_finished(timeout):
+            return True
+
+        print(f"Sampler not finished within {timeout:g} s, statistics are incomplete")
+        return False
 
-    def configure(self, mode):
+    def configure(self, mode, force: bool = True):
         """Function used for sampler configuration.
         
+        Without force, the configuration is skipped if it is unchanged since the last configure
+        on this device and the device did not reboot since (see is_sampler_configuration_applied).
+        The device uptime is only read without force, a forced configure is not remembered.
+        
         :param mode: The mode to use
+        :param force: configure even if the configuration is unchanged (optional)
         """
         if mode == Nanolib.SamplerMode_Continuous:
             self.sampler_configuration.durationMilliseconds = 0
         else:
-            self.sampler_configuration.durationMilliseconds = 4000
+            self.sampler_configuration.durationMilliseconds = self.duration_milliseconds
+
+        if self.using_software_implementation is None:
+            using_software_implementation = (mode == Nanolib.SamplerMode_Continuous)
+        else:
+            using_software_implementation = self.using_software_implementation
 
-        self.sampler_configuration.periodMilliseconds = 1000
-        self.sampler_configuration.preTriggerNumberOfSamples = 0 # Unused currently
+        self.sampler_configuration.periodMilliseconds = self.period_milliseconds
+        self.sampler_configuration.preTriggerNumberOfSamples = 0 # Unused currently, see PreTriggerCapture for a host-side pre-trigger
         self.sampler_configuration.trackedAddresses = self.tracked_addresses
         self.sampler_configuration.startTrigger = self.start_trigger
-        self.sampler_configuration.usingSoftwareImplementation = (mode == Nanolib.SamplerMode_Continuous)
+        self.sampler_configuration.usingSoftwareImplementation = using_software_implementation
         self.sampler_configuration.mode = mode
 
+        configuration_key = self.get_configuration_key()
+        boot_time = None # not remembered if forced
+        if not force:
+            boot_time = get_device_boot_time(self.ctx, self.device_handle)
+            if is_sampler_configuration_applied(self.device_handle, configuration_key, boot_time):
+                return
+
+        invalidate_applied_sampler_configuration(self.device_handle)
         configure_result: Nanolib.ResultVoid = self.sampler_interface.configure(self.device_handle, self.sampler_configuration)
         if(configure_result.hasError()):
             raise Exception("sampler_interface.configure:" + " " + str(configure_result.getError()))
 
-    def start(self, sampler_notify: SamplerNotifyCallback = None, application_data=0):
+        set_applied_sampler_configuration(self.device_handle, configuration_key, boot_time)
+
+    def get_configuration_key(self) -> tuple:
+        """Get a comparable key of the current sampler configuration.
+        
+        :return: tuple of all configuration values
+        """
+        configuration = self.sampler_configuration
+        trigger = configuration.startTrigger
+        return (
+            configuration.mode,
+            configuration.durationMilliseconds,
+            configuration.periodMilliseconds,
+            configuration.preTriggerNumberOfSamples,
+            configuration.usingSoftwareImplementation,
+            tuple((od_index.getIndex(), od_index.getSubIndex()) for od_index in configuration.trackedAddresses),
+            (trigger.condition, trigger.address.getIndex(), trigger.address.getSubIndex(), trigger.value)
+        )
+
+    def start(self, sampler_notify: SamplerBufferNotify = None, application_data=0, arm_trigger: bool = True):
         """Function to start a sampler.
         
         :param sampler_notify: Notify callback (optional)
         :param application_data: not used (optional)
+        :param arm_trigger: activate the start trigger after start (optional, see arm_trigger())
         """
         self.last_iteration = 0
         self.sample_number = 0
-        self.header_printed = False
+        self.sink.reset()
+        self.converter.reset()
 
         # Deactivate the start trigger
         self.ctx.nanolib_accessor.writeNumber(self.device_handle, self.trigger_value_inactive, self.trigger_address, 32)
@@ -294,9 +818,20 @@ class SamplerExample:
         start_result: Nanolib.ResultVoid = self.sampler_interface.start(self.device_handle, sampler_notify, application_data)
         if(start_result.hasError()):
             raise Exception("sampler_interface.start:" + " " + str(start_result.getError()))
+
+        # start the consumer only for a started sampler, a failed start leaves no thread behind
+        if isinstance(sampler_notify, SamplerNotifyCallback):
+            sampler_notify.start_consumer()
+        
+        if arm_trigger:
+            self.arm_trigger()
+
+    def arm_trigger(self) -> Nanolib.ResultVoid:
+        """Activate the start trigger of a started sampler.
         
-        # Activate the start trigger
-        self.ctx.nanolib_accessor.writeNumber(self.device_handle, self.trigger_value_active, self.trigger_address, 32)
+        :return: the write result
+        """
+        return self.ctx.nanolib_accessor.writeNumber(self.device_handle, self.trigger_value_active, self.trigger_address, 32)
 
     def get_sampler_state(self):
         """Get the state of the sampler.
@@ -330,57 +865,36 @@ class SamplerExample:
         handle_error_message(self.ctx, "Sampler execution failed with error: ", last_error.getError())
         print(f"\nSampler execution failed with error: {last_error.getError()}")
 
-    def process_sampled_data(self, sample_datas: Nanolib.ResultSampleDataArray = None):
-        """Process and display the sampled data.
+    def get_sampled_data_array(self, sample_datas: Nanolib.SampleDataVector = None) -> np.ndarray:
+        """Get the sampled data as structured numpy array (see SampleDataConverter).
         
-        :param sample_datas: The sampled data
+        :param sample_datas: The sampled data (optional, read from device buffer if not set)
+        :return: the sampled data, one row per sample
         """
         if sample_datas is None:
-            sampler_data_array: Nanolib.ResultSampleDataArray = self.sampler_interface.getData(self.device_handle)
-            sample_datas = sampler_data_array.getResult()
-    
-        if(isinstance(sample_datas, Nanolib.SampleDataVector)):
-            sample_datas: list[Nanolib.SampleData] = sample_datas
-        else:
-            raise Exception("process_sampled_data: invalid data type for sample_datas")
-        
-        number_of_tracked_addresses = len(self.tracked_addresses)
-
-        # generate header once
-        if not self.header_printed:
-            header_line = "------------------------------------------------------------"
-            header = f"{'Iteration':<10}{'Sample':<10}"
-            i = 0
-            for tracked_address in self.tracked_addresses:
-                address_name = f"[{self.address_names[i]}]"
-                header += f"{address_name:<14}{'Time':<8}"
-                i += 1
-
-            print(header_line)
-            print(header)
-            print(header_line)
-            self.header_printed = True
-
-        # go through sampled data objects
-        for sample_data in sample_datas:
-            sampled_values = sample_data.sampledValues
-            number_of_sampled_values = len(sampled_values)
+            sample_datas = self.get_sampler_data()
 
-            assert number_of_sampled_values % number_of_tracked_addresses == 0
+        if not isinstance(sample_datas, Nanolib.SampleDataVector):
+            raise Exception("get_sampled_data_array: invalid data type for sample_datas")
 
-            if self.last_iteration != sample_data.iterationNumber:
-                self.sample_number = 0
-                self.last_iteration = sample_data.iterationNumber
+        sampled_data_array = self.converter.convert(sample_datas)
+        self.last_iteration = self.converter.last_iteration
+        self.sample_number = self.converter.sample_number
 
-            # gather sampled values for tracked addresses and output in a row
-            for index in range(0, number_of_sampled_values, number_of_tracked_addresses):
-                line = f"{self.last_iteration:<10}{self.sample_number:<10}"
-
-                for tracked_address_index in range(number_of_tracked_addresses):
-                    sampled_value: Nanolib.SampledValue = sampled_values[index + tracked_address_index]
-                    line += f"{sampled_value.value:<14}{sampled_value.collectTimeMsec:<8}"
-
-                print(line)
-                self.sample_number += 1
+        return sampled_data_array
 
+    def process_sampled_data(self, sample_datas: Nanolib.ResultSampleDataArray = None):
+        """Process and display the sampled data.
+        
+        :param sample_datas: The sampled data
+        """
+        sampled_data_array = self.get_sampled_data_array(sample_datas)
+        self.print_sampled_data_array(sampled_data_array)
 
+    def print_sampled_data_array(self, sampled_data_array: np.ndarray):
+        """Output sampled data already converted by get_sampled_data_array to the sink.
+        
+        :param sampled_data_array: The converted sampled data
+        """
+        # the whole block is formatted at once and written with a single write
+        self.sink.write(sampled_data_array)
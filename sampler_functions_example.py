@@ -33,6 +33,15 @@
 from nanotec_nanolib import *
 from menu_utils import *
 from sampler_example import *
+from sampler_stream_example import SamplerStream
+from sampler_sink_example import create_sink
+from sampler_capture_example import CaptureWriter, CaptureReader
+from sampler_orchestrator_example import SamplerOrchestrator
+from sampler_statistics_example import StatisticsStage, DecimatingSink, MinMaxDecimator
+from sampler_planner_example import SamplerRatePlanner, SamplerRunReport
+from sampler_timing_example import DeviceTimingMonitor, SampleTimingAnalyzer
+from sampler_software_example import SoftwareSampler
+from sampler_trigger_example import TriggerRecorder, PreTriggerCapture, compile_trigger
 
 def execute_sampler_without_notification_normal_mode(ctx: 'Context'):
     """Execute the sampler example in normal mode without notification callback.
@@ -146,4 +155,301 @@ def execute_sampler_with_notification_continuous_mode(ctx: 'Context'):
     sampler_example = SamplerExample(ctx)
     sampler_example.process_sampler_with_notification_continuous()
 
-    print("Finished")
\ No newline at end of file
+    print("Finished")
+
+def execute_sampler_stream_continuous_mode(ctx: 'Context'):
+    """Execute the sampler example in continuous mode, consuming the data as a stream.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if ctx.active_device == None:
+        handle_error_message(ctx, "No active device set. Select an active device first.")
+        return
+
+    print("In continuous mode the sampler runs until stopped.")
+    print("In this example the sampled data blocks are streamed as they arrive, after 10 samples the sampler is stopped.")
+
+    sampler_example = SamplerExample(ctx)
+    max_samples = 10
+
+    with SamplerStream(sampler_example, Nanolib.SamplerMode_Continuous) as sampler_stream:
+        for sampled_data_array in sampler_stream:
+            sampler_example.print_sampled_data_array(sampled_data_array)
+
+            if sampler_example.sample_number >= max_samples:
+                # Stop the sampler, remaining data is still delivered
+                sampler_stream.stop()
+
+        if sampler_stream.dropped_blocks > 0:
+            print(f"{ctx.light_yellow}{sampler_stream.dropped_blocks} blocks dropped (consumer too slow){ctx.def_color}")
+
+    sampler_example.sink.print_summary()
+
+    print("Finished")
+
+def execute_sampler_capture_continuous_mode(ctx: 'Context'):
+    """Execute the sampler example in continuous mode, capturing the data to memory-mapped files.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if ctx.active_device == None:
+        handle_error_message(ctx, "No active device set. Select an active device first.")
+        return
+
+    input_path = None
+    while input_path is None:
+        input_path = get_string_with_prompt("Please enter the directory for the capture files: ")
+
+    print("In continuous mode the sampler runs until stopped.")
+    print("In this example the sampled data is written to capture files, after 10 samples the sampler is stopped.")
+
+    sampler_example = SamplerExample(ctx)
+    max_samples = 10
+    metadata = {
+        "address_names": sampler_example.address_names,
+        "tracked_addresses": [tracked_address.toString() for tracked_address in sampler_example.tracked_addresses]
+    }
+
+    with CaptureWriter(input_path, metadata=metadata) as capture_writer:
+        with SamplerStream(sampler_example, Nanolib.SamplerMode_Continuous) as sampler_stream:
+            for sampled_data_array in sampler_stream:
+                capture_writer.write(sampled_data_array)
+
+                if sampler_example.sample_number >= max_samples:
+                    # Stop the sampler, remaining data is still captured
+                    sampler_stream.stop()
+
+    print(f"{capture_writer.total_rows} samples captured to:")
+    for segment_path in capture_writer.segment_paths:
+        with CaptureReader(segment_path) as capture_reader:
+            print(f"- {segment_path} ({capture_reader.rows} samples)")
+
+    print("Finished")
+
+def execute_sampler_multi_device_normal_mode(ctx: 'Context'):
+    """Execute the sampler example in normal mode on all connected devices with synchronized start.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if not ctx.connected_device_handles:
+        handle_error_message(ctx, "No connected devices. Connect a device first.")
+        return
+
+    print(f"In this example the sampler runs in normal mode on {len(ctx.connected_device_handles)} device(s).")
+    print("The start triggers of all devices are armed concurrently per bus.")
+    print("The timing quality (gaps, overruns, jitter) is reported per device.")
+
+    try:
+        sampler_orchestrator = SamplerOrchestrator(ctx)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_sampler_multi_device_normal_mode: ", str(exception))
+        return
+
+    device_timing_monitor = DeviceTimingMonitor(sampler_orchestrator.sampler_examples[0].period_milliseconds)
+    try:
+        sampler_orchestrator.configure(Nanolib.SamplerMode_Normal, force=False)
+        sampler_orchestrator.start()
+        sampler_orchestrator.print_trigger_skew()
+
+        for device_handle, sampled_data_array in sampler_orchestrator.blocks():
+            device_timing_monitor.update(device_handle, sampled_data_array)
+            for sampler_example in sampler_orchestrator.sampler_examples:
+                if sampler_example.device_handle.equals(device_handle):
+                    print(f"\nDevice {device_handle.toString()}:")
+                    sampler_example.sink.reset_header()
+                    sampler_example.print_sampled_data_array(sampled_data_array)
+    except Exception as exception:
+        handle_error_message(ctx, "Error during execute_sampler_multi_device_normal_mode: ", str(exception))
+        return
+
+    sampler_orchestrator.print_errors()
+    device_timing_monitor.print_report()
+
+    print("Finished")
+
+def execute_sampler_statistics_continuous_mode(ctx: 'Context'):
+    """Execute the sampler example in continuous mode with online statistics and downsampled output.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if ctx.active_device == None:
+        handle_error_message(ctx, "No active device set. Select an active device first.")
+        return
+
+    print("In continuous mode the sampler runs until stopped.")
+    print("In this example statistics are updated per block and a min/max envelope of every 5 samples is output.")
+    print("After 20 samples the sampler is stopped.")
+
+    sampler_example = SamplerExample(ctx)
+    max_samples = 20
+
+    # statistics stage, forwarding to a decimated console output
+    statistics_stage = StatisticsStage([DecimatingSink(MinMaxDecimator(5), sampler_example.sink)], window_bucket_size=5, window_buckets=2)
+    sampler_example.sink = statistics_stage
+
+    with SamplerStream(sampler_example, Nanolib.SamplerMode_Continuous) as sampler_stream:
+        for sampled_data_array in sampler_stream:
+            sampler_example.print_sampled_data_array(sampled_data_array)
+
+            if sampler_example.sample_number >= max_samples:
+                sampler_stream.stop()
+
+    statistics_stage.print_summary()
+
+    print("Finished")
+
+def execute_sampler_rate_planner_normal_mode(ctx: 'Context'):
+    """Plan the sampler configuration for a desired rate, run it in normal mode and report the achieved rate.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if ctx.active_device == None:
+        handle_error_message(ctx, "No active device set. Select an active device first.")
+        return
+
+    desired_rate = 100.0
+    desired_duration_milliseconds = 2000
+
+    sampler_example = SamplerExample(ctx)
+    sampler_rate_planner = SamplerRatePlanner(ctx)
+
+    print("Measuring read throughput ...")
+    read_milliseconds = sampler_rate_planner.measure_read_throughput(sampler_example.tracked_addresses)
+    print(f"Read time per object: {read_milliseconds:.3f} ms")
+
+    sampler_plan = sampler_rate_planner.plan(sampler_example.tracked_addresses, desired_rate, desired_duration_milliseconds)
+    print(f"Plan for {desired_rate:.1f} Hz: {sampler_plan}")
+    sampler_plan.apply(sampler_example)
+
+    sampler_run_report = SamplerRunReport(sampler_plan)
+    sampler_example.sink = create_sink("quiet", sampler_example.address_names)
+
+    with SamplerStream(sampler_example, Nanolib.SamplerMode_Normal) as sampler_stream:
+        for sampled_data_array in sampler_stream:
+            sampler_run_report.update(sampled_data_array)
+
+    sampler_run_report.print_report(sampler_stream.sampler_notify)
+
+    print("Finished")
+
+def execute_sampler_software_engine_normal_mode(ctx: 'Context'):
+    """Execute the host-side software sampler and report scheduling latency and timing quality.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if ctx.active_device == None:
+        handle_error_message(ctx, "No active device set. Select an active device first.")
+        return
+
+    print("In this example the tracked addresses are sampled by the host with a period of 10 ms for 2 s.")
+    print("Scheduling latency and timing quality are reported, comparable to the on-device sampler.")
+
+    sampler_example = SamplerExample(ctx)
+    sampler_example.period_milliseconds = 10
+    sampler_example.duration_milliseconds = 2000
+    sampler_example.sink = create_sink("quiet", sampler_example.address_names)
+    sample_timing_analyzer = SampleTimingAnalyzer(sampler_example.period_milliseconds)
+
+    with SoftwareSampler(sampler_example) as software_sampler:
+        for sampled_data_array in software_sampler:
+            sample_timing_analyzer.update(sampled_data_array)
+            sampler_example.print_sampled_data_array(sampled_data_array)
+
+    if software_sampler.last_error:
+        handle_error_message(ctx, "Software sampler failed with error: ", software_sampler.last_error)
+
+    sampler_example.sink.print_summary()
+    software_sampler.print_statistics()
+    sample_timing_analyzer.print_report()
+
+    print("Finished")
+
+def execute_sampler_trigger_continuous_mode(ctx: 'Context'):
+    """Execute the sampler example in continuous mode, recording only segments matching host-side triggers.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if ctx.active_device == None:
+        handle_error_message(ctx, "No active device set. Select an active device first.")
+        return
+
+    start_expression = "rising(Temperature, 30) or Temperature > 45"
+    stop_expression = "falling(Temperature, 28)"
+
+    print("In continuous mode the sampler runs until stopped.")
+    print("In this example only segments between the start and stop trigger are output, all other samples are discarded:")
+    print(f"- start trigger: {start_expression}")
+    print(f"- stop trigger: {stop_expression}")
+    print("After 20 samples the sampler is stopped.")
+
+    sampler_example = SamplerExample(ctx)
+    max_samples = 20
+
+    start_trigger = compile_trigger(start_expression, sampler_example.address_names)
+    stop_trigger = compile_trigger(stop_expression, sampler_example.address_names)
+    trigger_recorder = TriggerRecorder(start_trigger, stop_trigger, [sampler_example.sink])
+    sampler_example.sink = trigger_recorder
+
+    with SamplerStream(sampler_example, Nanolib.SamplerMode_Continuous) as sampler_stream:
+        for sampled_data_array in sampler_stream:
+            sampler_example.print_sampled_data_array(sampled_data_array)
+
+            if sampler_example.sample_number >= max_samples:
+                sampler_stream.stop()
+
+    trigger_recorder.print_summary()
+
+    print("Finished")
+
+def execute_sampler_pre_trigger_continuous_mode(ctx: 'Context'):
+    """Execute the sampler example in continuous mode, outputting windows of pre- and post-trigger samples.
+    
+    :param ctx: menu context
+    """
+    ctx.wait_for_user_confirmation = True
+
+    if ctx.active_device == None:
+        handle_error_message(ctx, "No active device set. Select an active device first.")
+        return
+
+    trigger_expression = "rising(Temperature, 30)"
+    pre_trigger_samples = 5
+    post_trigger_samples = 5
+
+    print("In continuous mode the sampler runs until stopped.")
+    print(f"In this example the latest {pre_trigger_samples} samples are kept in a ring buffer, on the trigger '{trigger_expression}'")
+    print(f"one window with {pre_trigger_samples} pre-trigger and {post_trigger_samples} post-trigger samples is output.")
+    print("After 30 samples the sampler is stopped.")
+
+    sampler_example = SamplerExample(ctx)
+    max_samples = 30
+
+    trigger = compile_trigger(trigger_expression, sampler_example.address_names)
+    pre_trigger_capture = PreTriggerCapture(trigger, pre_trigger_samples, post_trigger_samples, [sampler_example.sink])
+    sampler_example.sink = pre_trigger_capture
+
+    with SamplerStream(sampler_example, Nanolib.SamplerMode_Continuous) as sampler_stream:
+        for sampled_data_array in sampler_stream:
+            sampler_example.print_sampled_data_array(sampled_data_array)
+
+            if sampler_example.sample_number >= max_samples:
+                sampler_stream.stop()
+
+    pre_trigger_capture.close()
+    pre_trigger_capture.print_summary()
+
+    print("Finished")
@@ -0,0 +1,227 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   sampler_orchestrator_example.py
+#
+# @brief  Definition of multi-device synchronized sampler orchestration
+#
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from menu_utils import Context, get_bus_key
+from sampler_example import SamplerExample, SamplerBufferNotify
+from nanotec_nanolib import Nanolib
+
+class SamplerFanInNotify(SamplerBufferNotify):
+    """Implementation class of Nanolib.SamplerNotify for one device of an orchestrated capture.
+
+    Sampled data is enqueued into a per-device ring buffer (see SamplerBufferNotify), a shared
+    event wakes up the single consumer of all devices.
+    """
+    def __init__(self, device_index: int, data_event: threading.Event, buffer_capacity: int = 64):
+        super().__init__(buffer_capacity)
+        self.device_index = device_index
+        self.data_event = data_event
+        self.is_sampler_active = True
+
+    def on_notify(self, state_changed: bool):
+        if self.is_notify_finished:
+            # It's now safe to destroy (this) notification object
+            self.is_sampler_active = False
+
+        if not self.data_event.is_set():
+            self.data_event.set()
+
+class SamplerOrchestrator:
+    """Runs samplers on several devices with synchronized start triggers.
+
+    Configuration and start are done in parallel for all devices. The start triggers are
+    armed by one thread per bus, all bus threads are released at the same time and write
+    the triggers of their devices back to back. The host-side trigger skew (time of the
+    trigger write relative to the first armed device) is reported per device, devices whose
+    trigger could not be armed are stopped and left out of the skew.
+    """
+    def __init__(self, ctx: 'Context', device_handles: list = None, buffer_capacity: int = 64):
+        if device_handles is None:
+            device_handles = list(ctx.connected_device_handles)
+
+        if len(device_handles) == 0:
+            raise Exception("SamplerOrchestrator: no devices")
+
+        self.ctx = ctx
+        self.sampler_examples = [SamplerExample(ctx, device_handle) for device_handle in device_handles]
+        self.bus_keys = [get_bus_key(ctx, device_handle) for device_handle in device_handles]
+        self.buffer_capacity = buffer_capacity
+        self.data_event = threading.Event()
+        self.sampler_notifies: list = []
+        self.trigger_times = [None] * len(device_handles) # perf_counter after the trigger write, None if not armed
+        self.trigger_errors = [""] * len(device_handles)
+
+    def _for_all_devices(self, function):
+        """Call function(device_index) for all devices in parallel and raise the first error."""
+        with ThreadPoolExecutor(max_workers=len(self.sampler_examples)) as executor:
+            for future in [executor.submit(function, index) for index in range(len(self.sampler_examples))]:
+                future.result()
+
+    def configure(self, mode, force: bool = True):
+        """Configure the samplers of all devices in parallel.
+
+        :param mode: The sampler mode to use
+        :param force: configure even if the configuration is unchanged (optional, see SamplerExample.configure)
+        """
+        self._for_all_devices(lambda index: self.sampler_examples[index].configure(mode, force))
+
+    def start(self):
+        """Start the samplers of all devices (parallel) and arm all start triggers (synchronized)."""
+        self.data_event.clear()
+        self.sampler_notifies = [SamplerFanInNotify(index, self.data_event, self.buffer_capacity) for index in range(len(self.sampler_examples))]
+        started = [False] * len(self.sampler_examples)
+
+        def start_device(index):
+            self.sampler_examples[index].start(self.sampler_notifies[index], index, arm_trigger=False)
+            started[index] = True
+
+        try:
+            self._for_all_devices(start_device)
+        except Exception:
+            # the samplers already started must not keep running
+            for index, sampler_example in enumerate(self.sampler_examples):
+                if started[index]:
+                    sampler_example.sampler_interface.stop(sampler_example.device_handle)
+            raise
+
+        self.arm_triggers()
+        self.stop_unarmed()
+
+    def arm_triggers(self):
+        """Arm the start triggers of all devices, concurrently per bus."""
+        device_indices_per_bus = {}
+        for index, bus_key in enumerate(self.bus_keys):
+            device_indices_per_bus.setdefault(bus_key, []).append(index)
+
+        self.trigger_times = [None] * len(self.sampler_examples)
+        self.trigger_errors = [""] * len(self.sampler_examples)
+        barrier = threading.Barrier(len(device_indices_per_bus))
+
+        def arm_bus(device_indices):
+            barrier.wait()
+            for index in device_indices:
+                try:
+                    write_result = self.sampler_examples[index].arm_trigger()
+                    if write_result.hasError():
+                        self.trigger_errors[index] = write_result.getError()
+                    else:
+                        self.trigger_times[index] = time.perf_counter()
+                except Exception as exception:
+                    self.trigger_errors[index] = str(exception)
+
+        threads = [threading.Thread(target=arm_bus, args=(device_indices,)) for device_indices in device_indices_per_bus.values()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def stop_unarmed(self):
+        """Stop the samplers whose start trigger could not be armed.
+
+        These samplers would wait for a trigger that never comes, the other devices finish without them.
+        """
+        for index, sampler_example in enumerate(self.sampler_examples):
+            if self.trigger_errors[index]:
+                sampler_example.sampler_interface.stop(sampler_example.device_handle)
+                self.sampler_notifies[index].is_sampler_active = False
+
+        # wake up the consumer, all samplers may be finished now
+        self.data_event.set()
+
+    def stop(self):
+        """Stop the samplers of all devices (parallel)."""
+        def stop_device(index):
+            if self.sampler_notifies[index].is_sampler_active:
+                sampler_example = self.sampler_examples[index]
+                sampler_example.sampler_interface.stop(sampler_example.device_handle)
+
+        self._for_all_devices(stop_device)
+
+    def is_active(self) -> bool:
+        """Check if any sampler is still active."""
+        return any(sampler_notify.is_sampler_active for sampler_notify in self.sampler_notifies)
+
+    def blocks(self):
+        """Generator yielding (device_handle, sampled_data_array) for all devices as notified.
+
+        Ends after all samplers finished and all data is drained. Raises (after stopping the
+        samplers) if no sampler delivers data or finishes within the finish timeout.
+        """
+        # a started sampler delivers data or finishes within this time
+        timeout = max(sampler_example.get_finish_timeout() for sampler_example in self.sampler_examples)
+        while True:
+            if not self.data_event.wait(timeout):
+                self.stop()
+                raise Exception(f"SamplerOrchestrator: no data from the samplers within {timeout:g} s")
+            self.data_event.clear()
+
+            # evaluate before draining, so data notified together with the final state is not lost
+            active = self.is_active()
+            for sampler_notify in self.sampler_notifies:
+                sampler_example = self.sampler_examples[sampler_notify.device_index]
+                item = sampler_notify.ring_buffer.pop()
+                while item is not None:
+                    _, sample_datas = item
+                    yield sampler_example.device_handle, sampler_example.get_sampled_data_array(sample_datas)
+                    item = sampler_notify.ring_buffer.pop()
+
+            if not active:
+                break
+
+    def get_trigger_skew(self) -> list:
+        """Get the host-side trigger skew per device.
+
+        :return: list of (device_handle, bus key, skew in ms relative to the first armed device (None if not armed), error)
+        """
+        armed_trigger_times = [trigger_time for trigger_time in self.trigger_times if trigger_time is not None]
+        first_trigger_time = min(armed_trigger_times) if armed_trigger_times else None
+        return [
+            (sampler_example.device_handle, self.bus_keys[index],
+             (self.trigger_times[index] - first_trigger_time) * 1000.0 if self.trigger_times[index] is not None else None,
+             self.trigger_errors[index])
+            for index, sampler_example in enumerate(self.sampler_examples)
+        ]
+
+    def print_trigger_skew(self):
+        """Output the trigger skew per device to console."""
+        print("Trigger skew per device:")
+        for device_handle, bus_key, skew, error in self.get_trigger_skew():
+            if skew is None:
+                line = f"- {device_handle.toString()} on {bus_key}: trigger write failed: {error}"
+            else:
+                line = f"- {device_handle.toString()} on {bus_key}: {skew:.3f} ms"
+            print(line)
+
+    def print_errors(self):
+        """Output failed sampler executions to console."""
+        for sampler_notify in self.sampler_notifies:
+            if sampler_notify.samplerState == Nanolib.SamplerState_Failed:
+                device_handle = self.sampler_examples[sampler_notify.device_index].device_handle
+                print(f"Sampler execution on {device_handle.toString()} failed with error: {sampler_notify.last_error}")
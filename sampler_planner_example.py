@@ -0,0 +1,245 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   sampler_planner_example.py
+#
+# @brief  Definition of the sampler rate planner and the achieved-rate report
+#
+
+import math
+import time
+import numpy as np
+from menu_utils import Context
+from sampler_example import SamplerExample, SamplerBufferNotify
+from sampler_timing_example import SampleTimingAnalyzer
+from nanotec_nanolib import Nanolib
+
+# ASSUMED limits of the hardware (on-device) sampler. They are not read from the device and
+# differ per device and firmware - check the device manual and adjust before relying on a plan.
+HARDWARE_SAMPLER_MAX_TRACKED_ADDRESSES = 12
+HARDWARE_SAMPLER_BUFFER_VALUES = 4096 # number of sampled values the device buffer holds
+HARDWARE_SAMPLER_MIN_PERIOD_MILLISECONDS = 1
+
+# Estimated time for one object read per bus protocol (ms), used if no measurement is available
+ESTIMATED_READ_MILLISECONDS = {
+    "CANopen": 1.0,
+    "EtherCAT": 0.5,
+    "Modbus RTU": 5.0,
+    "Modbus TCP": 1.0,
+    "MSC": 2.0,
+    "REST": 10.0,
+}
+DEFAULT_ESTIMATED_READ_MILLISECONDS = 5.0
+
+# Part of the measured bus capacity the software sampler may use
+SOFTWARE_SAMPLER_LOAD_FACTOR = 0.5
+
+class SamplerPlan:
+    """Sampler timing parameters chosen by the SamplerRatePlanner."""
+    def __init__(self, period_milliseconds: int, duration_milliseconds: int, using_software_implementation: bool, read_milliseconds: float, reason: str):
+        self.period_milliseconds = period_milliseconds
+        self.duration_milliseconds = duration_milliseconds
+        self.using_software_implementation = using_software_implementation
+        self.read_milliseconds = read_milliseconds # (measured) time to read all tracked addresses once
+        self.reason = reason
+
+    @property
+    def sample_rate(self) -> float:
+        """Planned sample rate in Hz."""
+        return 1000.0 / self.period_milliseconds
+
+    def apply(self, sampler_example: SamplerExample):
+        """Use this plan for the next configure of a sampler example.
+
+        :param sampler_example: The sampler example to configure
+        """
+        sampler_example.period_milliseconds = self.period_milliseconds
+        sampler_example.duration_milliseconds = self.duration_milliseconds
+        sampler_example.using_software_implementation = self.using_software_implementation
+
+    def __str__(self):
+        implementation = "software" if self.using_software_implementation else "hardware"
+        return (f"period {self.period_milliseconds} ms ({self.sample_rate:.1f} Hz), duration {self.duration_milliseconds} ms, "
+                f"{implementation} implementation ({self.reason})")
+
+class SamplerRatePlanner:
+    """Chooses the sampler period, duration and implementation for a desired sample rate.
+
+    The software implementation reads all tracked addresses once per period over the bus,
+    so its highest rate is derived from the measured read throughput. The hardware
+    implementation samples on the device, its duration is limited by the device buffer
+    (see the assumed HARDWARE_SAMPLER_* limits).
+    """
+    def __init__(self, ctx: 'Context', device_handle: Nanolib.DeviceHandle = None):
+        self.ctx = ctx
+        self.device_handle = device_handle if device_handle is not None else ctx.active_device
+        self.read_milliseconds_per_object = None # measured, see measure_read_throughput
+
+    def get_bus_protocol(self) -> str:
+        """Get the protocol name of the bus the device is connected to."""
+        device_id_result: Nanolib.ResultDeviceId = self.ctx.nanolib_accessor.getDeviceId(self.device_handle)
+        if device_id_result.hasError():
+            return ""
+        return device_id_result.getResult().getBusHardwareId().getProtocol()
+
+    def measure_read_throughput(self, tracked_addresses, repetitions: int = 10) -> float:
+        """Measure the time to read one object over the bus.
+
+        :param tracked_addresses: The addresses to read
+        :param repetitions: Number of read rounds (optional)
+        :return: the average read time per object in milliseconds
+        """
+        number_of_reads = 0
+        start = time.perf_counter()
+        for _ in range(repetitions):
+            for tracked_address in tracked_addresses:
+                read_result: Nanolib.ResultInt = self.ctx.nanolib_accessor.readNumber(self.device_handle, tracked_address)
+                if read_result.hasError():
+                    raise Exception("measure_read_throughput: " + read_result.getError())
+                number_of_reads += 1
+        elapsed = time.perf_counter() - start
+
+        self.read_milliseconds_per_object = elapsed * 1000.0 / number_of_reads
+        return self.read_milliseconds_per_object
+
+    def get_read_milliseconds_per_object(self) -> float:
+        """Get the measured (or estimated per bus protocol) read time per object in milliseconds."""
+        if self.read_milliseconds_per_object is not None:
+            return self.read_milliseconds_per_object
+        return ESTIMATED_READ_MILLISECONDS.get(self.get_bus_protocol(), DEFAULT_ESTIMATED_READ_MILLISECONDS)
+
+    def plan(self, tracked_addresses, desired_rate: float, desired_duration_milliseconds: int, mode=Nanolib.SamplerMode_Normal) -> SamplerPlan:
+        """Plan the highest sustainable sampler configuration for the desired rate.
+
+        :param tracked_addresses: The tracked addresses
+        :param desired_rate: The desired sample rate in Hz
+        :param desired_duration_milliseconds: The desired duration in ms (ignored in continuous mode)
+        :param mode: The sampler mode (optional)
+        :return: the plan
+        """
+        if desired_rate <= 0:
+            raise Exception("SamplerRatePlanner: desired rate must be greater than 0")
+        if len(tracked_addresses) == 0:
+            raise Exception("SamplerRatePlanner: no tracked addresses")
+
+        number_of_tracked_addresses = len(tracked_addresses)
+        read_milliseconds = self.get_read_milliseconds_per_object() * number_of_tracked_addresses
+        desired_period = max(1, int(math.ceil(1000.0 / desired_rate)))
+        # the period has a resolution of 1 ms: rates above 1000 Hz (or between two whole periods) are not reached
+        desired_reason = "desired rate" if desired_period * desired_rate <= 1000.0 else "rate limited by 1 ms period resolution"
+
+        # shortest period the software implementation can keep up with
+        software_period = max(1, int(math.ceil(read_milliseconds / SOFTWARE_SAMPLER_LOAD_FACTOR)))
+
+        hardware_possible = (
+            (mode != Nanolib.SamplerMode_Continuous) and
+            (number_of_tracked_addresses <= HARDWARE_SAMPLER_MAX_TRACKED_ADDRESSES)
+        )
+
+        if hardware_possible:
+            period = max(desired_period, HARDWARE_SAMPLER_MIN_PERIOD_MILLISECONDS)
+            max_samples = HARDWARE_SAMPLER_BUFFER_VALUES // number_of_tracked_addresses
+            duration = min(desired_duration_milliseconds, max_samples * period)
+
+            if duration < desired_duration_milliseconds and software_period <= period:
+                # the buffer would limit the duration, but the bus can keep up with the software implementation
+                return SamplerPlan(period, desired_duration_milliseconds, True, read_milliseconds, "assumed device buffer too small for duration")
+
+            reason = desired_reason if duration == desired_duration_milliseconds else "duration limited by assumed device buffer"
+            return SamplerPlan(period, duration, False, read_milliseconds, reason)
+
+        period = max(desired_period, software_period)
+        reason = desired_reason if period == desired_period else "rate limited by bus throughput"
+        duration = 0 if mode == Nanolib.SamplerMode_Continuous else desired_duration_milliseconds
+        return SamplerPlan(period, duration, True, read_milliseconds, reason)
+
+class SamplerRunReport:
+    """Achieved sample rate, buffer utilization and lost samples of a sampler run.
+
+    Fed with the converted sampled data blocks (see SamplerExample.get_sampled_data_array).
+    Gaps and lost samples are detected by a SampleTimingAnalyzer with the planned period.
+    The buffer utilization is the measured high-water mark of the notify ring buffer.
+    """
+    def __init__(self, plan: SamplerPlan):
+        self.plan = plan
+        self.timing_analyzer = SampleTimingAnalyzer(plan.period_milliseconds)
+        self.first_time = None
+        self.last_time = None
+
+    def update(self, sampled_data_array: np.ndarray):
+        """Add a block of sampled data.
+
+        :param sampled_data_array: The converted sampled data
+        """
+        if len(sampled_data_array) == 0:
+            return
+
+        self.timing_analyzer.update(sampled_data_array)
+
+        # collect time of the first tracked address is the sample time
+        collect_times = sampled_data_array['time'][sampled_data_array.dtype['time'].names[0]]
+        if self.first_time is None:
+            self.first_time = int(collect_times[0])
+        self.last_time = int(collect_times[-1])
+
+    @property
+    def received_samples(self) -> int:
+        """Number of received samples."""
+        return self.timing_analyzer.samples
+
+    @property
+    def lost_samples(self) -> int:
+        """Number of samples missing between received samples."""
+        return self.timing_analyzer.missing_samples
+
+    @property
+    def achieved_rate(self) -> float:
+        """Achieved sample rate in Hz, based on the device collect times."""
+        if self.first_time is None or self.last_time == self.first_time:
+            return 0.0
+        return (self.received_samples - 1) * 1000.0 / (self.last_time - self.first_time)
+
+    @staticmethod
+    def get_buffer_utilization(sampler_notify: SamplerBufferNotify) -> float:
+        """Get the peak fill level of the notify ring buffer.
+
+        :param sampler_notify: The notification of the run
+        :return: high-water mark / capacity (0.0 .. 1.0)
+        """
+        ring_buffer = sampler_notify.ring_buffer
+        return ring_buffer.high_water_mark / ring_buffer.capacity
+
+    def print_report(self, sampler_notify: SamplerBufferNotify = None):
+        """Output the run report to console.
+
+        :param sampler_notify: The notification of the run, used for the buffer utilization (optional)
+        """
+        print(f"Planned: {self.plan}")
+        print(f"Achieved sample rate: {self.achieved_rate:.2f} Hz (planned {self.plan.sample_rate:.2f} Hz)")
+        if sampler_notify is not None:
+            ring_buffer = sampler_notify.ring_buffer
+            print(f"Buffer utilization: {self.get_buffer_utilization(sampler_notify) * 100.0:.1f} % "
+                  f"(high-water mark {ring_buffer.high_water_mark}/{ring_buffer.capacity} blocks, "
+                  f"dropped blocks: {ring_buffer.dropped})")
+        print(f"Received samples: {self.received_samples}, lost samples: {self.lost_samples} in {self.timing_analyzer.gaps} gaps, "
+              f"overruns: {self.timing_analyzer.overruns}")
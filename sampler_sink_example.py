@@ -0,0 +1,244 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   sampler_sink_example.py
+#
+# @brief  Definition of output sinks for sampled data (console, CSV/TSV, JSON lines, quiet)
+#
+
+import sys
+import time
+import numpy as np
+
+def to_string_column(column: np.ndarray, width: int = 0) -> np.ndarray:
+    """Convert a numeric column to strings (vectorized), optionally left aligned.
+
+    :param column: The column to convert
+    :param width: Minimum width, padded with blanks on the right (optional)
+    :return: array of strings
+    """
+    strings = column.astype(str)
+    if width > 0:
+        strings = np.char.ljust(strings, width)
+    return strings
+
+def join_columns(columns: list, separator: str = "") -> np.ndarray:
+    """Join string columns row wise (vectorized).
+
+    :param columns: The string columns
+    :param separator: The separator between columns (optional)
+    :return: array with one string per row
+    """
+    lines = columns[0]
+    for column in columns[1:]:
+        if separator:
+            lines = np.char.add(lines, separator)
+        lines = np.char.add(lines, column)
+    return lines
+
+class SampledDataSink:
+    """Base class of all sampled data sinks, counting written samples and blocks.
+
+    The sample rate is measured from the arrival of the first block on, so the samples of
+    the first block are not part of the rate (see get_sample_rate).
+    """
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.total_samples = 0
+        self.total_blocks = 0
+        self.first_write_time = None
+        self.last_write_time = None
+        self.first_block_samples = 0 # samples of the first block, collected before first_write_time
+
+    def write(self, sampled_data_array: np.ndarray):
+        """Write a block of sampled data (see SamplerExample.get_sampled_data_array).
+
+        :param sampled_data_array: The converted sampled data
+        """
+        now = time.monotonic()
+        if self.first_write_time is None:
+            self.first_write_time = now
+            self.first_block_samples = len(sampled_data_array)
+        self.last_write_time = now
+        self.total_samples += len(sampled_data_array)
+        self.total_blocks += 1
+
+        if len(sampled_data_array) > 0:
+            text = self.format(sampled_data_array)
+            if text:
+                # one buffered write per block
+                self.stream.write(text)
+
+    def format(self, sampled_data_array: np.ndarray) -> str:
+        """Format a block of sampled data.
+
+        :param sampled_data_array: The converted sampled data
+        :return: the formatted text (may be empty)
+        """
+        return ""
+
+    def reset(self):
+        """Called on sampler (re-)start, restarts the counters and the sample rate time base."""
+        self.total_samples = 0
+        self.total_blocks = 0
+        self.first_write_time = None
+        self.last_write_time = None
+        self.first_block_samples = 0
+
+    def get_sample_rate(self) -> float:
+        """Get the average rate of written samples per second.
+
+        The time base starts with the arrival of the first block. The samples of the first
+        block were collected before that, so they are left out: counting them over a time span
+        that does not include their collection would overstate the rate, most for short runs.
+
+        :return: samples per second after the first block, 0 before the second block
+        """
+        if self.first_write_time is None or self.last_write_time == self.first_write_time:
+            return 0.0
+        return (self.total_samples - self.first_block_samples) / (self.last_write_time - self.first_write_time)
+
+    def print_summary(self):
+        """Output totals and rates (after the first block, see get_sample_rate) to console."""
+        print(f"{self.total_samples} samples in {self.total_blocks} blocks, {self.get_sample_rate():.1f} samples/s after the first block")
+
+    def close(self):
+        """Flush the output stream."""
+        self.stream.flush()
+
+class ConsoleTableSink(SampledDataSink):
+    """Console table output, same layout as the sampler example output."""
+    def __init__(self, address_names: list, stream=None):
+        super().__init__(stream)
+        self.address_names = address_names
+        self.header_printed = False
+
+    def reset(self):
+        super().reset()
+        self.reset_header()
+
+    def reset_header(self):
+        """Print the header again before the next block."""
+        self.header_printed = False
+
+    def format(self, sampled_data_array: np.ndarray) -> str:
+        text = ""
+
+        # generate header once
+        if not self.header_printed:
+            header_line = "------------------------------------------------------------"
+            header = f"{'Iteration':<10}{'Sample':<10}"
+            for address_name in self.address_names:
+                address_name = f"[{address_name}]"
+                header += f"{address_name:<14}{'Time':<8}"
+            text = "\n".join([header_line, header, header_line]) + "\n"
+            self.header_printed = True
+
+        columns = [
+            to_string_column(sampled_data_array['iteration'], 10),
+            to_string_column(sampled_data_array['sample'], 10)
+        ]
+        for name in sampled_data_array.dtype['value'].names:
+            columns.append(to_string_column(sampled_data_array['value'][name], 14))
+            columns.append(to_string_column(sampled_data_array['time'][name], 8))
+
+        return text + "\n".join(join_columns(columns).tolist()) + "\n"
+
+class DelimitedSink(SampledDataSink):
+    """Delimiter separated output (CSV, TSV), with a header line before the first block."""
+    def __init__(self, stream=None, delimiter: str = ","):
+        super().__init__(stream)
+        self.delimiter = delimiter
+        self.header_written = False
+
+    def format(self, sampled_data_array: np.ndarray) -> str:
+        text = ""
+        value_names = sampled_data_array.dtype['value'].names
+
+        if not self.header_written:
+            header = ["iteration", "sample"]
+            for name in value_names:
+                header += [name, f"{name}_time"]
+            text = self.delimiter.join(header) + "\n"
+            self.header_written = True
+
+        columns = [to_string_column(sampled_data_array['iteration']), to_string_column(sampled_data_array['sample'])]
+        for name in value_names:
+            columns.append(to_string_column(sampled_data_array['value'][name]))
+            columns.append(to_string_column(sampled_data_array['time'][name]))
+
+        return text + "\n".join(join_columns(columns, self.delimiter).tolist()) + "\n"
+
+class CsvSink(DelimitedSink):
+    """Comma separated output."""
+    def __init__(self, stream=None):
+        super().__init__(stream, ",")
+
+class TsvSink(DelimitedSink):
+    """Tab separated output."""
+    def __init__(self, stream=None):
+        super().__init__(stream, "\t")
+
+class JsonLinesSink(SampledDataSink):
+    """JSON lines output, one object per sample."""
+    def format(self, sampled_data_array: np.ndarray) -> str:
+        value_names = sampled_data_array.dtype['value'].names
+
+        # all fields are numbers, so the objects can be assembled column wise
+        columns = ['{"iteration":', to_string_column(sampled_data_array['iteration']),
+                   ',"sample":', to_string_column(sampled_data_array['sample']), ',"values":{']
+        for index, name in enumerate(value_names):
+            separator = "," if index > 0 else ""
+            columns += [f'{separator}"{name}":', to_string_column(sampled_data_array['value'][name])]
+        columns.append('},"times":{')
+        for index, name in enumerate(value_names):
+            separator = "," if index > 0 else ""
+            columns += [f'{separator}"{name}":', to_string_column(sampled_data_array['time'][name])]
+        columns.append("}}")
+
+        return "\n".join(join_columns(columns).tolist()) + "\n"
+
+class QuietSink(SampledDataSink):
+    """No output per block, only totals and rates (see print_summary)."""
+    pass
+
+def create_sink(sink_type: str, address_names: list, stream=None) -> SampledDataSink:
+    """Create a sink by name.
+
+    :param sink_type: One of 'console', 'csv', 'tsv', 'jsonl' or 'quiet'
+    :param address_names: Names of the tracked addresses (used by the console table)
+    :param stream: The output stream (optional, default: sys.stdout)
+    :return: the sink
+    """
+    if sink_type == "console":
+        return ConsoleTableSink(address_names, stream)
+    elif sink_type == "csv":
+        return CsvSink(stream)
+    elif sink_type == "tsv":
+        return TsvSink(stream)
+    elif sink_type == "jsonl":
+        return JsonLinesSink(stream)
+    elif sink_type == "quiet":
+        return QuietSink(stream)
+    else:
+        raise Exception(f"create_sink: unknown sink type '{sink_type}'")
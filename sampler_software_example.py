@@ -0,0 +1,283 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   sampler_software_example.py
+#
+# @brief  Definition of the host-side software sampler engine
+#
+
+import threading
+import time
+import numpy as np
+from sampler_example import SamplerExample, SpscRingBuffer, RAW_VALUE_MASK, SAMPLER_FINISH_MARGIN_SECONDS
+from sampler_statistics_example import RunningStatistics
+from menu_utils import sleep_until
+from nanotec_nanolib import Nanolib
+
+class SoftwareSampler:
+    """Host-side sampler reading the tracked addresses of a SamplerExample periodically.
+
+    A scheduler thread computes absolute deadlines from time.perf_counter (no drift),
+    sleeps until shortly before a deadline and spins for the rest. At every deadline all
+    tracked addresses are read back to back in batches: tracked addresses sharing an OD index
+    are read with one readNumberArray call, the others with one readNumber call each (see
+    get_read_batches). Each batch is timestamped once with the host monotonic clock (ms since
+    start, like collectTimeMsec), after its read. Samples are collected into
+    blocks of the same structured array format as SamplerExample.get_sampled_data_array,
+    so sinks, statistics and the timing analyzer work unchanged.
+
+    Deadlines missed by more than one period are skipped (and counted), so the timing
+    analyzer reports them as gaps instead of the sampler running late.
+    """
+    def __init__(self, sampler_example: SamplerExample, samples_per_block: int = 32, max_buffered_blocks: int = 64):
+        if samples_per_block < 1:
+            raise Exception("SoftwareSampler: samples per block must be at least 1")
+
+        self.sampler_example = sampler_example
+        self.samples_per_block = samples_per_block
+        self.max_buffered_blocks = max_buffered_blocks
+        self.blocks_buffer = SpscRingBuffer(max_buffered_blocks) # new block is dropped if full, see SpscRingBuffer
+        self.condition = threading.Condition()
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.is_sampler_active = False
+        self.last_error = ""
+
+        self.scheduling_latency = RunningStatistics() # deadline to start of the first read (ms)
+        self.read_duration = RunningStatistics() # duration of reading all tracked addresses (ms)
+        self.missed_deadlines = 0
+        self.total_samples = 0
+
+    @property
+    def dropped_blocks(self) -> int:
+        """Number of blocks dropped because the consumer fell behind."""
+        return self.blocks_buffer.dropped
+
+    def start(self, duration_milliseconds: int = None):
+        """Start the scheduler thread.
+
+        :param duration_milliseconds: Sampling duration, 0 runs until stopped (optional, default: duration of the sampler example)
+        """
+        if self.is_sampler_active:
+            raise Exception("SoftwareSampler: already started")
+
+        if duration_milliseconds is None:
+            duration_milliseconds = self.sampler_example.duration_milliseconds
+
+        self.sampler_example.sink.reset()
+        self.sampler_example.converter.reset()
+        self.blocks_buffer = SpscRingBuffer(self.max_buffered_blocks)
+        self.stop_event.clear()
+        self.last_error = ""
+        self.is_sampler_active = True
+
+        self.thread = threading.Thread(target=self.run, args=(duration_milliseconds,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling, already sampled data is still delivered."""
+        self.stop_event.set()
+
+    def wait_until_finished(self, timeout: float = None) -> bool:
+        """Wait for the scheduler thread to end.
+
+        :param timeout: Timeout in seconds (optional)
+        :return: True if finished
+        """
+        if self.thread is not None:
+            self.thread.join(timeout)
+        return not self.is_sampler_active
+
+    @staticmethod
+    def get_read_batches(tracked_addresses) -> list:
+        """Group the tracked addresses into read batches, one batch per OD index.
+
+        :param tracked_addresses: The tracked addresses
+        :return: list of (index, od_index, columns, subindices), od_index is None for an array
+                 batch (several tracked addresses of the index, read with readNumberArray)
+        """
+        columns_per_index = {}
+        for column, tracked_address in enumerate(tracked_addresses):
+            columns_per_index.setdefault(tracked_address.getIndex(), []).append(column)
+
+        read_batches = []
+        for index, columns in columns_per_index.items():
+            subindices = [tracked_addresses[column].getSubIndex() for column in columns]
+            od_index = tracked_addresses[columns[0]] if len(columns) == 1 else None
+            read_batches.append((index, od_index, columns, subindices))
+        return read_batches
+
+    def read_batch(self, read_batch) -> list:
+        """Read the values of one read batch (see get_read_batches).
+
+        :param read_batch: The read batch
+        :return: the raw values in the order of the batch columns
+        """
+        ctx = self.sampler_example.ctx
+        device_handle = self.sampler_example.device_handle
+        index, od_index, columns, subindices = read_batch
+
+        if od_index is not None:
+            read_result: Nanolib.ResultInt = ctx.nanolib_accessor.readNumber(device_handle, od_index)
+            if read_result.hasError():
+                raise Exception("SoftwareSampler: " + read_result.getError())
+            return [read_result.getResult()]
+
+        # element n of the array is subindex n
+        read_result: Nanolib.ResultArrayInt = ctx.nanolib_accessor.readNumberArray(device_handle, index)
+        if read_result.hasError():
+            raise Exception(f"SoftwareSampler ({index:04X}): {read_result.getError()}")
+        array = read_result.getResult()
+        values = []
+        for subindex in subindices:
+            if subindex >= len(array):
+                raise Exception(f"SoftwareSampler ({index:04X}:{subindex:02X}): not in array of {len(array)} elements")
+            values.append(array[subindex])
+        return values
+
+    def run(self, duration_milliseconds: int):
+        """Scheduler thread."""
+        tracked_addresses = list(self.sampler_example.tracked_addresses)
+        number_of_tracked_addresses = len(tracked_addresses)
+        read_batches = self.get_read_batches(tracked_addresses)
+        period = self.sampler_example.period_milliseconds / 1000.0
+
+        raw_values = np.empty((self.samples_per_block, number_of_tracked_addresses), dtype=np.uint64) # 64-bit two's complement
+        raw_times = np.empty((self.samples_per_block, number_of_tracked_addresses), dtype=np.uint64)
+        latencies = np.empty(self.samples_per_block, dtype=np.float64)
+        read_durations = np.empty(self.samples_per_block, dtype=np.float64)
+        row = 0
+
+        start_time = time.perf_counter()
+        end_time = start_time + duration_milliseconds / 1000.0 if duration_milliseconds > 0 else None
+        tick = 0
+
+        try:
+            while not self.stop_event.is_set():
+                deadline = start_time + tick * period
+                if end_time is not None and deadline >= end_time:
+                    break
+
+                if not sleep_until(deadline, self.stop_event):
+                    break
+
+                read_start = time.perf_counter()
+                latencies[row] = (read_start - deadline) * 1000.0
+
+                # read all tracked addresses, one timestamp per batch
+                for read_batch in read_batches:
+                    values = self.read_batch(read_batch)
+                    collect_time = int((time.perf_counter() - start_time) * 1000.0)
+                    for column, value in zip(read_batch[2], values):
+                        raw_values[row, column] = value & RAW_VALUE_MASK
+                        raw_times[row, column] = collect_time
+
+                now = time.perf_counter()
+                read_durations[row] = (now - read_start) * 1000.0
+                row += 1
+
+                if row == self.samples_per_block:
+                    self.emit_block(raw_values[:row], raw_times[:row], latencies[:row], read_durations[:row])
+                    row = 0
+
+                # next deadline, skip deadlines already missed
+                tick += 1
+                next_tick = int((now - start_time) / period)
+                if next_tick > tick:
+                    self.missed_deadlines += next_tick - tick
+                    tick = next_tick
+        except Exception as exception:
+            self.last_error = str(exception)
+        finally:
+            if row > 0:
+                self.emit_block(raw_values[:row], raw_times[:row], latencies[:row], read_durations[:row])
+            with self.condition:
+                self.is_sampler_active = False
+                self.condition.notify_all()
+
+    def emit_block(self, raw_values: np.ndarray, raw_times: np.ndarray, latencies: np.ndarray, read_durations: np.ndarray):
+        """Convert collected samples into a block and hand it to the consumer."""
+        self.scheduling_latency.update(latencies)
+        self.read_duration.update(read_durations)
+
+        converter = self.sampler_example.converter
+        block = np.empty(len(raw_values), dtype=converter.dtype)
+        block['iteration'] = 0
+        block['sample'] = np.arange(converter.sample_number, converter.sample_number + len(raw_values), dtype=np.uint64)
+        converter.sample_number += len(raw_values)
+        for column, name in enumerate(converter.dtype['value'].names):
+            block['value'][name] = raw_values[:, column].astype(converter.data_types[column], casting='unsafe')
+            block['time'][name] = raw_times[:, column]
+
+        self.total_samples += len(block)
+        with self.condition:
+            self.blocks_buffer.push(block)
+            self.condition.notify_all()
+
+    def blocks(self):
+        """Generator yielding the sampled data blocks, ends after the sampler finished and all data is drained."""
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: len(self.blocks_buffer) > 0 or not self.is_sampler_active)
+                if len(self.blocks_buffer) == 0:
+                    break
+                block = self.blocks_buffer.pop()
+
+            self.sampler_example.sample_number = self.sampler_example.converter.sample_number
+            yield block
+
+    def __iter__(self):
+        return self.blocks()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        # the scheduler ends at the next deadline at the latest
+        self.wait_until_finished(self.sampler_example.period_milliseconds / 1000.0 + SAMPLER_FINISH_MARGIN_SECONDS)
+
+    def get_statistics(self) -> dict:
+        """Get the scheduling statistics.
+
+        :return: dictionary of statistic name and value
+        """
+        return {
+            "samples": self.total_samples,
+            "missed_deadlines": self.missed_deadlines,
+            "dropped_blocks": self.dropped_blocks,
+            "latency_mean_ms": self.scheduling_latency.mean,
+            "latency_max_ms": self.scheduling_latency.maximum if self.scheduling_latency.count > 0 else 0.0,
+            "latency_std_ms": self.scheduling_latency.std,
+            "read_mean_ms": self.read_duration.mean,
+            "read_max_ms": self.read_duration.maximum if self.read_duration.count > 0 else 0.0,
+        }
+
+    def print_statistics(self):
+        """Output the scheduling statistics to console."""
+        print("Software sampler statistics:")
+        for name, value in self.get_statistics().items():
+            print(f"- {name:<20}{value:g}")
+        if self.last_error:
+            print(f"Software sampler failed with error: {self.last_error}")
@@ -0,0 +1,268 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   sampler_statistics_example.py
+#
+# @brief  Definition of incremental statistics and downsampling stages for sampled data
+#
+
+import collections
+import math
+from abc import ABC, abstractmethod
+import numpy as np
+from sampler_sink_example import SampledDataSink
+
+class RunningStatistics:
+    """Incremental min/max/mean/std of one tracked address, without keeping history.
+
+    Blocks are merged with the parallel variance algorithm (Chan et al.), so an update
+    costs O(block) and the memory is constant.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0 # sum of squared deviations from the mean
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def update(self, values: np.ndarray):
+        """Merge a block of values.
+
+        :param values: The values of one tracked address
+        """
+        block_count = len(values)
+        if block_count == 0:
+            return
+
+        values = values.astype(np.float64)
+        block_mean = float(values.mean())
+        block_m2 = float(((values - block_mean) ** 2).sum())
+        self.merge(block_count, block_mean, block_m2, float(values.min()), float(values.max()))
+
+    def merge(self, count: int, mean: float, m2: float, minimum: float, maximum: float):
+        """Merge pre-aggregated statistics.
+
+        :param count: Number of values
+        :param mean: Mean of the values
+        :param m2: Sum of squared deviations from the mean
+        :param minimum: Minimum value
+        :param maximum: Maximum value
+        """
+        if count == 0:
+            return
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.minimum = min(self.minimum, minimum)
+        self.maximum = max(self.maximum, maximum)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 for less than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+class WindowStatistics:
+    """Rolling-window statistics of one tracked address with constant memory.
+
+    The window consists of the last 'number_of_buckets' buckets of 'bucket_size' samples
+    each. Every bucket only keeps its aggregates (count, mean, m2, min, max).
+    """
+    def __init__(self, bucket_size: int, number_of_buckets: int):
+        if bucket_size < 1 or number_of_buckets < 1:
+            raise Exception("WindowStatistics: bucket size and number of buckets must be at least 1")
+
+        self.bucket_size = bucket_size
+        self.buckets = collections.deque(maxlen=number_of_buckets) # completed buckets
+        self.current = RunningStatistics() # bucket being filled
+
+    def update(self, values: np.ndarray):
+        """Add a block of values.
+
+        :param values: The values of one tracked address
+        """
+        start = 0
+        while start < len(values):
+            count = min(self.bucket_size - self.current.count, len(values) - start)
+            self.current.update(values[start:start + count])
+            start += count
+
+            if self.current.count == self.bucket_size:
+                self.buckets.append(self.current)
+                self.current = RunningStatistics()
+
+    def get(self) -> RunningStatistics:
+        """Get the statistics over the window (completed buckets and the current bucket).
+
+        :return: the combined statistics
+        """
+        window = RunningStatistics()
+        for bucket in list(self.buckets) + [self.current]:
+            window.merge(bucket.count, bucket.mean, bucket.m2, bucket.minimum, bucket.maximum)
+        return window
+
+class Decimator(ABC):
+    """Base class of decimating downsamplers, reducing 'factor' samples to one output bucket.
+
+    Samples not filling a complete bucket are kept until the next block.
+    """
+    def __init__(self, factor: int):
+        if factor < 1:
+            raise Exception("Decimator: factor must be at least 1")
+
+        self.factor = factor
+        self.remainder = None # incomplete bucket from the previous block
+
+    def process(self, sampled_data_array: np.ndarray) -> np.ndarray:
+        """Decimate a block of sampled data.
+
+        :param sampled_data_array: The converted sampled data
+        :return: the decimated sampled data (may be empty)
+        """
+        if self.remainder is not None and len(self.remainder) > 0:
+            sampled_data_array = np.concatenate([self.remainder, sampled_data_array])
+
+        number_of_buckets = len(sampled_data_array) // self.factor
+        complete = number_of_buckets * self.factor
+        self.remainder = sampled_data_array[complete:].copy()
+
+        return self.reduce(sampled_data_array[:complete].reshape(number_of_buckets, self.factor))
+
+    def reset(self):
+        """Discard the incomplete bucket, called on sampler (re-)start."""
+        self.remainder = None
+
+    @abstractmethod
+    def reduce(self, buckets: np.ndarray) -> np.ndarray:
+        """Reduce complete buckets (shape: number of buckets x factor)."""
+
+class MeanDecimator(Decimator):
+    """Mean downsampler, one output sample per bucket (values as float64)."""
+    def reduce(self, buckets: np.ndarray) -> np.ndarray:
+        value_names = buckets.dtype['value'].names
+        dtype = np.dtype([
+            ('iteration', np.uint64),
+            ('sample', np.uint64),
+            ('value', [(name, np.float64) for name in value_names]),
+            ('time', buckets.dtype['time'])
+        ])
+
+        # iteration, sample number and time of the last sample of a bucket
+        result = np.empty(len(buckets), dtype=dtype)
+        result['iteration'] = buckets['iteration'][:, -1]
+        result['sample'] = buckets['sample'][:, -1]
+        result['time'] = buckets['time'][:, -1]
+        for name in value_names:
+            result['value'][name] = buckets['value'][name].mean(axis=1)
+        return result
+
+class MinMaxDecimator(Decimator):
+    """Min/max envelope downsampler, two output samples per bucket (minimum, then maximum)."""
+    def reduce(self, buckets: np.ndarray) -> np.ndarray:
+        result = np.empty(len(buckets) * 2, dtype=buckets.dtype)
+        result['iteration'][0::2] = buckets['iteration'][:, 0]
+        result['iteration'][1::2] = buckets['iteration'][:, -1]
+        result['sample'][0::2] = buckets['sample'][:, 0]
+        result['sample'][1::2] = buckets['sample'][:, -1]
+        result['time'][0::2] = buckets['time'][:, 0]
+        result['time'][1::2] = buckets['time'][:, -1]
+        for name in buckets.dtype['value'].names:
+            result['value'][name][0::2] = buckets['value'][name].min(axis=1)
+            result['value'][name][1::2] = buckets['value'][name].max(axis=1)
+        return result
+
+class DecimatingSink(SampledDataSink):
+    """Sink decimating sampled data and forwarding the result to a lower-rate sink."""
+    def __init__(self, decimator: Decimator, downstream: SampledDataSink):
+        super().__init__(downstream.stream)
+        self.decimator = decimator
+        self.downstream = downstream
+
+    def write(self, sampled_data_array: np.ndarray):
+        super().write(sampled_data_array)
+        decimated = self.decimator.process(sampled_data_array)
+        if len(decimated) > 0:
+            self.downstream.write(decimated)
+
+    def reset(self):
+        super().reset()
+        self.decimator.reset()
+        self.downstream.reset()
+
+    def close(self):
+        self.downstream.close()
+
+class StatisticsStage(SampledDataSink):
+    """Incremental statistics of all tracked addresses, forwarding the data to further sinks.
+
+    Keeps per-address accumulators over the whole capture and over a rolling window,
+    memory is constant regardless of the capture length.
+    """
+    def __init__(self, downstream: list = None, window_bucket_size: int = 100, window_buckets: int = 10):
+        super().__init__()
+        self.downstream = downstream or []
+        self.window_bucket_size = window_bucket_size
+        self.window_buckets = window_buckets
+        self.statistics = {} # address name -> RunningStatistics
+        self.window_statistics = {} # address name -> WindowStatistics
+
+    def write(self, sampled_data_array: np.ndarray):
+        super().write(sampled_data_array)
+
+        for name in sampled_data_array.dtype['value'].names:
+            if name not in self.statistics:
+                self.statistics[name] = RunningStatistics()
+                self.window_statistics[name] = WindowStatistics(self.window_bucket_size, self.window_buckets)
+            values = sampled_data_array['value'][name]
+            self.statistics[name].update(values)
+            self.window_statistics[name].update(values)
+
+        for sink in self.downstream:
+            sink.write(sampled_data_array)
+
+    def reset(self):
+        super().reset()
+        for sink in self.downstream:
+            sink.reset()
+
+    def close(self):
+        for sink in self.downstream:
+            sink.close()
+
+    def print_summary(self):
+        """Output totals and per-address statistics (overall and rolling window) to console."""
+        super().print_summary()
+
+        header = f"{'Address':<14}{'Count':<12}{'Min':<14}{'Max':<14}{'Mean':<14}{'Std':<14}{'Window mean':<14}{'Window std':<14}"
+        print(header)
+        for name, statistics in self.statistics.items():
+            window = self.window_statistics[name].get()
+            print(f"{name:<14}{statistics.count:<12}{statistics.minimum:<14g}{statistics.maximum:<14g}"
+                  f"{statistics.mean:<14.4f}{statistics.std:<14.4f}{window.mean:<14.4f}{window.std:<14.4f}")
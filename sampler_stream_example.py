@@ -0,0 +1,238 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   sampler_stream_example.py
+#
+# @brief  Definition of sampler streaming classes (sync and async iteration)
+#
+
+import asyncio
+import threading
+from sampler_example import SamplerExample, SamplerBufferNotify
+from nanotec_nanolib import Nanolib
+
+class SamplerStreamNotify(SamplerBufferNotify):
+    """Implementation class of Nanolib.SamplerNotify, buffering sampled data blocks for a stream.
+
+    The consumer of the stream takes the blocks from the ring buffer (see SamplerBufferNotify).
+    """
+    def __init__(self, max_buffered_blocks: int = 64):
+        super().__init__(max_buffered_blocks)
+        self.is_sampler_active = True
+        self.wakeup = None # optional callable, invoked after every notification (e.g. asyncio wakeup)
+        self.data_available = threading.Condition()
+
+    def on_notify(self, state_changed: bool):
+        with self.data_available:
+            if self.is_notify_finished:
+                # It's now safe to destroy (this) notification object
+                self.is_sampler_active = False
+            self.data_available.notify_all()
+
+        wakeup = self.wakeup
+        if wakeup is not None:
+            wakeup()
+
+    def get_block(self, timeout: float = None):
+        """Get the next buffered block, waiting until data arrives or the sampler finished.
+
+        :param timeout: Maximum wait time in seconds (optional, wait forever if not set)
+        :return: the oldest buffered Nanolib.SampleDataVector or None (timeout or sampler finished)
+        """
+        with self.data_available:
+            self.data_available.wait_for(lambda: len(self.ring_buffer) > 0 or not self.is_sampler_active, timeout)
+            item = self.ring_buffer.pop()
+        return item[1] if item is not None else None
+
+    def is_drained(self) -> bool:
+        """Check if the sampler finished and all buffered blocks have been consumed.
+
+        :return: True if nothing more will be delivered
+        """
+        with self.data_available:
+            return not self.is_sampler_active and len(self.ring_buffer) == 0
+
+class SamplerStream:
+    """Streaming access to a sampler, yields sampled data blocks as they are notified.
+
+    Usage (sync):
+        with SamplerStream(sampler_example) as stream:
+            for block in stream:
+                ...
+                stream.stop() # optional, the remaining data is drained afterwards
+
+    Usage (async):
+        async with SamplerStream(sampler_example) as stream:
+            async for block in stream:
+                ...
+    """
+    def __init__(self, sampler_example: SamplerExample, mode=Nanolib.SamplerMode_Continuous, max_buffered_blocks: int = 64, as_array: bool = True):
+        if not isinstance(sampler_example, SamplerExample):
+            raise Exception("Invalid SamplerExample Object")
+
+        self.sampler_example = sampler_example
+        self.mode = mode
+        self.max_buffered_blocks = max_buffered_blocks
+        self.as_array = as_array # yield numpy arrays (see SamplerExample.get_sampled_data_array) or raw Nanolib.SampleDataVector
+        self.sampler_notify: SamplerStreamNotify = None
+        self.stop_requested = False
+
+    def start(self):
+        """Configure and start the sampler with a stream notification."""
+        self.stop_requested = False
+        self.sampler_notify = SamplerStreamNotify(self.max_buffered_blocks)
+        self.sampler_example.configure(self.mode, force=False)
+        self.sampler_example.start(self.sampler_notify)
+
+    def stop(self):
+        """Request the sampler to stop. Iteration ends after the remaining data is drained."""
+        if self.stop_requested or self.sampler_notify is None or not self.sampler_notify.is_sampler_active:
+            return
+
+        self.stop_requested = True
+        stop_result: Nanolib.ResultVoid = self.sampler_example.sampler_interface.stop(self.sampler_example.device_handle)
+        if stop_result.hasError():
+            raise Exception("sampler_interface.stop:" + " " + str(stop_result.getError()))
+
+    def wait_until_finished(self, timeout: float = None) -> bool:
+        """Wait until the sampler reports a final state (Completed, Cancelled or Failed).
+
+        :param timeout: Maximum wait time in seconds (optional)
+        :return: True if the sampler finished
+        """
+        sampler_notify = self.sampler_notify
+        with sampler_notify.data_available:
+            return sampler_notify.data_available.wait_for(lambda: not sampler_notify.is_sampler_active, timeout)
+
+    def finish(self) -> bool:
+        """Stop the sampler (if still active) and wait (bounded, see SamplerExample.get_finish_timeout) until it finished.
+
+        :return: True if finished, False on timeout (a message is output to console)
+        """
+        self.stop()
+        timeout = self.sampler_example.get_finish_timeout()
+        if self.wait_until_finished(timeout):
+            return True
+
+        print(f"Sampler not finished within {timeout:g} s")
+        return False
+
+    async def async_finish(self) -> bool:
+        """Async version of finish."""
+        self.stop()
+        timeout = self.sampler_example.get_finish_timeout()
+        if await asyncio.get_running_loop().run_in_executor(None, self.wait_until_finished, timeout):
+            return True
+
+        print(f"Sampler not finished within {timeout:g} s")
+        return False
+
+    @property
+    def dropped_blocks(self) -> int:
+        """Number of blocks dropped because the consumer fell behind."""
+        return self.sampler_notify.dropped_blocks if self.sampler_notify else 0
+
+    def _convert(self, sample_datas):
+        """Convert a buffered block to the output format."""
+        if self.as_array:
+            return self.sampler_example.get_sampled_data_array(sample_datas)
+        return sample_datas
+
+    def _check_failed(self):
+        """Raise if the sampler execution failed."""
+        if self.sampler_notify.samplerState == Nanolib.SamplerState_Failed:
+            raise Exception("Sampler execution failed with error: " + self.sampler_notify.last_error)
+
+    def blocks(self):
+        """Generator yielding sampled data blocks until the sampler finished and all data is drained."""
+        if self.sampler_notify is None:
+            self.start()
+
+        sampler_notify = self.sampler_notify
+        # a started sampler delivers data or finishes within this time
+        timeout = self.sampler_example.get_finish_timeout()
+        try:
+            while not sampler_notify.is_drained():
+                sample_datas = sampler_notify.get_block(timeout)
+                if sample_datas is not None:
+                    yield self._convert(sample_datas)
+                elif not sampler_notify.is_drained():
+                    raise Exception(f"SamplerStream: no data from the sampler within {timeout:g} s")
+        finally:
+            # Consumer left early - stop the sampler, the notify object must live until it finished
+            if sampler_notify.is_sampler_active:
+                self.finish()
+
+        self._check_failed()
+
+    async def async_blocks(self):
+        """Async generator yielding sampled data blocks, woken up by the notify callback."""
+        if self.sampler_notify is None:
+            self.start()
+
+        sampler_notify = self.sampler_notify
+        loop = asyncio.get_running_loop()
+        data_event = asyncio.Event()
+        sampler_notify.wakeup = lambda: loop.call_soon_threadsafe(data_event.set)
+        timeout = self.sampler_example.get_finish_timeout()
+        try:
+            while not sampler_notify.is_drained():
+                data_event.clear()
+                sample_datas = sampler_notify.get_block(timeout=0)
+                if sample_datas is None:
+                    try:
+                        await asyncio.wait_for(data_event.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        raise Exception(f"SamplerStream: no data from the sampler within {timeout:g} s")
+                    continue
+                yield self._convert(sample_datas)
+        finally:
+            sampler_notify.wakeup = None
+            if sampler_notify.is_sampler_active:
+                await self.async_finish()
+
+        self._check_failed()
+
+    def __iter__(self):
+        return self.blocks()
+
+    def __aiter__(self):
+        return self.async_blocks()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.sampler_notify is not None:
+            self.finish()
+        return False
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.sampler_notify is not None:
+            await self.async_finish()
+        return False
@@ -0,0 +1,213 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   sampler_timing_example.py
+#
+# @brief  Definition of the timing-quality analyzer for sampled data (gaps, overruns, jitter)
+#
+
+import numpy as np
+from sampler_statistics_example import RunningStatistics
+from nanotec_nanolib import Nanolib
+
+# Default overrun tolerance: collect times have a resolution of 1 ms, and the sample interval
+# varies with the device scheduling, so only intervals beyond the larger of both count as overrun
+DEFAULT_OVERRUN_TOLERANCE_MILLISECONDS = 1.0
+DEFAULT_OVERRUN_TOLERANCE_FACTOR = 0.1 # share of the period
+
+def get_default_overrun_tolerance(period_milliseconds: int) -> float:
+    """Get the default overrun tolerance for a sample period.
+
+    :param period_milliseconds: The sample period in ms
+    :return: the tolerance in ms
+    """
+    return max(DEFAULT_OVERRUN_TOLERANCE_MILLISECONDS, DEFAULT_OVERRUN_TOLERANCE_FACTOR * period_milliseconds)
+
+class SampleTimingAnalyzer:
+    """Timing quality of sampled data, based on the collectTimeMsec of the samples.
+
+    Detects missing samples, period overruns, duplicate samples/iterations and timestamp
+    jitter across blocks and iterations. Every block is analyzed vectorized, only counters,
+    a jitter histogram and the last sample of the previous block are kept.
+    """
+    def __init__(self, period_milliseconds: int, overrun_tolerance_milliseconds: float = None, jitter_bin_edges=None):
+        if overrun_tolerance_milliseconds is None:
+            overrun_tolerance_milliseconds = get_default_overrun_tolerance(period_milliseconds)
+
+        self.period_milliseconds = period_milliseconds
+        self.overrun_tolerance_milliseconds = overrun_tolerance_milliseconds
+        if jitter_bin_edges is None:
+            # jitter (deviation from the period) in ms, outer bins catch everything beyond
+            jitter_bin_edges = [-np.inf, -10, -5, -2, -1, -0.5, 0.5, 1, 2, 5, 10, np.inf]
+        self.jitter_bin_edges = np.asarray(jitter_bin_edges, dtype=np.float64)
+        self.jitter_histogram = np.zeros(len(self.jitter_bin_edges) - 1, dtype=np.int64)
+        self.jitter = RunningStatistics()
+        self.collection_spread = RunningStatistics() # time between first and last tracked address of a sample
+
+        self.samples = 0
+        self.blocks = 0
+        self.missing_samples = 0
+        self.gaps = 0 # number of gaps with missing samples
+        self.overruns = 0 # intervals longer than period + tolerance
+        self.duplicate_samples = 0 # samples with a collect time not after the previous sample
+        self.duplicate_iterations = 0 # iteration numbers repeated or going backwards
+        self.missing_iterations = 0 # skipped iteration numbers
+        self.last_iteration = None
+        self.last_time = None
+
+    def update(self, sampled_data_array: np.ndarray):
+        """Analyze a block of sampled data (see SamplerExample.get_sampled_data_array).
+
+        :param sampled_data_array: The converted sampled data
+        """
+        if len(sampled_data_array) == 0:
+            return
+
+        self.blocks += 1
+        self.samples += len(sampled_data_array)
+
+        time_names = sampled_data_array.dtype['time'].names
+        times = sampled_data_array['time'][time_names[0]].astype(np.int64)
+        iterations = sampled_data_array['iteration'].astype(np.int64)
+
+        if len(time_names) > 1:
+            spread = sampled_data_array['time'][time_names[-1]].astype(np.int64) - times
+            self.collection_spread.update(spread)
+
+        # continue with the last sample of the previous block
+        if self.last_time is not None:
+            times = np.concatenate([[self.last_time], times])
+            iterations = np.concatenate([[self.last_iteration], iterations])
+
+        self.last_time = int(times[-1])
+        self.last_iteration = int(iterations[-1])
+
+        if len(times) < 2:
+            return
+
+        # iteration changes
+        iteration_steps = np.diff(iterations)
+        self.duplicate_iterations += int(np.count_nonzero(iteration_steps < 0))
+        self.missing_iterations += int((iteration_steps[iteration_steps > 1] - 1).sum())
+
+        # intervals within the same iteration
+        intervals = np.diff(times)[iteration_steps == 0].astype(np.float64)
+        if len(intervals) == 0:
+            return
+
+        self.duplicate_samples += int(np.count_nonzero(intervals <= 0))
+        self.overruns += int(np.count_nonzero(intervals > self.period_milliseconds + self.overrun_tolerance_milliseconds))
+
+        missing = np.rint(intervals / self.period_milliseconds) - 1
+        missing = missing[missing > 0]
+        self.gaps += len(missing)
+        self.missing_samples += int(missing.sum())
+
+        # jitter of regular intervals (gaps excluded)
+        regular = intervals[(intervals > 0) & (intervals < 1.5 * self.period_milliseconds)]
+        jitter = regular - self.period_milliseconds
+        self.jitter.update(jitter)
+        self.jitter_histogram += np.histogram(jitter, bins=self.jitter_bin_edges)[0]
+
+    def is_degraded(self) -> bool:
+        """Check if the capture is degraded (samples lost, duplicated or iterations skipped).
+
+        :return: True if degraded
+        """
+        return (self.missing_samples > 0) or (self.duplicate_samples > 0) or \
+            (self.duplicate_iterations > 0) or (self.missing_iterations > 0)
+
+    def get_counters(self) -> dict:
+        """Get all counters.
+
+        :return: dictionary of counter name and value
+        """
+        return {
+            "samples": self.samples,
+            "blocks": self.blocks,
+            "missing_samples": self.missing_samples,
+            "gaps": self.gaps,
+            "overruns": self.overruns,
+            "duplicate_samples": self.duplicate_samples,
+            "duplicate_iterations": self.duplicate_iterations,
+            "missing_iterations": self.missing_iterations,
+        }
+
+    def print_report(self, title: str = ""):
+        """Output counters and jitter histogram to console.
+
+        :param title: Title line, e.g. the device (optional)
+        """
+        if title:
+            print(title)
+
+        state = "DEGRADED" if self.is_degraded() else "OK"
+        print(f"Timing quality: {state} (period {self.period_milliseconds} ms)")
+        for name, value in self.get_counters().items():
+            print(f"- {name:<24}{value}")
+
+        if self.jitter.count > 0:
+            print(f"- {'jitter [ms]':<24}min {self.jitter.minimum:g}, max {self.jitter.maximum:g}, "
+                  f"mean {self.jitter.mean:.3f}, std {self.jitter.std:.3f}")
+        if self.collection_spread.count > 0:
+            print(f"- {'collection spread [ms]':<24}max {self.collection_spread.maximum:g}, mean {self.collection_spread.mean:.3f}")
+
+        print("Jitter histogram [ms]:")
+        for index, count in enumerate(self.jitter_histogram):
+            low = self.jitter_bin_edges[index]
+            high = self.jitter_bin_edges[index + 1]
+            print(f"  {f'[{low:g}, {high:g})':<16}{count}")
+
+class DeviceTimingMonitor:
+    """Timing analyzers per device, e.g. for orchestrated multi-device captures."""
+    def __init__(self, period_milliseconds: int, overrun_tolerance_milliseconds: float = None):
+        self.period_milliseconds = period_milliseconds
+        self.overrun_tolerance_milliseconds = overrun_tolerance_milliseconds
+        self.analyzers = [] # list of (device handle, SampleTimingAnalyzer)
+
+    def get_analyzer(self, device_handle: Nanolib.DeviceHandle) -> SampleTimingAnalyzer:
+        """Get (or create) the analyzer of a device.
+
+        :param device_handle: The device handle
+        :return: the analyzer
+        """
+        for analyzer_device_handle, analyzer in self.analyzers:
+            if analyzer_device_handle.equals(device_handle):
+                return analyzer
+
+        analyzer = SampleTimingAnalyzer(self.period_milliseconds, self.overrun_tolerance_milliseconds)
+        self.analyzers.append((device_handle, analyzer))
+        return analyzer
+
+    def update(self, device_handle: Nanolib.DeviceHandle, sampled_data_array: np.ndarray):
+        """Analyze a block of sampled data of a device.
+
+        :param device_handle: The device handle
+        :param sampled_data_array: The converted sampled data
+        """
+        self.get_analyzer(device_handle).update(sampled_data_array)
+
+    def print_report(self):
+        """Output the report of every device to console."""
+        for device_handle, analyzer in self.analyzers:
+            analyzer.print_report(f"\nDevice {device_handle.toString()}:")
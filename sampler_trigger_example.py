@@ -0,0 +1,485 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   sampler_trigger_example.py
+#
+# @brief  Definition of the host-side composite trigger engine for sampled data
+#
+
+import ast
+import operator
+from abc import ABC, abstractmethod
+import numpy as np
+from sampler_sink_example import SampledDataSink
+
+class TriggerCondition(ABC):
+    """Base class of trigger conditions, evaluated vectorized on blocks of sampled data.
+
+    Conditions are combined with & (and), | (or) and ~ (not), or compiled from a text
+    expression with compile_trigger.
+    """
+    @abstractmethod
+    def evaluate(self, sampled_data_array: np.ndarray) -> np.ndarray:
+        """Evaluate the condition for every sample of a block.
+
+        :param sampled_data_array: The converted sampled data
+        :return: boolean array, one entry per sample
+        """
+
+    def reset(self):
+        """Forget the state of previous blocks (e.g. on sampler start)."""
+        pass
+
+    def __and__(self, other):
+        return AndCondition(self, other)
+
+    def __or__(self, other):
+        return OrCondition(self, other)
+
+    def __invert__(self):
+        return NotCondition(self)
+
+class CompareCondition(TriggerCondition):
+    """Comparison of a tracked address with a constant."""
+    OPERATORS = {
+        ">": operator.gt,
+        ">=": operator.ge,
+        "<": operator.lt,
+        "<=": operator.le,
+        "==": operator.eq,
+        "!=": operator.ne,
+    }
+
+    def __init__(self, address_name: str, comparison: str, value):
+        if comparison not in self.OPERATORS:
+            raise Exception(f"CompareCondition: unknown comparison '{comparison}'")
+
+        self.address_name = address_name
+        self.comparison = self.OPERATORS[comparison]
+        self.value = value
+
+    def evaluate(self, sampled_data_array: np.ndarray) -> np.ndarray:
+        return self.comparison(sampled_data_array['value'][self.address_name], self.value)
+
+class WindowCondition(TriggerCondition):
+    """Value of a tracked address inside [low, high] (or outside, if inside is False)."""
+    def __init__(self, address_name: str, low, high, inside: bool = True):
+        self.address_name = address_name
+        self.low = low
+        self.high = high
+        self.inside = inside
+
+    def evaluate(self, sampled_data_array: np.ndarray) -> np.ndarray:
+        values = sampled_data_array['value'][self.address_name]
+        mask = (values >= self.low) & (values <= self.high)
+        return mask if self.inside else ~mask
+
+class EdgeCondition(TriggerCondition):
+    """Crossing of a level by a tracked address (rising, falling or both).
+
+    True for the first sample at or above (rising) / below (falling) the level. The last
+    value of the previous block is kept, so crossings between blocks are detected.
+    """
+    def __init__(self, address_name: str, level, rising: bool = True, falling: bool = False):
+        self.address_name = address_name
+        self.level = level
+        self.rising = rising
+        self.falling = falling
+        self.last_above = None
+
+    def reset(self):
+        self.last_above = None
+
+    def evaluate(self, sampled_data_array: np.ndarray) -> np.ndarray:
+        above = sampled_data_array['value'][self.address_name] >= self.level
+        if len(above) == 0:
+            return above
+
+        # the first sample of the first block has no predecessor, it never is an edge
+        previous = np.empty_like(above)
+        previous[0] = above[0] if self.last_above is None else self.last_above
+        previous[1:] = above[:-1]
+        self.last_above = bool(above[-1])
+
+        mask = np.zeros(len(above), dtype=bool)
+        if self.rising:
+            mask |= above & ~previous
+        if self.falling:
+            mask |= ~above & previous
+        return mask
+
+class AndCondition(TriggerCondition):
+    """All conditions true."""
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def reset(self):
+        for condition in self.conditions:
+            condition.reset()
+
+    def evaluate(self, sampled_data_array: np.ndarray) -> np.ndarray:
+        # evaluate all conditions, edge conditions must see every block
+        masks = [condition.evaluate(sampled_data_array) for condition in self.conditions]
+        return np.logical_and.reduce(masks)
+
+class OrCondition(AndCondition):
+    """Any condition true."""
+    def evaluate(self, sampled_data_array: np.ndarray) -> np.ndarray:
+        masks = [condition.evaluate(sampled_data_array) for condition in self.conditions]
+        return np.logical_or.reduce(masks)
+
+class NotCondition(TriggerCondition):
+    """Condition false."""
+    def __init__(self, condition: TriggerCondition):
+        self.condition = condition
+
+    def reset(self):
+        self.condition.reset()
+
+    def evaluate(self, sampled_data_array: np.ndarray) -> np.ndarray:
+        return ~self.condition.evaluate(sampled_data_array)
+
+# Functions usable in trigger expressions: name -> (number of constant arguments, factory)
+TRIGGER_FUNCTIONS = {
+    "rising": (1, lambda name, level: EdgeCondition(name, level, rising=True)),
+    "falling": (1, lambda name, level: EdgeCondition(name, level, rising=False, falling=True)),
+    "crossing": (1, lambda name, level: EdgeCondition(name, level, rising=True, falling=True)),
+    "inside": (2, lambda name, low, high: WindowCondition(name, low, high)),
+    "outside": (2, lambda name, low, high: WindowCondition(name, low, high, inside=False)),
+}
+
+COMPARE_OPERATORS = {
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+}
+
+def compile_trigger(expression: str, address_names: list) -> TriggerCondition:
+    """Compile a trigger expression into a condition tree.
+
+    Supported: comparisons of an address with a constant (e.g. 'Temperature > 40'),
+    windows as chained comparisons ('20 <= Temperature <= 40'), the functions rising,
+    falling, crossing (address, level), inside, outside (address, low, high) and the
+    operators and, or, not. The expression is parsed once, no Python code is executed.
+
+    :param expression: The trigger expression
+    :param address_names: Names of the tracked addresses
+    :return: the compiled condition
+    """
+    def constant(node):
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -constant(node.operand)
+        # numbers are ast.Num up to Python 3.7
+        value = getattr(node, 'value', getattr(node, 'n', None)) if type(node).__name__ in ("Constant", "Num") else None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        raise Exception(f"compile_trigger: number expected in '{expression}'")
+
+    def address(node):
+        if isinstance(node, ast.Name) and node.id in address_names:
+            return node.id
+        raise Exception(f"compile_trigger: tracked address name expected in '{expression}'")
+
+    def compile_node(node) -> TriggerCondition:
+        if isinstance(node, ast.BoolOp):
+            conditions = [compile_node(value) for value in node.values]
+            return AndCondition(*conditions) if isinstance(node.op, ast.And) else OrCondition(*conditions)
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return NotCondition(compile_node(node.operand))
+
+        if isinstance(node, ast.Compare):
+            operands = [node.left] + node.comparators
+            if len(node.ops) == 2 and isinstance(node.ops[0], (ast.Lt, ast.LtE)) and isinstance(node.ops[1], (ast.Lt, ast.LtE)):
+                # window: low <= address <= high (bounds inclusive)
+                return WindowCondition(address(operands[1]), constant(operands[0]), constant(operands[2]))
+            if len(node.ops) != 1 or type(node.ops[0]) not in COMPARE_OPERATORS:
+                raise Exception(f"compile_trigger: unsupported comparison in '{expression}'")
+
+            comparison = COMPARE_OPERATORS[type(node.ops[0])]
+            if isinstance(node.left, ast.Name):
+                return CompareCondition(address(node.left), comparison, constant(operands[1]))
+
+            # constant on the left side: mirror the comparison
+            mirrored = {">": "<", ">=": "<=", "<": ">", "<=": ">=", "==": "==", "!=": "!="}
+            return CompareCondition(address(operands[1]), mirrored[comparison], constant(node.left))
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in TRIGGER_FUNCTIONS:
+            number_of_constants, factory = TRIGGER_FUNCTIONS[node.func.id]
+            if len(node.args) != number_of_constants + 1 or node.keywords:
+                raise Exception(f"compile_trigger: {node.func.id} expects {number_of_constants + 1} arguments")
+            return factory(address(node.args[0]), *[constant(argument) for argument in node.args[1:]])
+
+        raise Exception(f"compile_trigger: unsupported expression '{expression}'")
+
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as error:
+        raise Exception(f"compile_trigger: invalid expression '{expression}': {error.msg}")
+
+    return compile_node(tree.body)
+
+class TriggerSegment:
+    """A recorded segment of sampled data, from start trigger to stop."""
+    def __init__(self, first_sample: np.void):
+        self.iteration = int(first_sample['iteration'])
+        self.first_sample = int(first_sample['sample'])
+        self.first_time = int(first_sample['time'][0])
+        self.last_sample = self.first_sample
+        self.last_time = self.first_time
+        self.number_of_samples = 0
+        self.is_complete = False
+
+    def add(self, sampled_data_array: np.ndarray):
+        """Add the samples of a block belonging to this segment."""
+        if len(sampled_data_array) > 0:
+            self.number_of_samples += len(sampled_data_array)
+            self.last_sample = int(sampled_data_array['sample'][-1])
+            self.last_time = int(sampled_data_array['time'][-1][0])
+
+    def __str__(self):
+        state = "" if self.is_complete else " (open)"
+        return (f"iteration {self.iteration}, samples {self.first_sample}..{self.last_sample} "
+                f"({self.number_of_samples}), time {self.first_time}..{self.last_time} ms{state}")
+
+class TriggerRecorder(SampledDataSink):
+    """Records only the segments of sampled data matching a trigger, the rest is discarded.
+
+    A segment starts at the first sample the start trigger is true. With a stop trigger,
+    the segment ends with (and includes) the first following sample the stop trigger is
+    true. Without a stop trigger, the segment lasts as long as the start trigger is true.
+    Segment data is forwarded to the downstream sinks (e.g. a file sink or CaptureWriter).
+    """
+    def __init__(self, start_trigger: TriggerCondition, stop_trigger: TriggerCondition = None, downstream: list = None):
+        super().__init__()
+        self.start_trigger = start_trigger
+        self.stop_trigger = stop_trigger
+        self.downstream = downstream or []
+        self.segments = []
+        self.recorded_samples = 0
+        self.discarded_samples = 0
+
+    @property
+    def is_recording(self) -> bool:
+        """True while a segment is open."""
+        return len(self.segments) > 0 and not self.segments[-1].is_complete
+
+    def write(self, sampled_data_array: np.ndarray):
+        super().write(sampled_data_array)
+
+        number_of_samples = len(sampled_data_array)
+        if number_of_samples == 0:
+            return
+
+        # evaluate both triggers once per block, edge conditions keep their state across blocks
+        start_mask = self.start_trigger.evaluate(sampled_data_array)
+        stop_mask = self.stop_trigger.evaluate(sampled_data_array) if self.stop_trigger else ~start_mask
+
+        position = 0
+        while position < number_of_samples:
+            if not self.is_recording:
+                hits = np.flatnonzero(start_mask[position:])
+                if len(hits) == 0:
+                    self.discarded_samples += number_of_samples - position
+                    break
+
+                self.discarded_samples += int(hits[0])
+                position += int(hits[0])
+                self.segments.append(TriggerSegment(sampled_data_array[position]))
+                # an explicit stop trigger is searched after the start sample
+                search_from = position + 1 if self.stop_trigger else position
+            else:
+                search_from = position
+
+            hits = np.flatnonzero(stop_mask[search_from:])
+            if len(hits) == 0:
+                self.forward(sampled_data_array[position:])
+                break
+
+            # the stop sample belongs to the segment with an explicit stop trigger only
+            end = search_from + int(hits[0]) + (1 if self.stop_trigger else 0)
+            self.forward(sampled_data_array[position:end])
+            self.segments[-1].is_complete = True
+            position = end
+
+    def forward(self, segment_data: np.ndarray):
+        """Add data to the open segment and write it to the downstream sinks."""
+        if len(segment_data) == 0:
+            return
+
+        self.segments[-1].add(segment_data)
+        self.recorded_samples += len(segment_data)
+        for sink in self.downstream:
+            sink.write(segment_data)
+
+    def reset(self):
+        super().reset()
+        self.start_trigger.reset()
+        if self.stop_trigger:
+            self.stop_trigger.reset()
+        for sink in self.downstream:
+            sink.reset()
+
+    def close(self):
+        for sink in self.downstream:
+            sink.close()
+
+    def print_summary(self):
+        """Output the recorded segments and totals to console."""
+        super().print_summary()
+        print(f"Recorded {self.recorded_samples} samples in {len(self.segments)} segments, discarded {self.discarded_samples} samples")
+        for index, segment in enumerate(self.segments):
+            print(f"- segment {index}: {segment}")
+
+class SampleRingBuffer:
+    """Fixed-size ring buffer of the latest samples (all tracked addresses), memory is bounded."""
+    def __init__(self, capacity: int, dtype: np.dtype):
+        self.capacity = capacity
+        self.samples = np.empty(capacity, dtype=dtype)
+        self.head = 0 # next write position
+        self.count = 0 # number of valid samples
+
+    def append(self, sampled_data_array: np.ndarray):
+        """Add a block, keeping only the latest 'capacity' samples (vectorized)."""
+        if self.capacity == 0:
+            return
+
+        sampled_data_array = sampled_data_array[-self.capacity:]
+        positions = (self.head + np.arange(len(sampled_data_array))) % self.capacity
+        self.samples[positions] = sampled_data_array
+        self.head = (self.head + len(sampled_data_array)) % self.capacity
+        self.count = min(self.count + len(sampled_data_array), self.capacity)
+
+    def get(self) -> np.ndarray:
+        """Get a copy of the buffered samples, oldest first."""
+        start = (self.head - self.count) % self.capacity if self.capacity > 0 else 0
+        return np.take(self.samples, np.arange(start, start + self.count) % max(self.capacity, 1))
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+class PreTriggerCapture(SampledDataSink):
+    """Keeps the latest samples in a ring buffer and emits a window around every trigger.
+
+    Host-side counterpart of preTriggerNumberOfSamples: when the trigger is true, one
+    contiguous window of up to 'pre_trigger_samples' samples before the trigger, the
+    trigger sample and 'post_trigger_samples' samples after it is written to the downstream
+    sinks. All other samples are only kept in the ring buffer, so memory is bounded and
+    storage writes happen around events only. The next window is armed after a window
+    completed, its pre-trigger part never repeats samples of the previous window.
+    """
+    def __init__(self, trigger: TriggerCondition, pre_trigger_samples: int, post_trigger_samples: int, downstream: list = None):
+        if pre_trigger_samples < 0 or post_trigger_samples < 0:
+            raise Exception("PreTriggerCapture: number of samples must not be negative")
+
+        super().__init__()
+        self.trigger = trigger
+        self.pre_trigger_samples = pre_trigger_samples
+        self.post_trigger_samples = post_trigger_samples
+        self.downstream = downstream or []
+        self.ring_buffer = None # created with the dtype of the first block
+        self.window_parts = None # parts of the window being collected
+        self.remaining_post_samples = 0
+        self.number_of_samples = 0 # samples received before the current block
+        self.window_end = 0 # sample count at the end of the last window
+        self.windows = [] # TriggerSegment per emitted window
+
+    def write(self, sampled_data_array: np.ndarray):
+        super().write(sampled_data_array)
+
+        if len(sampled_data_array) == 0:
+            return
+
+        if self.ring_buffer is None:
+            self.ring_buffer = SampleRingBuffer(self.pre_trigger_samples, sampled_data_array.dtype)
+
+        # evaluated for the whole block, so edge conditions see every sample once
+        trigger_mask = self.trigger.evaluate(sampled_data_array)
+
+        position = 0
+        while position < len(sampled_data_array):
+            if self.window_parts is None:
+                hits = np.flatnonzero(trigger_mask[position:])
+                if len(hits) == 0:
+                    break
+
+                trigger_position = position + int(hits[0])
+                number_of_pre_samples = min(self.pre_trigger_samples, self.number_of_samples + trigger_position - self.window_end)
+                pre_samples = np.concatenate([self.ring_buffer.get(), sampled_data_array[:trigger_position]])
+                self.window_parts = [pre_samples[len(pre_samples) - number_of_pre_samples:]] if number_of_pre_samples > 0 else []
+                self.remaining_post_samples = self.post_trigger_samples + 1 # including the trigger sample
+                position = trigger_position
+
+            end = min(position + self.remaining_post_samples, len(sampled_data_array))
+            self.window_parts.append(sampled_data_array[position:end])
+            self.remaining_post_samples -= end - position
+            position = end
+
+            if self.remaining_post_samples == 0:
+                self.window_end = self.number_of_samples + position
+                self.emit_window()
+
+        self.ring_buffer.append(sampled_data_array)
+        self.number_of_samples += len(sampled_data_array)
+
+    def emit_window(self):
+        """Write the collected window as one contiguous block to the downstream sinks."""
+        window = np.concatenate(self.window_parts)
+        self.window_parts = None
+
+        segment = TriggerSegment(window[0])
+        segment.add(window)
+        segment.is_complete = True
+        self.windows.append(segment)
+
+        for sink in self.downstream:
+            sink.write(window)
+
+    def reset(self):
+        super().reset()
+        self.trigger.reset()
+        if self.ring_buffer is not None:
+            self.ring_buffer.clear()
+        self.window_parts = None
+        self.number_of_samples = 0
+        self.window_end = 0
+        for sink in self.downstream:
+            sink.reset()
+
+    def close(self):
+        # an incomplete window is emitted as is
+        if self.window_parts:
+            self.emit_window()
+        for sink in self.downstream:
+            sink.close()
+
+    def print_summary(self):
+        """Output the emitted windows to console."""
+        super().print_summary()
+        print(f"{len(self.windows)} windows ({self.pre_trigger_samples} pre-trigger, {self.post_trigger_samples} post-trigger samples)")
+        for index, window in enumerate(self.windows):
+            print(f"- window {index}: {window}")
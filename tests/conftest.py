@@ -0,0 +1,60 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   conftest.py
+#
+# @brief  Shared fixtures of the host-side tests
+#
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# the examples are top-level modules of the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def make_sampled_data():
+    """Build sampled data arrays in the format of SampleDataConverter.convert.
+
+    Call with keyword arguments address name -> values, all of the same length.
+    Times are 1 ms per sample, sample numbers start at first_sample.
+    """
+    def make(first_sample: int = 0, data_type=np.int32, **values):
+        names = list(values)
+        dtype = np.dtype([
+            ('iteration', np.uint64),
+            ('sample', np.uint64),
+            ('value', [(name, data_type) for name in names]),
+            ('time', [(name, np.uint64) for name in names])
+        ])
+        length = len(next(iter(values.values())))
+        sampled_data_array = np.zeros(length, dtype=dtype)
+        sampled_data_array['sample'] = np.arange(first_sample, first_sample + length)
+        for name in names:
+            sampled_data_array['value'][name] = values[name]
+            sampled_data_array['time'][name] = np.arange(first_sample, first_sample + length)
+        return sampled_data_array
+
+    return make
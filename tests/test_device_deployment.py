@@ -0,0 +1,106 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_device_deployment.py
+#
+# @brief  Tests of the deployment plan
+#
+
+import pytest
+
+pytest.importorskip("nanotec_nanolib")
+
+from device_image_cache_example import FirmwareImage, FIRMWARE, BOOTLOADER, MINIMUM_IMAGE_SIZE
+from device_deployment_example import DeploymentPlanner, PlanEntry
+
+FIRMWARE_FILE_NAME = "PD4-E-FIR-v2213-B1026181.fw"
+
+class ReadResult:
+    """Result of the accessor double, like Nanolib.ResultString."""
+    def __init__(self, result=None, error=""):
+        self.result = result
+        self.error = error
+
+    def hasError(self):
+        return self.error != ""
+
+    def getError(self):
+        return self.error
+
+    def getResult(self):
+        return self.result
+
+class VersionAccessor:
+    """Answers the version reads of DeploymentPlanner from a table: device handle -> (name, firmware, bootloader)."""
+    def __init__(self, versions: dict):
+        self.versions = versions
+
+    def read(self, device_handle, field):
+        if device_handle not in self.versions:
+            return ReadResult(error="device not reachable")
+        return ReadResult(self.versions[device_handle][field])
+
+    def getDeviceName(self, device_handle):
+        return self.read(device_handle, 0)
+
+    def getDeviceFirmwareBuildId(self, device_handle):
+        return self.read(device_handle, 1)
+
+    def getDeviceBootloaderBuildId(self, device_handle):
+        return self.read(device_handle, 2)
+
+class PlannerContext:
+    def __init__(self, versions: dict):
+        self.nanolib_accessor = VersionAccessor(versions)
+        self.connected_device_handles = list(versions)
+
+def write_image(directory, file_name: str = FIRMWARE_FILE_NAME, content: bytes = None) -> str:
+    path = directory / file_name
+    path.write_bytes(content if content is not None else bytes(MINIMUM_IMAGE_SIZE))
+    return str(path)
+
+def test_plan(tmp_path):
+    image = FirmwareImage(write_image(tmp_path), FIRMWARE)
+    ctx = PlannerContext({
+        "outdated": ("PD4-E", "FIR-v2200-B1000000", "BL1"),
+        "current": ("PD4-E", " fir-v2213-b1026181 ", "BL1"),
+        "other": ("PD6-E", "FIR-v2200-B1000000", "BL1"),
+    })
+    planner = DeploymentPlanner(ctx, ["outdated", "current", "other", "unreachable"])
+    entries = planner.plan(image)
+
+    assert [entry.action for entry in entries] == [PlanEntry.UPDATE, PlanEntry.CURRENT, PlanEntry.SKIPPED, PlanEntry.SKIPPED]
+    assert entries[0].target_build_id == "FIR-v2213-B1026181"
+    assert "PD6-E" in entries[2].reason
+    assert entries[3].reason == "device not reachable"
+    assert planner.get_device_handles_to_update() == ["outdated"]
+    assert planner.get_target_build_id() == "FIR-v2213-B1026181"
+
+def test_plan_bootloader(tmp_path):
+    image = FirmwareImage(write_image(tmp_path, "bootloader.fw"), BOOTLOADER)
+    ctx = PlannerContext({"old": ("PD4-E", "FW1", "BL1"), "new": ("PD4-E", "FW1", "BL2")})
+    planner = DeploymentPlanner(ctx)
+
+    with pytest.raises(Exception, match="has to be given"):
+        planner.plan(image)
+    assert [entry.action for entry in planner.plan(image, "BL2")] == [PlanEntry.UPDATE, PlanEntry.CURRENT]
@@ -0,0 +1,69 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_device_image_cache.py
+#
+# @brief  Tests of the firmware image validation and cache
+#
+
+import pytest
+
+pytest.importorskip("nanotec_nanolib")
+
+from device_image_cache_example import FirmwareImage, FirmwareImageCache, FIRMWARE, MINIMUM_IMAGE_SIZE
+
+FIRMWARE_FILE_NAME = "PD4-E-FIR-v2213-B1026181.fw"
+
+def write_image(directory, file_name: str = FIRMWARE_FILE_NAME, content: bytes = None) -> str:
+    path = directory / file_name
+    path.write_bytes(content if content is not None else bytes(MINIMUM_IMAGE_SIZE))
+    return str(path)
+
+def test_build_id_from_file_name(tmp_path):
+    image = FirmwareImage(write_image(tmp_path), FIRMWARE)
+    assert image.get_build_id("PD4-E") == "FIR-v2213-B1026181"
+    assert image.get_build_id("pd4-e") == "FIR-v2213-B1026181"
+    # no prefix match of other device names
+    assert image.get_build_id("PD4") is None
+    assert image.get_build_id("PD6-E") is None
+
+def test_build_id_escapes_device_name(tmp_path):
+    image = FirmwareImage(write_image(tmp_path, "C5-E-2-09-FIR-v2213-B1026181.fw"), FIRMWARE)
+    assert image.get_build_id("C5-E-2-09") == "FIR-v2213-B1026181"
+    assert image.get_build_id("C5.E.2.09") is None
+
+def test_invalid_images_raise(tmp_path):
+    with pytest.raises(Exception, match="bytes"):
+        FirmwareImage(write_image(tmp_path, content=bytes(10)), FIRMWARE)
+    with pytest.raises(Exception, match="zip archive"):
+        FirmwareImage(write_image(tmp_path, content=b"PK\x03\x04" + bytes(MINIMUM_IMAGE_SIZE)), FIRMWARE)
+
+def test_cache_reloads_changed_file(tmp_path):
+    path = write_image(tmp_path)
+    cache = FirmwareImageCache()
+    image = cache.load(path)
+    assert cache.load(path) is image
+
+    write_image(tmp_path, content=bytes(MINIMUM_IMAGE_SIZE + 1))
+    assert cache.load(path) is not image
+    assert len(cache.images) == 1
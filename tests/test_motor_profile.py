@@ -0,0 +1,81 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_motor_profile.py
+#
+# @brief  Tests of the motion profile duration prediction
+#
+
+import numpy as np
+import pytest
+
+pytest.importorskip("nanotec_nanolib")
+
+from motor_profile_example import MotionProfilePlanner
+
+def test_trapezoidal_profile():
+    planner = MotionProfilePlanner(velocity=1000.0, acceleration=2000.0, deceleration=1000.0)
+    profile = planner.plan(3000.0)[0]
+
+    # ramps of 0.5 s (250 units) and 1 s (500 units), 2250 units at constant velocity
+    assert profile['peak_velocity'] == pytest.approx(1000.0)
+    assert profile['acceleration_time'] == pytest.approx(0.5)
+    assert profile['deceleration_time'] == pytest.approx(1.0)
+    assert profile['constant_time'] == pytest.approx(2.25)
+    assert profile['duration'] == pytest.approx(3.75)
+
+def test_triangular_profile():
+    planner = MotionProfilePlanner(velocity=1000.0, acceleration=1000.0, deceleration=1000.0)
+    profile = planner.plan(-100.0)[0]
+
+    # the profile velocity is not reached, the sign of the distance is ignored
+    assert profile['distance'] == pytest.approx(100.0)
+    assert profile['peak_velocity'] == pytest.approx(np.sqrt(100.0 * 1000.0))
+    assert profile['constant_time'] == 0.0
+    assert profile['duration'] == pytest.approx(2.0 * np.sqrt(0.1))
+
+def test_s_curve_profile():
+    planner = MotionProfilePlanner(velocity=1000.0, acceleration=1000.0, deceleration=1000.0, jerk=10000.0)
+    long_move, short_move = planner.plan([5000.0, 10.0])
+
+    # acceleration limit reached: ramp time v/a + a/j
+    assert long_move['acceleration_time'] == pytest.approx(1.1)
+    assert long_move['duration'] == pytest.approx(5000.0 / 1000.0 + 1.1)
+
+    # short move: the ramps cover exactly the distance
+    assert short_move['peak_velocity'] < 1000.0
+    assert short_move['constant_time'] == pytest.approx(0.0, abs=1e-9)
+    assert planner.get_ramp_distance(np.array([short_move['peak_velocity']]))[0] == pytest.approx(10.0)
+
+def test_durations_are_vectorized():
+    planner = MotionProfilePlanner(velocity=1000.0, acceleration=1000.0, deceleration=1000.0)
+    distances = [0.0, 100.0, 3000.0]
+    durations = planner.predict_durations(distances)
+
+    assert durations.shape == (3,)
+    assert durations[0] == 0.0
+    assert planner.predict_total_duration(distances, settle_time=0.01) == pytest.approx(durations.sum() + 0.03)
+
+def test_invalid_limits_raise():
+    with pytest.raises(Exception, match="must be positive"):
+        MotionProfilePlanner(velocity=1000.0, acceleration=0.0, deceleration=1000.0)
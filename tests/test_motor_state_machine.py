@@ -0,0 +1,112 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_motor_state_machine.py
+#
+# @brief  Tests of the CiA 402 transition path search and the fault reset sequence
+#
+
+import pytest
+
+pytest.importorskip("nanotec_nanolib")
+
+from motor_state_machine_example import DriveState, DriveStateMachine, get_transition_path, decode_statusword, \
+    CONTROLWORD_SHUTDOWN, CONTROLWORD_ENABLE_OPERATION, CONTROLWORD_DISABLE_VOLTAGE, CONTROLWORD_FAULT_RESET, \
+    CONTROLWORD_DISABLE_OPERATION
+
+def test_same_state_needs_no_command():
+    assert get_transition_path(DriveState.OPERATION_ENABLED, DriveState.OPERATION_ENABLED) == []
+
+def test_enable_uses_direct_transition():
+    # ready to switch on -> operation enabled is one command (transition 3 + 4)
+    assert get_transition_path(DriveState.SWITCH_ON_DISABLED, DriveState.OPERATION_ENABLED) == [
+        (CONTROLWORD_SHUTDOWN, DriveState.READY_TO_SWITCH_ON),
+        (CONTROLWORD_ENABLE_OPERATION, DriveState.OPERATION_ENABLED),
+    ]
+
+def test_fault_is_reset_first():
+    assert get_transition_path(DriveState.FAULT, DriveState.READY_TO_SWITCH_ON) == [
+        (CONTROLWORD_FAULT_RESET, DriveState.SWITCH_ON_DISABLED),
+        (CONTROLWORD_SHUTDOWN, DriveState.READY_TO_SWITCH_ON),
+    ]
+
+def test_automatic_transitions_have_no_command():
+    assert get_transition_path(DriveState.FAULT_REACTION_ACTIVE, DriveState.SWITCH_ON_DISABLED) == [
+        (None, DriveState.FAULT),
+        (CONTROLWORD_FAULT_RESET, DriveState.SWITCH_ON_DISABLED),
+    ]
+
+def test_disable_from_operation_enabled():
+    assert get_transition_path(DriveState.OPERATION_ENABLED, DriveState.SWITCH_ON_DISABLED) == [
+        (CONTROLWORD_DISABLE_VOLTAGE, DriveState.SWITCH_ON_DISABLED),
+    ]
+    assert get_transition_path(DriveState.OPERATION_ENABLED, DriveState.SWITCHED_ON) == [
+        (CONTROLWORD_DISABLE_OPERATION, DriveState.SWITCHED_ON),
+    ]
+
+def test_unreachable_state_raises():
+    # the fault reaction is only entered by the drive itself
+    with pytest.raises(Exception, match="no transition"):
+        get_transition_path(DriveState.SWITCH_ON_DISABLED, DriveState.FAULT_REACTION_ACTIVE)
+
+def test_decode_statusword():
+    assert decode_statusword(0x0250) == DriveState.SWITCH_ON_DISABLED
+    assert decode_statusword(0x0637) == DriveState.OPERATION_ENABLED
+    assert decode_statusword(0x0218) == DriveState.FAULT
+
+class FakeResult:
+    def __init__(self, value=None):
+        self.value = value
+
+    def hasError(self):
+        return False
+
+    def getResult(self):
+        return self.value
+
+class FakeDriveAccessor:
+    """Drive in fault, the fault is reset by a controlword write of CONTROLWORD_FAULT_RESET."""
+    def __init__(self):
+        self.statusword = 0x0218 # fault
+        self.controlwords = []
+
+    def readNumber(self, device_handle, od_index):
+        return FakeResult(self.statusword)
+
+    def writeNumber(self, device_handle, value, od_index, bit_length):
+        self.controlwords.append(value)
+        if value == CONTROLWORD_FAULT_RESET:
+            self.statusword = 0x0250 # switch on disabled
+        return FakeResult()
+
+class FakeContext:
+    def __init__(self):
+        self.nanolib_accessor = FakeDriveAccessor()
+
+def test_fault_reset_clears_controlword_first():
+    ctx = FakeContext()
+    drive_state_machine = DriveStateMachine(ctx, device_handle=object(), timeout=0.1)
+    # bit 7 needs a rising edge, so 0x00 is written before the fault reset
+    assert drive_state_machine.goto(DriveState.SWITCH_ON_DISABLED) == 2
+    assert ctx.nanolib_accessor.controlwords == [0x00, CONTROLWORD_FAULT_RESET]
+    assert drive_state_machine.state == DriveState.SWITCH_ON_DISABLED
@@ -0,0 +1,108 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_sampler_capture.py
+#
+# @brief  Tests of the memory-mapped capture files
+#
+
+import os
+import struct
+import pytest
+from sampler_capture_example import CaptureWriter, CaptureReader, get_capture_files, CAPTURE_HEADER_FORMAT
+
+def read_capture(directory):
+    """Read all segments of a capture into lists per column."""
+    columns = {}
+    for path in get_capture_files(directory):
+        with CaptureReader(path) as reader:
+            for name, values in reader.columns.items():
+                columns.setdefault(name, []).extend(values.tolist())
+    return columns
+
+def test_write_and_read_back(tmp_path, make_sampled_data):
+    with CaptureWriter(str(tmp_path), rows_per_segment=100, metadata={"period_ms": 1}) as writer:
+        writer.write(make_sampled_data(Temperature=[1, 2, 3], Current=[-1, -2, -3]))
+        writer.write(make_sampled_data(first_sample=3, Temperature=[4], Current=[-4]))
+
+    paths = get_capture_files(str(tmp_path))
+    assert len(paths) == 1
+    with CaptureReader(paths[0]) as reader:
+        assert reader.rows == 4
+        assert reader.capacity == 100
+        assert reader.metadata == {"period_ms": 1}
+        assert reader["sample"].tolist() == [0, 1, 2, 3]
+        assert reader["value.Temperature"].tolist() == [1, 2, 3, 4]
+        assert reader["value.Current"].tolist() == [-1, -2, -3, -4]
+        assert reader["time.Current"].tolist() == [0, 1, 2, 3]
+
+def test_size_based_rotation(tmp_path, make_sampled_data):
+    with CaptureWriter(str(tmp_path), rows_per_segment=4) as writer:
+        writer.write(make_sampled_data(Temperature=list(range(10)), Current=[0] * 10))
+
+    assert len(get_capture_files(str(tmp_path))) == 3
+    assert read_capture(str(tmp_path))["value.Temperature"] == list(range(10))
+
+def test_new_writer_never_overwrites_segments(tmp_path, make_sampled_data):
+    with CaptureWriter(str(tmp_path), rows_per_segment=2) as writer:
+        writer.write(make_sampled_data(Temperature=[1, 2, 3], Current=[0, 0, 0]))
+    # a gap left by a deleted segment must not lead to an existing file
+    os.remove(get_capture_files(str(tmp_path))[0])
+
+    with CaptureWriter(str(tmp_path), rows_per_segment=2) as writer:
+        writer.write(make_sampled_data(Temperature=[4], Current=[0]))
+
+    assert [os.path.basename(path) for path in get_capture_files(str(tmp_path))] == ["capture_000001.ncap", "capture_000002.ncap"]
+    assert read_capture(str(tmp_path))["value.Temperature"] == [3, 4]
+
+def test_only_committed_rows_are_read(tmp_path, make_sampled_data):
+    with CaptureWriter(str(tmp_path), rows_per_segment=10) as writer:
+        writer.write(make_sampled_data(Temperature=[1, 2, 3], Current=[0, 0, 0]))
+        path = writer.segment.path
+        # data of a block written without its commit (writer crashed)
+        writer.segment.columns["value.Temperature"][3] = 99
+
+    with CaptureReader(path) as reader:
+        assert reader["value.Temperature"].tolist() == [1, 2, 3]
+
+def test_changed_columns_raise(tmp_path, make_sampled_data):
+    with CaptureWriter(str(tmp_path)) as writer:
+        writer.write(make_sampled_data(Temperature=[1], Current=[0]))
+        with pytest.raises(Exception, match="does not match"):
+            writer.write(make_sampled_data(Temperature=[1]))
+
+def test_corrupt_header_raises(tmp_path, make_sampled_data):
+    with CaptureWriter(str(tmp_path)) as writer:
+        writer.write(make_sampled_data(Temperature=[1], Current=[0]))
+    path = get_capture_files(str(tmp_path))[0]
+
+    with open(path, "r+b") as file:
+        file.seek(struct.calcsize(CAPTURE_HEADER_FORMAT) + 16)
+        file.write(b"#")
+    with pytest.raises(Exception, match="corrupt header"):
+        CaptureReader(path)
+
+    with open(path, "r+b") as file:
+        file.write(b"NOTACAPT")
+    with pytest.raises(Exception, match="is not a capture file"):
+        CaptureReader(path)
@@ -0,0 +1,93 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_sampler_converter.py
+#
+# @brief  Tests of the conversion of sampled data into numpy arrays
+#
+
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+pytest.importorskip("nanotec_nanolib")
+
+from sampler_example import SampleDataConverter
+
+def make_sample_data(iteration: int, rows: list, first_time: int = 0):
+    """Stand-in for Nanolib.SampleData: rows of sampled values, one value per tracked address."""
+    sampled_values = [SimpleNamespace(value=value, collectTimeMsec=first_time + row)
+                      for row, values in enumerate(rows) for value in values]
+    return SimpleNamespace(iterationNumber=iteration, sampledValues=sampled_values)
+
+def test_signed_and_unsigned_values():
+    converter = SampleDataConverter(["Signed", "Unsigned8", "Unsigned64"], [np.int32, np.uint8, np.uint64])
+    # negative values arrive as Python ints, unsigned values above the signed range as well
+    result = converter.convert([make_sample_data(1, [[-1, 255, 2 ** 64 - 1], [-2 ** 31, 0, 2 ** 63]])])
+
+    assert result['value']['Signed'].tolist() == [-1, -2 ** 31]
+    assert result['value']['Unsigned8'].tolist() == [255, 0]
+    assert result['value']['Unsigned64'].tolist() == [2 ** 64 - 1, 2 ** 63]
+    assert result.dtype['value']['Signed'] == np.int32
+
+def test_values_wrap_to_the_data_type():
+    converter = SampleDataConverter(["Integer16"], [np.int16])
+    # a value delivered as unsigned 16-bit raw value is decoded as negative
+    result = converter.convert([make_sample_data(1, [[0xFFFF], [0x8000]])])
+    assert result['value']['Integer16'].tolist() == [-1, -32768]
+
+def test_times_per_address():
+    converter = SampleDataConverter(["A", "B"], [np.int32, np.int32])
+    result = converter.convert([make_sample_data(1, [[1, 2], [3, 4]], first_time=100)])
+
+    assert result['time']['A'].tolist() == [100, 101]
+    assert result['time']['B'].tolist() == [100, 101]
+
+def test_sample_numbers_across_blocks_and_iterations():
+    converter = SampleDataConverter(["A"], [np.int32])
+    first = converter.convert([make_sample_data(1, [[1], [2]]), make_sample_data(1, [[3]])])
+    second = converter.convert([make_sample_data(1, [[4]]), make_sample_data(2, [[5], [6]])])
+
+    assert first['iteration'].tolist() == [1, 1, 1]
+    assert first['sample'].tolist() == [0, 1, 2]
+    # samples continue within an iteration and restart with a new one
+    assert second['iteration'].tolist() == [1, 2, 2]
+    assert second['sample'].tolist() == [3, 0, 1]
+
+    converter.reset()
+    assert converter.convert([make_sample_data(1, [[7]])])['sample'].tolist() == [0]
+
+def test_empty_block():
+    converter = SampleDataConverter(["A", "B"], [np.int32, np.int32])
+    assert len(converter.convert([])) == 0
+
+def test_incomplete_sample_raises():
+    converter = SampleDataConverter(["A", "B"], [np.int32, np.int32])
+    sample_data = make_sample_data(1, [[1, 2]])
+    sample_data.sampledValues.pop()
+    with pytest.raises(Exception, match="do not match"):
+        converter.convert([sample_data])
+
+def test_number_of_names_and_types_must_match():
+    with pytest.raises(Exception, match="differ"):
+        SampleDataConverter(["A", "B"], [np.int32])
@@ -0,0 +1,53 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_sampler_planner.py
+#
+# @brief  Tests of the sampler rate planner
+#
+
+import pytest
+
+pytest.importorskip("nanotec_nanolib")
+
+from nanotec_nanolib import Nanolib
+from sampler_planner_example import SamplerRatePlanner
+
+def make_planner(read_milliseconds_per_object: float = 0.1) -> SamplerRatePlanner:
+    sampler_rate_planner = SamplerRatePlanner(ctx=None, device_handle=object())
+    sampler_rate_planner.read_milliseconds_per_object = read_milliseconds_per_object
+    return sampler_rate_planner
+
+def test_desired_rate_is_met():
+    sampler_plan = make_planner().plan([Nanolib.OdIndex(0x6064, 0x00)], 100.0, 1000)
+    assert sampler_plan.period_milliseconds == 10
+    assert sampler_plan.reason == "desired rate"
+
+def test_rate_above_period_resolution_is_reported():
+    sampler_plan = make_planner().plan([Nanolib.OdIndex(0x6064, 0x00)], 5000.0, 1000)
+    assert sampler_plan.period_milliseconds == 1
+    assert sampler_plan.reason == "rate limited by 1 ms period resolution"
+
+def test_no_tracked_addresses_raises():
+    with pytest.raises(Exception, match="no tracked addresses"):
+        make_planner().plan([], 100.0, 1000)
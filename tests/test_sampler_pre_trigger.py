@@ -0,0 +1,79 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_sampler_pre_trigger.py
+#
+# @brief  Tests of the pre-trigger ring buffer capture
+#
+
+import numpy as np
+import pytest
+from sampler_sink_example import SampledDataSink
+from sampler_trigger_example import PreTriggerCapture, CompareCondition
+
+class CollectingSink(SampledDataSink):
+    """Keeps every written block."""
+    def __init__(self):
+        super().__init__()
+        self.blocks = []
+
+    def write(self, sampled_data_array: np.ndarray):
+        super().write(sampled_data_array)
+        self.blocks.append(sampled_data_array.copy())
+
+def test_pre_trigger_window(make_sampled_data):
+    sink = CollectingSink()
+    capture = PreTriggerCapture(CompareCondition("Current", ">", 100), pre_trigger_samples=3, post_trigger_samples=2, downstream=[sink])
+
+    currents = [0] * 10 + [200] + [0] * 9
+    # blocks of 4 samples, the window spans three blocks
+    for first_sample in range(0, 20, 4):
+        capture.write(make_sampled_data(first_sample=first_sample, Temperature=[0] * 4, Current=currents[first_sample:first_sample + 4]))
+
+    assert len(sink.blocks) == 1
+    assert sink.blocks[0]['sample'].tolist() == [7, 8, 9, 10, 11, 12]
+    assert len(capture.windows) == 1 and capture.windows[0].is_complete
+
+def test_pre_trigger_windows_do_not_overlap(make_sampled_data):
+    sink = CollectingSink()
+    capture = PreTriggerCapture(CompareCondition("Current", ">", 100), pre_trigger_samples=4, post_trigger_samples=1, downstream=[sink])
+
+    currents = [0, 0, 0, 200, 0, 0, 200, 0, 0, 0]
+    capture.write(make_sampled_data(Temperature=[0] * 10, Current=currents))
+
+    # the second window starts after the first, its pre-trigger part is shortened
+    assert [block['sample'].tolist() for block in sink.blocks] == [[0, 1, 2, 3, 4], [5, 6, 7]]
+
+def test_incomplete_window_is_emitted_on_close(make_sampled_data):
+    sink = CollectingSink()
+    capture = PreTriggerCapture(CompareCondition("Current", ">", 100), pre_trigger_samples=1, post_trigger_samples=5, downstream=[sink])
+
+    capture.write(make_sampled_data(Temperature=[0] * 4, Current=[0, 0, 200, 0]))
+    assert sink.blocks == []
+
+    capture.close()
+    assert sink.blocks[0]['sample'].tolist() == [1, 2, 3]
+
+def test_negative_window_raises():
+    with pytest.raises(Exception, match="must not be negative"):
+        PreTriggerCapture(CompareCondition("Current", ">", 100), pre_trigger_samples=-1, post_trigger_samples=0)
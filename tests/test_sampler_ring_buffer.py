@@ -0,0 +1,91 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_sampler_ring_buffer.py
+#
+# @brief  Tests of the single-producer/single-consumer ring buffer
+#
+
+import threading
+import time
+import pytest
+
+pytest.importorskip("nanotec_nanolib")
+
+from sampler_example import SpscRingBuffer
+
+def test_fifo_order_and_wrap_around():
+    ring_buffer = SpscRingBuffer(3)
+    received = []
+    for item in range(10):
+        assert ring_buffer.push(item)
+        if item % 2 == 1:
+            received.append(ring_buffer.pop())
+            received.append(ring_buffer.pop())
+
+    assert received == list(range(10))
+    assert len(ring_buffer) == 0
+    assert ring_buffer.pop() is None
+
+def test_overflow_drops_new_item():
+    ring_buffer = SpscRingBuffer(2)
+    assert ring_buffer.push("a")
+    assert ring_buffer.push("b")
+    assert not ring_buffer.push("c")
+
+    assert ring_buffer.dropped == 1
+    assert ring_buffer.high_water_mark == 2
+    # buffered items are delivered complete and in order
+    assert [ring_buffer.pop(), ring_buffer.pop()] == ["a", "b"]
+    assert ring_buffer.push("d")
+    assert ring_buffer.pop() == "d"
+
+def test_invalid_capacity_raises():
+    with pytest.raises(Exception, match="capacity"):
+        SpscRingBuffer(0)
+
+def test_producer_and_consumer_threads():
+    ring_buffer = SpscRingBuffer(64)
+    number_of_items = 5000
+    received = []
+
+    def produce():
+        item = 0
+        while item < number_of_items:
+            if ring_buffer.push(item):
+                item += 1
+            else:
+                time.sleep(0)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    while len(received) < number_of_items:
+        item = ring_buffer.pop()
+        if item is not None:
+            received.append(item)
+        else:
+            time.sleep(0)
+    producer.join()
+
+    # the retried pushes are counted as dropped, but no item is lost or reordered
+    assert received == list(range(number_of_items))
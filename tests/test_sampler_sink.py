@@ -0,0 +1,146 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_sampler_sink.py
+#
+# @brief  Tests of the output format and rate of the sampled data sinks
+#
+
+import io
+import json
+from types import SimpleNamespace
+import numpy as np
+import pytest
+import sampler_sink_example
+from sampler_sink_example import ConsoleTableSink, CsvSink, TsvSink, JsonLinesSink, QuietSink, create_sink
+
+def format_baseline_line(iteration, sample, values, times) -> str:
+    """One row as printed by the original sampler example (process_sampled_data)."""
+    line = f"{iteration:<10}{sample:<10}"
+    for value, time in zip(values, times):
+        line += f"{value:<14}{time:<8}"
+    return line
+
+def make_block(make_sampled_data, first_sample=0):
+    sampled_data_array = make_sampled_data(first_sample=first_sample, data_type=np.int64,
+                                           Temperature=[-40, 1234567890123, 0], Current=[7, -1, 2 ** 40])
+    sampled_data_array['iteration'] = 3
+    return sampled_data_array
+
+def write(sink, *blocks) -> list:
+    for block in blocks:
+        sink.write(block)
+    return sink.stream.getvalue().splitlines()
+
+def test_console_table_matches_baseline(make_sampled_data):
+    block = make_block(make_sampled_data)
+    lines = write(ConsoleTableSink(["Temperature", "Current"], io.StringIO()), block, make_block(make_sampled_data, 3))
+
+    header_line = "------------------------------------------------------------"
+    header = f"{'Iteration':<10}{'Sample':<10}{'[Temperature]':<14}{'Time':<8}{'[Current]':<14}{'Time':<8}"
+    assert lines[:3] == [header_line, header, header_line]
+    # header only before the first block
+    assert len(lines) == 3 + 6
+    for row in range(3):
+        assert lines[3 + row] == format_baseline_line(3, row, [block['value']['Temperature'][row], block['value']['Current'][row]],
+                                                      [block['time']['Temperature'][row], block['time']['Current'][row]])
+
+def test_console_table_header_after_reset(make_sampled_data):
+    sink = ConsoleTableSink(["Temperature", "Current"], io.StringIO())
+    sink.write(make_block(make_sampled_data))
+    sink.reset()
+    sink.write(make_block(make_sampled_data))
+    assert sink.stream.getvalue().count("Iteration") == 2
+
+def test_reset_restarts_counters_and_rate(make_sampled_data, monkeypatch):
+    now = [10.0]
+    monkeypatch.setattr(sampler_sink_example, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    sink = QuietSink(io.StringIO())
+    sink.write(make_sampled_data(Temperature=[0] * 5))
+    now[0] = 11.0
+    sink.write(make_sampled_data(Temperature=[0] * 5))
+
+    # the idle time until the next run is not part of its rate
+    now[0] = 100.0
+    sink.reset()
+    assert (sink.total_samples, sink.total_blocks, sink.get_sample_rate()) == (0, 0, 0.0)
+    sink.write(make_sampled_data(Temperature=[0] * 5))
+    now[0] = 102.0
+    sink.write(make_sampled_data(Temperature=[0] * 4))
+    assert sink.total_samples == 9
+    assert sink.get_sample_rate() == pytest.approx(2.0)
+
+@pytest.mark.parametrize("sink_class, delimiter", [(CsvSink, ","), (TsvSink, "\t")])
+def test_delimited(make_sampled_data, sink_class, delimiter):
+    lines = write(sink_class(io.StringIO()), make_block(make_sampled_data), make_block(make_sampled_data, 3))
+
+    assert lines[0] == delimiter.join(["iteration", "sample", "Temperature", "Temperature_time", "Current", "Current_time"])
+    assert lines[1] == delimiter.join(["3", "0", "-40", "0", "7", "0"])
+    assert lines[2] == delimiter.join(["3", "1", "1234567890123", "1", "-1", "1"])
+    assert lines[6] == delimiter.join(["3", "5", "0", "5", str(2 ** 40), "5"])
+    assert len(lines) == 7
+
+def test_json_lines(make_sampled_data):
+    block = make_block(make_sampled_data)
+    lines = write(JsonLinesSink(io.StringIO()), block)
+
+    assert [json.loads(line) for line in lines] == [
+        {"iteration": 3, "sample": row,
+         "values": {"Temperature": int(block['value']['Temperature'][row]), "Current": int(block['value']['Current'][row])},
+         "times": {"Temperature": row, "Current": row}}
+        for row in range(3)
+    ]
+
+def test_unsigned_values_are_not_wrapped(make_sampled_data):
+    block = make_sampled_data(data_type=np.uint64, Position=[2 ** 64 - 1])
+    assert write(CsvSink(io.StringIO()), block)[1] == f"0,0,{2 ** 64 - 1},0"
+
+def test_empty_block_writes_nothing(make_sampled_data):
+    sink = CsvSink(io.StringIO())
+    sink.write(make_sampled_data(Temperature=[]))
+    assert sink.stream.getvalue() == ""
+    assert sink.total_blocks == 1
+
+def test_quiet_sink_and_factory(make_sampled_data):
+    sink = create_sink("quiet", ["Temperature", "Current"], io.StringIO())
+    assert isinstance(sink, QuietSink)
+    sink.write(make_block(make_sampled_data))
+    assert sink.stream.getvalue() == ""
+    assert sink.total_samples == 3
+
+    with pytest.raises(Exception, match="unknown sink type"):
+        create_sink("xml", [])
+
+def test_sample_rate_excludes_first_block(make_sampled_data, monkeypatch):
+    now = [10.0]
+    monkeypatch.setattr(sampler_sink_example, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    sink = QuietSink(io.StringIO())
+
+    sink.write(make_sampled_data(Temperature=[0] * 5))
+    assert sink.get_sample_rate() == 0.0
+
+    # the first block was collected before the time base starts
+    now[0] = 12.0
+    sink.write(make_sampled_data(Temperature=[0] * 10))
+    assert sink.total_samples == 15
+    assert sink.get_sample_rate() == pytest.approx(5.0)
@@ -0,0 +1,124 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_sampler_software.py
+#
+# @brief  Tests of the software sampler read batches
+#
+
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("nanotec_nanolib")
+
+from sampler_software_example import SoftwareSampler
+
+class OdAddress:
+    """Tracked address double, like Nanolib.OdIndex."""
+    def __init__(self, index: int, subindex: int):
+        self.index = index
+        self.subindex = subindex
+
+    def getIndex(self):
+        return self.index
+
+    def getSubIndex(self):
+        return self.subindex
+
+class ReadResult:
+    """Result of the accessor double, like Nanolib.ResultInt."""
+    def __init__(self, result=None, error=""):
+        self.result = result
+        self.error = error
+
+    def hasError(self):
+        return self.error != ""
+
+    def getError(self):
+        return self.error
+
+    def getResult(self):
+        return self.result
+
+class ObjectAccessor:
+    """Answers reads from a table: (index, subindex) -> value, array element n is subindex n."""
+    def __init__(self, values: dict):
+        self.values = values
+        self.reads = []
+
+    def readNumber(self, device_handle, od_index):
+        self.reads.append(("readNumber", od_index.getIndex()))
+        return ReadResult(self.values[(od_index.getIndex(), od_index.getSubIndex())])
+
+    def readNumberArray(self, device_handle, index):
+        self.reads.append(("readNumberArray", index))
+        subindices = [subindex for object_index, subindex in self.values if object_index == index]
+        return ReadResult([self.values.get((index, subindex), 0) for subindex in range(max(subindices) + 1)])
+
+def make_software_sampler(values: dict) -> SoftwareSampler:
+    ctx = SimpleNamespace(nanolib_accessor=ObjectAccessor(values))
+    return SoftwareSampler(SimpleNamespace(ctx=ctx, device_handle=object()))
+
+def read_row(software_sampler: SoftwareSampler, tracked_addresses: list) -> list:
+    """Read all batches and map the values to the tracked address order, like SoftwareSampler.run."""
+    row = [None] * len(tracked_addresses)
+    for read_batch in software_sampler.get_read_batches(tracked_addresses):
+        for column, value in zip(read_batch[2], software_sampler.read_batch(read_batch)):
+            row[column] = value
+    return row
+
+def test_read_batches_group_by_index():
+    tracked_addresses = [OdAddress(0x6064, 0), OdAddress(0x3210, 3), OdAddress(0x230F, 0), OdAddress(0x3210, 1)]
+    read_batches = SoftwareSampler.get_read_batches(tracked_addresses)
+
+    assert [(index, columns, subindices) for index, od_index, columns, subindices in read_batches] == [
+        (0x6064, [0], [0]),
+        (0x3210, [1, 3], [3, 1]),
+        (0x230F, [2], [0]),
+    ]
+    # a single address is read with readNumber, several with readNumberArray
+    assert read_batches[0][1] is tracked_addresses[0]
+    assert read_batches[1][1] is None
+    assert read_batches[2][1] is tracked_addresses[2]
+
+def test_values_follow_tracked_address_order():
+    values = {(0x6064, 0): 1000, (0x3210, 1): 11, (0x3210, 2): 12, (0x3210, 3): 13, (0x230F, 0): 42}
+    software_sampler = make_software_sampler(values)
+    tracked_addresses = [OdAddress(0x6064, 0), OdAddress(0x3210, 3), OdAddress(0x230F, 0), OdAddress(0x3210, 1)]
+
+    assert read_row(software_sampler, tracked_addresses) == [1000, 13, 42, 11]
+    assert software_sampler.sampler_example.ctx.nanolib_accessor.reads == [
+        ("readNumber", 0x6064), ("readNumberArray", 0x3210), ("readNumber", 0x230F)
+    ]
+
+def test_subindex_past_array_raises():
+    software_sampler = make_software_sampler({(0x3210, 0): 1, (0x3210, 1): 2})
+    tracked_addresses = [OdAddress(0x3210, 1), OdAddress(0x3210, 5)]
+    with pytest.raises(Exception, match="3210:05"):
+        read_row(software_sampler, tracked_addresses)
+
+def test_read_error_raises():
+    software_sampler = make_software_sampler({})
+    software_sampler.sampler_example.ctx.nanolib_accessor.readNumber = lambda device_handle, od_index: ReadResult(error="no response")
+    with pytest.raises(Exception, match="no response"):
+        read_row(software_sampler, [OdAddress(0x6064, 0)])
@@ -0,0 +1,84 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_sampler_statistics.py
+#
+# @brief  Tests of the running statistics
+#
+
+import numpy as np
+import pytest
+from sampler_statistics_example import RunningStatistics, WindowStatistics
+
+def test_matches_numpy_over_blocks():
+    values = np.random.default_rng(1).normal(50.0, 5.0, 1000)
+    statistics = RunningStatistics()
+    for block in np.array_split(values, [1, 7, 300, 301, 999]):
+        statistics.update(block)
+
+    assert statistics.count == len(values)
+    assert statistics.mean == pytest.approx(values.mean())
+    assert statistics.variance == pytest.approx(values.var(ddof=1))
+    assert statistics.std == pytest.approx(values.std(ddof=1))
+    assert statistics.minimum == values.min()
+    assert statistics.maximum == values.max()
+
+def test_integer_values_do_not_overflow():
+    statistics = RunningStatistics()
+    statistics.update(np.array([2 ** 31 - 1, 2 ** 31 - 1], dtype=np.int32))
+    assert statistics.mean == pytest.approx(2 ** 31 - 1)
+    assert statistics.variance == 0.0
+
+def test_empty_and_single_value():
+    statistics = RunningStatistics()
+    statistics.update(np.array([]))
+    assert statistics.count == 0
+    assert statistics.variance == 0.0
+
+    statistics.update(np.array([3.0]))
+    assert statistics.mean == 3.0
+    assert statistics.std == 0.0
+
+def test_merge_of_partial_statistics():
+    first, second = np.arange(10.0), np.arange(100.0, 120.0)
+    partial = RunningStatistics()
+    partial.update(second)
+
+    statistics = RunningStatistics()
+    statistics.update(first)
+    statistics.merge(partial.count, partial.mean, partial.m2, partial.minimum, partial.maximum)
+
+    values = np.concatenate([first, second])
+    assert statistics.mean == pytest.approx(values.mean())
+    assert statistics.variance == pytest.approx(values.var(ddof=1))
+
+def test_window_keeps_latest_buckets():
+    window = WindowStatistics(bucket_size=10, number_of_buckets=2)
+    window.update(np.arange(35.0))
+
+    # buckets 10..19 and 20..29 are kept, 30..34 is still open
+    statistics = window.get()
+    assert statistics.count == 25
+    assert statistics.minimum == 10.0
+    assert statistics.maximum == 34.0
+    assert statistics.mean == pytest.approx(22.0)
@@ -0,0 +1,133 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_sampler_timing.py
+#
+# @brief  Tests of the sample timing analyzer
+#
+
+import numpy as np
+import pytest
+
+pytest.importorskip("nanotec_nanolib")
+
+from sampler_timing_example import SampleTimingAnalyzer, DeviceTimingMonitor
+
+def make_block(make_sampled_data, times, iterations=None):
+    sampled_data_array = make_sampled_data(a=np.zeros(len(times)), b=np.zeros(len(times)))
+    sampled_data_array['time']['a'] = times
+    sampled_data_array['time']['b'] = times
+    if iterations is not None:
+        sampled_data_array['iteration'] = iterations
+    return sampled_data_array
+
+def test_gap_counts_missing_samples(make_sampled_data):
+    analyzer = SampleTimingAnalyzer(10)
+    analyzer.update(make_block(make_sampled_data, [0, 10, 20, 50, 60, 90]))
+    assert analyzer.gaps == 2
+    assert analyzer.missing_samples == 4
+    assert analyzer.overruns == 2
+    assert analyzer.is_degraded()
+
+def test_overrun_beyond_tolerance(make_sampled_data):
+    # default tolerance for 10 ms is 1 ms
+    analyzer = SampleTimingAnalyzer(10)
+    analyzer.update(make_block(make_sampled_data, [0, 11, 23, 33]))
+    assert analyzer.overruns == 1
+    assert analyzer.missing_samples == 0
+    assert not analyzer.is_degraded()
+
+    analyzer = SampleTimingAnalyzer(10, overrun_tolerance_milliseconds=2.0)
+    analyzer.update(make_block(make_sampled_data, [0, 11, 23, 33]))
+    assert analyzer.overruns == 0
+
+def test_duplicate_collect_times(make_sampled_data):
+    analyzer = SampleTimingAnalyzer(10)
+    analyzer.update(make_block(make_sampled_data, [0, 10, 10, 20, 15]))
+    assert analyzer.duplicate_samples == 2
+    assert analyzer.missing_samples == 0
+    assert analyzer.is_degraded()
+
+def test_skipped_and_backwards_iterations(make_sampled_data):
+    analyzer = SampleTimingAnalyzer(10)
+    analyzer.update(make_block(make_sampled_data, [0, 10, 0, 10, 0], iterations=[0, 0, 3, 3, 2]))
+    assert analyzer.missing_iterations == 2
+    assert analyzer.duplicate_iterations == 1
+    # intervals across iterations are not timing errors
+    assert analyzer.duplicate_samples == 0
+    assert analyzer.missing_samples == 0
+
+def test_jitter_histogram_bins(make_sampled_data):
+    analyzer = SampleTimingAnalyzer(10)
+    # jitter 0, +1, -1, +3
+    analyzer.update(make_block(make_sampled_data, [0, 10, 21, 30, 43]))
+    edges = list(analyzer.jitter_bin_edges)
+    expected = np.zeros(len(analyzer.jitter_histogram), dtype=np.int64)
+    expected[edges.index(-0.5)] += 1 # [-0.5, 0.5)
+    expected[edges.index(1)] += 1 # [1, 2)
+    expected[edges.index(-1)] += 1 # [-1, -0.5)
+    expected[edges.index(2)] += 1 # [2, 5)
+    assert list(analyzer.jitter_histogram) == list(expected)
+    assert analyzer.jitter.count == 4
+    assert analyzer.jitter.minimum == -1
+    assert analyzer.jitter.maximum == 3
+
+def test_continuity_across_blocks(make_sampled_data):
+    analyzer = SampleTimingAnalyzer(10)
+    analyzer.update(make_block(make_sampled_data, [0, 10], iterations=[4, 4]))
+    assert analyzer.last_time == 10
+    assert analyzer.last_iteration == 4
+
+    # the gap between the blocks is detected
+    analyzer.update(make_block(make_sampled_data, [40, 50], iterations=[4, 4]))
+    assert analyzer.gaps == 1
+    assert analyzer.missing_samples == 2
+    assert analyzer.samples == 4
+    assert analyzer.blocks == 2
+
+    # a new iteration in the next block is no gap
+    analyzer.update(make_block(make_sampled_data, [0, 10], iterations=[5, 5]))
+    assert analyzer.gaps == 1
+    assert analyzer.missing_iterations == 0
+    assert analyzer.duplicate_samples == 0
+
+class FakeDeviceHandle:
+    def __init__(self, device_id):
+        self.device_id = device_id
+
+    def equals(self, other):
+        return self.device_id == other.device_id
+
+def test_device_monitor_separates_devices(make_sampled_data):
+    device_timing_monitor = DeviceTimingMonitor(10)
+    device_timing_monitor.update(FakeDeviceHandle(1), make_block(make_sampled_data, [0, 10]))
+    device_timing_monitor.update(FakeDeviceHandle(2), make_block(make_sampled_data, [100, 110]))
+    device_timing_monitor.update(FakeDeviceHandle(1), make_block(make_sampled_data, [20, 30]))
+    device_timing_monitor.update(FakeDeviceHandle(2), make_block(make_sampled_data, [150]))
+
+    assert len(device_timing_monitor.analyzers) == 2
+    first = device_timing_monitor.get_analyzer(FakeDeviceHandle(1))
+    second = device_timing_monitor.get_analyzer(FakeDeviceHandle(2))
+    assert first.samples == 4 and first.missing_samples == 0
+    assert second.samples == 3 and second.missing_samples == 3 and second.gaps == 1
+    assert len(device_timing_monitor.analyzers) == 2
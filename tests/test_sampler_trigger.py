@@ -0,0 +1,81 @@
+##
+# Nanotec Nanolib example
+# Copyright (C) Nanotec GmbH & Co. KG - All Rights Reserved
+#
+# This product includes software developed by the
+# Nanotec GmbH & Co. KG (http://www.nanotec.com/).
+#
+# The Nanolib interface headers and the examples source code provided are
+# licensed under the Creative Commons Attribution 4.0 Internaltional License.
+# To view a copy of this license,
+# visit https://creativecommons.org/licenses/by/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# The parts of the library provided in binary format are licensed under
+# the Creative Commons Attribution-NoDerivatives 4.0 International License.
+# To view a copy of this license,
+# visit http://creativecommons.org/licenses/by-nd/4.0/ or send a letter to
+# Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# @file   test_sampler_trigger.py
+#
+# @brief  Tests of the trigger expressions
+#
+
+import pytest
+from sampler_trigger_example import compile_trigger, WindowCondition, EdgeCondition, AndCondition, OrCondition, NotCondition
+
+ADDRESS_NAMES = ["Temperature", "Current"]
+
+def evaluate(expression, sampled_data_array):
+    return compile_trigger(expression, ADDRESS_NAMES).evaluate(sampled_data_array).tolist()
+
+def test_compare(make_sampled_data):
+    sampled_data_array = make_sampled_data(Temperature=[30, 40, 50], Current=[0, 0, 0])
+    assert evaluate("Temperature > 40", sampled_data_array) == [False, False, True]
+    # constant on the left side is mirrored
+    assert evaluate("40 > Temperature", sampled_data_array) == [True, False, False]
+    assert evaluate("Temperature == -1", make_sampled_data(Temperature=[-1, 1], Current=[0, 0])) == [True, False]
+
+def test_window_and_functions(make_sampled_data):
+    sampled_data_array = make_sampled_data(Temperature=[10, 20, 30, 40, 50], Current=[0, 0, 0, 0, 0])
+    assert evaluate("20 <= Temperature <= 40", sampled_data_array) == [False, True, True, True, False]
+    assert evaluate("outside(Temperature, 20, 40)", sampled_data_array) == [True, False, False, False, True]
+    assert isinstance(compile_trigger("inside(Temperature, 20, 40)", ADDRESS_NAMES), WindowCondition)
+
+def test_boolean_operators(make_sampled_data):
+    sampled_data_array = make_sampled_data(Temperature=[30, 50, 50], Current=[5, 5, 1])
+    condition = compile_trigger("Temperature > 40 and not Current < 2 or Current > 4", ADDRESS_NAMES)
+    assert isinstance(condition, OrCondition)
+    assert isinstance(condition.conditions[0], AndCondition)
+    assert isinstance(condition.conditions[0].conditions[1], NotCondition)
+    assert condition.evaluate(sampled_data_array).tolist() == [True, True, False]
+
+def test_edges_across_blocks(make_sampled_data):
+    condition = compile_trigger("rising(Current, 10)", ADDRESS_NAMES)
+    assert isinstance(condition, EdgeCondition)
+
+    first = make_sampled_data(Temperature=[0, 0, 0], Current=[12, 5, 8])
+    second = make_sampled_data(first_sample=3, Temperature=[0, 0, 0], Current=[11, 12, 3])
+    # the first sample has no predecessor, the crossing between the blocks is detected
+    assert condition.evaluate(first).tolist() == [False, False, False]
+    assert condition.evaluate(second).tolist() == [True, False, False]
+
+    condition.reset()
+    assert condition.evaluate(second).tolist() == [False, False, False]
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os')",
+    "Voltage > 1",
+    "Temperature > Current",
+    "Temperature + 1 > 2",
+    "rising(Temperature)",
+    "Temperature >",
+])
+def test_invalid_expressions_raise(expression):
+    with pytest.raises(Exception, match="compile_trigger"):
+        compile_trigger(expression, ADDRESS_NAMES)